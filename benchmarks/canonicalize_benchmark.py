@@ -0,0 +1,113 @@
+"""
+Benchmark URL canonicalization in the NoQueryDupeFilter against the previous w3lib implementation.
+
+Generates the links of a crawl of many pages of a site, where each page links to the same navigation
+links and to some links of its own, with mixed case hosts, dot segments, percent-encoding, fragments,
+tracking query strings and feed query strings. Checks that every link is canonicalized to the same
+URL as w3lib, and reports the throughput of w3lib, of the yarl canonicalizer, and of the cached
+NoQueryDupeFilter.
+
+Usage: python -m benchmarks.canonicalize_benchmark --pages 200 --links 100 --rounds 5
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from w3lib.url import canonicalize_url, url_query_cleaner
+from yarl import URL
+
+from feedsearch_crawler.feed_spider.dupefilter import NoQueryDupeFilter, canonicalize
+
+TEMPLATES = [
+    "https://Example.COM/blog/{n}/",
+    "https://example.com/blog/../archive/{n}.html#comments",
+    "https://example.com/tag/caf%c3%a9-{n}",
+    "https://example.com/tag/café/{n}",
+    "https://example.com/search?q=feed {n}&page=2",
+    "https://example.com/post/{n}?utm_source=rss&utm_medium=feed",
+    "https://example.com/index.php?format=rss&id={n}",
+    "https://example.com/w/index.php?title=Special:RecentChanges&feed=atom&days={n}",
+    "https://example.com:443/%7Euser/{n}/./feed",
+    "https://EXAMPLE.com/a%2fb/{n}?rss=",
+    "https://sub.example.com/p;params/{n}",
+    "http://example.com/{n}?podcast=1&b=%20x&a=~",
+]
+
+
+def create_links(pages: int, links: int) -> List[URL]:
+    """Create the links found on each page of a crawl, with the navigation links repeated on every page."""
+    rnd = random.Random(0)
+    navigation = [t.format(n=n) for n, t in enumerate(TEMPLATES * 3)]
+    result = []
+    for page in range(pages):
+        result.extend(navigation)
+        result.extend(
+            rnd.choice(TEMPLATES).format(n=page * links + n)
+            for n in range(links - len(navigation))
+        )
+    return [URL(link) for link in result]
+
+
+def w3lib_parse_url(url: URL) -> str:
+    """Previous NoQueryDupeFilter.parse_url() implementation."""
+    if any(key in url.query for key in NoQueryDupeFilter.valid_keys):
+        return canonicalize_url(str(url))
+    return canonicalize_url(url_query_cleaner(str(url)))
+
+
+def yarl_parse_url(url: URL) -> str:
+    """NoQueryDupeFilter.parse_url() without the cache."""
+    if url.raw_query_string and any(
+        key in url.query for key in NoQueryDupeFilter.valid_keys
+    ):
+        return canonicalize(url)
+    return canonicalize(url, keep_query=False)
+
+
+def run(
+    create_func: Callable[[], Callable[[URL], str]], links: List[URL], rounds: int
+) -> float:
+    best = 0
+    for _ in range(rounds):
+        # A new filter for each round, so that the cache starts empty.
+        func = create_func()
+        start = time.perf_counter()
+        for link in links:
+            func(link)
+        best = max(best, len(links) / (time.perf_counter() - start))
+    return best
+
+
+def main(args) -> None:
+    links = create_links(args.pages, args.links)
+    unique = len(set(links))
+    print(f"{len(links):,} links, {unique:,} unique")
+
+    mismatches = {
+        str(link): (w3lib_parse_url(link), yarl_parse_url(link))
+        for link in set(links)
+        if w3lib_parse_url(link) != yarl_parse_url(link)
+    }
+    print(
+        f"{unique - len(mismatches):,} of {unique:,} unique links equivalent to w3lib"
+    )
+    for link, (expected, actual) in list(mismatches.items())[:10]:
+        print(f"  {link}\n    w3lib: {expected}\n     yarl: {actual}")
+
+    for name, create_func in [
+        ("w3lib", lambda: w3lib_parse_url),
+        ("yarl", lambda: yarl_parse_url),
+        ("yarl cached", lambda: NoQueryDupeFilter().parse_url),
+    ]:
+        throughput = run(create_func, links, args.rounds)
+        print(f"{name:>11}: {throughput:,.0f} urls/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200, help="Pages crawled")
+    parser.add_argument("--links", type=int, default=100, help="Links per page")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds, best is shown")
+    main(parser.parse_args())
@@ -0,0 +1,217 @@
+"""
+Benchmark summarizing XML feeds with the streaming FeedSummarizer against parsing them with feedparser.
+
+Summarizes a corpus of feeds, the .xml files of a directory, with FeedInfoParser.summarize_xml() using the
+FeedSummarizer, and with feedparser.parse() as before. Without a corpus directory, feeds are generated:
+RSS 2.0, Atom with xml:base and WebSub links, RSS 1.0 RDF, and large podcast feeds with iTunes metadata
+and an enclosure per episode. Reports feeds/s and MB/s for each feed type, how many feeds fell back
+to feedparser, and how many feeds have the same FeedSummary both ways.
+
+Usage: python -m benchmarks.feed_summary_benchmark --corpus ./feeds --rounds 3
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+from feedsearch_crawler.feed_spider.feed_info_parser import FeedInfoParser
+from feedsearch_crawler.feed_spider.feed_summarizer import (
+    UnsupportedFeed,
+    summarize_feed,
+)
+from feedsearch_crawler.feed_spider.feed_summary import FeedSummary
+
+HEADERS = {"content-type": "application/xml; charset=utf-8"}
+
+DESCRIPTION = (
+    "<p>Lorem ipsum dolor sit amet, <a href='/more'>consectetur</a> adipiscing elit.</p>"
+    "<img src='/img/1.jpg'> &amp; more &#8230;"
+)
+
+XHTML = '<p>Lorem <b>ipsum</b> <a href="/x">dolor</a> sit amet.</p>'
+
+
+def create_rss(rnd: random.Random, n: int) -> bytes:
+    items = "".join(
+        f"<item><title>Post {i} &amp; more</title><link>https://site{n}.example.com/{i}</link>"
+        f"<description><![CDATA[{DESCRIPTION * rnd.randint(1, 5)}]]></description>"
+        f"<content:encoded><![CDATA[{DESCRIPTION * rnd.randint(5, 20)}]]></content:encoded>"
+        f"<dc:creator>Author {i % 5}</dc:creator><category>News</category>"
+        f"<guid isPermaLink='false'>post-{i}</guid>"
+        f"<pubDate>Mon, {1 + i % 28:02d} Jul 2019 10:{i % 60:02d}:00 +0000</pubDate></item>"
+        for i in range(rnd.randint(10, 50))
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:atom="http://www.w3.org/2005/Atom">'
+        f"<channel><title>Site {n}</title><link>https://site{n}.example.com/</link>"
+        f"<description>The news of site {n}</description><language>en-US</language>"
+        f'<atom:link href="https://site{n}.example.com/feed" rel="self" type="application/rss+xml"/>'
+        '<atom:link href="https://pubsubhubbub.appspot.com/" rel="hub"/>'
+        "<lastBuildDate>Tue, 02 Jul 2019 10:00:00 +0000</lastBuildDate>"
+        f"<image><url>https://site{n}.example.com/logo.png</url><title>Site {n}</title>"
+        f"<link>https://site{n}.example.com/</link></image>"
+        f"{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def create_atom(rnd: random.Random, n: int) -> bytes:
+    entries = "".join(
+        f"<entry><title type='html'>Post {i}</title><link href='/{i}'/>"
+        f"<link rel='enclosure' href='/{i}.jpg' type='image/jpeg'/>"
+        f"<id>tag:site{n}.example.com,2019:{i}</id>"
+        f"<published>2019-07-{1 + i % 28:02d}T10:00:00Z</published>"
+        f"<updated>2019-07-{1 + i % 28:02d}T12:00:00Z</updated>"
+        f"<author><name>Author {i % 5}</name></author>"
+        f"<summary type='html'>{DESCRIPTION.replace('&', '&amp;').replace('<', '&lt;')}</summary>"
+        f"<content type='xhtml'><div xmlns='http://www.w3.org/1999/xhtml'>"
+        f"{XHTML * rnd.randint(3, 15)}"
+        f"</div></content></entry>"
+        for i in range(rnd.randint(10, 50))
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://site{n}.example.com/" xml:lang="en">'
+        f"<title>Site {n}</title><subtitle>The news of site {n}</subtitle>"
+        "<link href='/'/><link rel='self' href='/atom.xml'/>"
+        "<link rel='hub' href='https://hub.example.com/'/>"
+        f"<id>tag:site{n}.example.com,2019</id><updated>2019-07-02T10:00:00Z</updated>"
+        f"{entries}</feed>"
+    ).encode("utf-8")
+
+
+def create_rdf(rnd: random.Random, n: int) -> bytes:
+    items = "".join(
+        f"<item rdf:about='https://site{n}.example.com/{i}'><title>Post {i}</title>"
+        f"<link>https://site{n}.example.com/{i}</link>"
+        f"<description>{DESCRIPTION.replace('&', '&amp;').replace('<', '&lt;')}</description>"
+        f"<dc:date>2019-07-{1 + i % 28:02d}T10:00:00+00:00</dc:date></item>"
+        for i in range(rnd.randint(10, 30))
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+        'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f"<channel rdf:about='https://site{n}.example.com/'><title>Site {n}</title>"
+        f"<link>https://site{n}.example.com/</link><description>The news of site {n}</description>"
+        "<dc:date>2019-07-02T10:00:00+00:00</dc:date></channel>"
+        f"{items}</rdf:RDF>"
+    ).encode("utf-8")
+
+
+def create_podcast(rnd: random.Random, n: int) -> bytes:
+    items = "".join(
+        f"<item><title>Episode {i}</title><itunes:title>Episode {i}</itunes:title>"
+        f"<itunes:episode>{i}</itunes:episode><itunes:duration>00:{i % 60:02d}:00</itunes:duration>"
+        f"<itunes:summary>{'Show notes for this episode. ' * rnd.randint(5, 30)}</itunes:summary>"
+        f"<description><![CDATA[{DESCRIPTION * rnd.randint(2, 10)}]]></description>"
+        f"<enclosure url='https://cdn.example.com/{n}/{i}.mp3' length='{i * 1000}' type='audio/mpeg'/>"
+        f"<guid>https://cdn.example.com/{n}/{i}.mp3</guid><itunes:explicit>no</itunes:explicit>"
+        f"<pubDate>Mon, {1 + i % 28:02d} Jul 2019 10:00:00 +0000</pubDate></item>"
+        for i in range(rnd.randint(300, 1000))
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd" '
+        'xmlns:atom="http://www.w3.org/2005/Atom">'
+        f"<channel><title>Podcast {n}</title><link>https://podcast{n}.example.com/</link>"
+        f"<description>Podcast {n} &amp; friends</description><itunes:author>Host</itunes:author>"
+        f"<itunes:image href='https://podcast{n}.example.com/art.jpg'/>"
+        "<itunes:category text='Technology'><itunes:category text='Tech News'/></itunes:category>"
+        f'<atom:link href="https://podcast{n}.example.com/feed" rel="self" type="application/rss+xml"/>'
+        f"{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+CREATORS = {
+    "rss": create_rss,
+    "atom": create_atom,
+    "rdf": create_rdf,
+    "podcast": create_podcast,
+}
+
+
+def load_corpus(args) -> Dict[str, List[bytes]]:
+    if args.corpus:
+        return {
+            "corpus": [
+                path.read_bytes() for path in sorted(Path(args.corpus).glob("*.xml"))
+            ]
+        }
+    rnd = random.Random(0)
+    return {
+        name: [
+            create(rnd, n)
+            for n in range(args.podcasts if name == "podcast" else args.feeds)
+        ]
+        for name, create in CREATORS.items()
+    }
+
+
+def summarize(data: bytes) -> Optional[FeedSummary]:
+    return FeedInfoParser.summarize_xml(data, "utf-8", dict(HEADERS), "html.parser")
+
+
+def summarize_with_feedparser(data: bytes) -> Optional[FeedSummary]:
+    with mock.patch(
+        "feedsearch_crawler.feed_spider.feed_info_parser.summarize_feed",
+        side_effect=UnsupportedFeed,
+    ):
+        return FeedInfoParser.summarize_xml(data, "utf-8", dict(HEADERS), "html.parser")
+
+
+def fallbacks(feeds: List[bytes]) -> int:
+    count = 0
+    for data in feeds:
+        try:
+            summarize_feed(data.strip(), dict(HEADERS))
+        except UnsupportedFeed:
+            count += 1
+    return count
+
+
+def run(parse: Callable[[bytes], object], feeds: List[bytes], rounds: int) -> float:
+    best = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for data in feeds:
+            parse(data)
+        best = max(best, len(feeds) / (time.perf_counter() - start))
+    return best
+
+
+def main(args) -> None:
+    for name, feeds in load_corpus(args).items():
+        if not feeds:
+            raise SystemExit("No .xml files in corpus")
+        mb = sum(len(data) for data in feeds) / len(feeds) / 1024 / 1024
+        same = sum(summarize(data) == summarize_with_feedparser(data) for data in feeds)
+        print(
+            f"{name}: {len(feeds)} feeds, {mb * 1024:,.0f} KB per feed, "
+            f"{fallbacks(feeds)} fell back to feedparser, {same}/{len(feeds)} same summary"
+        )
+        for parser, parse in [
+            ("feedparser", summarize_with_feedparser),
+            ("summarizer", summarize),
+        ]:
+            throughput = run(parse, feeds, args.rounds)
+            print(
+                f"{parser:>12}: {throughput:,.1f} feeds/s, {throughput * mb:,.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="Directory of saved feed .xml files")
+    parser.add_argument(
+        "--feeds", type=int, default=20, help="Feeds of each type to generate"
+    )
+    parser.add_argument(
+        "--podcasts", type=int, default=3, help="Large podcast feeds to generate"
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds, best is shown")
+    main(parser.parse_args())
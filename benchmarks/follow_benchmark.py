@@ -0,0 +1,81 @@
+"""
+Benchmark Crawler.follow() throughput on pages with thousands of links.
+
+Follows every link of a page at the given crawl depth, as a parse callback does.
+The "deepcopy history" crawler reproduces the previous behaviour of deep copying the Response history
+in follow(), and again when the Request is fetched, while the "shared history" crawler shares the
+immutable History of the Response.
+
+Usage: python -m benchmarks.follow_benchmark --links 5000 --depth 5 --rounds 5
+"""
+
+import argparse
+import asyncio
+import copy
+
+import aiohttp
+import time
+from yarl import URL
+
+from feedsearch_crawler.crawler import Crawler, Response
+
+
+class BenchmarkCrawler(Crawler):
+    async def parse(self, request, response):
+        pass
+
+    async def parse_xml(self, response_text):
+        return None
+
+    async def process_item(self, item):
+        pass
+
+
+class DeepCopyCrawler(BenchmarkCrawler):
+    """Deep copies the Response history for each followed link, as the Crawler did before History was shared."""
+
+    async def follow(self, url, callback=None, response=None, *args, **kwargs):
+        if response:
+            copy.deepcopy(list(response.history))
+            copy.deepcopy(list(response.history))
+        return await super().follow(url, callback, response, *args, **kwargs)
+
+
+def create_response(depth: int) -> Response:
+    history = [URL(f"http://example.com/depth/{n}") for n in range(depth)]
+    return Response(url=history[-1], method="GET", history=history, status_code=200)
+
+
+async def run_follow(crawler_class, args) -> float:
+    async with aiohttp.ClientSession() as session:
+        best = 0
+        for _ in range(args.rounds):
+            crawler = crawler_class(session=session, max_depth=0)
+            # The ClientSession is normally set up by crawl().
+            crawler._session = session
+            response = create_response(args.depth)
+            links = [f"/page/{n}" for n in range(args.links)]
+
+            start = time.perf_counter()
+            for link in links:
+                await crawler.follow(link, crawler.parse, response)
+            duration = time.perf_counter() - start
+            best = max(best, args.links / duration)
+    return best
+
+
+async def main(args) -> None:
+    for name, crawler_class in [
+        ("deepcopy history", DeepCopyCrawler),
+        ("shared history", BenchmarkCrawler),
+    ]:
+        throughput = await run_follow(crawler_class, args)
+        print(f"{name:>17}: {throughput:,.0f} links/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=5000, help="Links per page")
+    parser.add_argument("--depth", type=int, default=5, help="Response depth")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds, best is shown")
+    asyncio.run(main(parser.parse_args()))
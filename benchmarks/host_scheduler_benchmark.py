@@ -0,0 +1,121 @@
+"""
+Benchmark crawl throughput over many hosts, with and without the Host Scheduler.
+
+Serves a small site from every loopback address 127.0.0.1 - 127.0.0.N, and crawls all of them at once.
+The "worker sleep" crawler reproduces the previous behaviour of sleeping for the Request delay inside a worker,
+while the "host scheduler" crawler holds Requests back until their host may be fetched.
+
+Usage: python -m benchmarks.host_scheduler_benchmark --hosts 40 --pages 8 --delay 0.25
+"""
+
+import argparse
+import asyncio
+import re
+from random import random
+
+import time
+from aiohttp import web
+
+from feedsearch_crawler.crawler import Crawler, Request
+
+link_regex = re.compile('href="([^"]+)"')
+
+
+class BenchmarkCrawler(Crawler):
+    async def parse(self, request, response):
+        if not response.text:
+            return
+        for href in link_regex.findall(response.text):
+            yield await self.follow(href, self.parse, response)
+
+    async def parse_xml(self, response_text):
+        return None
+
+    async def process_item(self, item):
+        pass
+
+
+class ImmediateScheduler:
+    def reserve(self, host, interval, backoff=0, now=None):
+        return 0
+
+
+class WorkerSleepCrawler(BenchmarkCrawler):
+    """Delays each Request by sleeping within the worker, as the Crawler did before the Host Scheduler."""
+
+    host_scheduler_class = ImmediateScheduler
+
+    async def _handle_request(self, request: Request) -> None:
+        if request.delay > 0:
+            await asyncio.sleep(request.delay + random())
+        await super()._handle_request(request)
+
+
+def create_app(pages: int, latency: float) -> web.Application:
+    async def page(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        num = int(request.match_info.get("num", 0))
+        links = "".join(
+            f'<a href="/page/{n}">Page {n}</a>' for n in range(num + 1, pages)
+        )
+        return web.Response(text=f"<html><body>{links}</body></html>")
+
+    app = web.Application()
+    app.router.add_get("/", page)
+    app.router.add_get("/page/{num}", page)
+    return app
+
+
+async def run_crawl(crawler_class, urls, args) -> dict:
+    crawler = crawler_class(
+        concurrency=args.concurrency,
+        delay=args.delay,
+        max_depth=0,
+        total_timeout=600,
+        request_timeout=10,
+    )
+    start = time.perf_counter()
+    await crawler.crawl(urls)
+    duration = time.perf_counter() - start
+    stats = crawler.get_stats()
+    return {
+        "requests": stats["requests_successful"],
+        "duration": duration,
+        "throughput": stats["requests_successful"] / duration,
+    }
+
+
+async def main(args) -> None:
+    runner = web.AppRunner(create_app(args.pages, args.latency), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "0.0.0.0", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    urls = [f"http://127.0.0.{n}:{port}/" for n in range(1, args.hosts + 1)]
+
+    try:
+        for name, crawler_class in [
+            ("worker sleep", WorkerSleepCrawler),
+            ("host scheduler", BenchmarkCrawler),
+        ]:
+            result = await run_crawl(crawler_class, urls, args)
+            print(
+                f"{name:>15}: requests={result['requests']} "
+                f"time={result['duration']:.2f}s "
+                f"throughput={result['throughput']:.1f} req/s"
+            )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hosts", type=int, default=40, help="Number of hosts")
+    parser.add_argument("--pages", type=int, default=8, help="Pages per host")
+    parser.add_argument("--delay", type=float, default=0.25, help="Request delay")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Server response time"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+"""
+Benchmark the throughput of the HTML parser backends that extract an HtmlPage from a homepage.
+
+Parses a corpus of saved homepages, the .html files of a directory, with each registered backend and
+with BeautifulSoup tree builders. Without a corpus directory, homepages are generated with a typical
+mix of head metadata, navigation, article listings, inline scripts and styles. Reports pages/s and MB/s,
+and how many pages each backend parses to the same HtmlPage as the BeautifulSoup "html.parser" tree.
+
+Usage: python -m benchmarks.html_parser_benchmark --corpus ./homepages --rounds 3
+"""
+
+import argparse
+import random
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, List
+
+from feedsearch_crawler.feed_spider.html_page import (
+    HtmlPage,
+    html_parsers,
+    parse_html_soup,
+)
+
+
+def create_homepage(rnd: random.Random, n: int) -> bytes:
+    """Generate a homepage with a typical mix of content."""
+    site = f"site{n}.example.com"
+    head = [
+        f"<title>Site {n} &amp; Friends</title>",
+        '<meta charset="utf-8">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        f'<meta property="og:site_name" content="Site {n}">',
+        f'<meta property="og:url" content="https://{site}/">',
+        f'<link rel="canonical" href="https://{site}/">',
+        '<link rel="shortcut icon" href="/favicon.ico">',
+        '<link rel="alternate" type="application/rss+xml" title="RSS" href="/feed.xml">',
+    ]
+    head += [
+        f'<link rel="stylesheet" href="/css/{i}.css">' for i in range(rnd.randint(2, 8))
+    ]
+    head += [
+        f'<script src="/js/{i}.js" async></script>' for i in range(rnd.randint(2, 10))
+    ]
+    head.append("<style>" + "body{margin:0;padding:0} .c{color:#333}" * 50 + "</style>")
+    head.append(
+        '<script>window.__DATA__ = {"items": ['
+        + ",".join(f'{{"id": {i}, "html": "<a href=\\"/x\\">"}}' for i in range(200))
+        + "]};</script>"
+    )
+
+    nav = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/section/{i}">Section {i}</a></li>'
+        for i in range(rnd.randint(10, 60))
+    )
+    articles = "".join(
+        f'<article class="post"><h2><a href="/{n}/post-{i}" rel="bookmark">Post {i}</a></h2>'
+        f'<div class="meta"><span>By <a href="/author/{i % 7}" rel="author">Author</a></span></div>'
+        f"<p>{'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * rnd.randint(3, 10)}</p>"
+        f'<img src="/img/{i}.jpg" alt="Image {i}"></article>'
+        for i in range(rnd.randint(10, 40))
+    )
+    footer = "".join(
+        f'<a href="https://social{i}.example.com/site{n}" rel="me noopener">Social {i}</a>'
+        for i in range(rnd.randint(3, 10))
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head>'
+        + "\n".join(head)
+        + f"</head><body><header><nav><ul>{nav}</ul></nav></header><main>{articles}</main>"
+        f"<footer>{footer}</footer></body></html>"
+    ).encode("utf-8")
+
+
+def load_corpus(args) -> List[bytes]:
+    if args.corpus:
+        return [path.read_bytes() for path in sorted(Path(args.corpus).glob("*.html"))]
+    rnd = random.Random(0)
+    return [create_homepage(rnd, n) for n in range(args.pages)]
+
+
+def run(
+    parser: Callable[[bytes, str], HtmlPage], pages: List[bytes], rounds: int
+) -> float:
+    best = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for page in pages:
+            parser(page, "utf-8")
+        best = max(best, len(pages) / (time.perf_counter() - start))
+    return best
+
+
+def main(args) -> None:
+    pages = load_corpus(args)
+    if not pages:
+        raise SystemExit("No .html files in corpus")
+    mb = sum(len(page) for page in pages) / len(pages) / 1024 / 1024
+    print(f"{len(pages)} pages, {mb * 1024:,.0f} KB per page")
+
+    expected = [parse_html_soup(page, "utf-8") for page in pages]
+    backends = dict(html_parsers)
+    backends["bs4 lxml tree"] = partial(parse_html_soup, htmlparser="lxml")
+
+    for name, parser in backends.items():
+        try:
+            same = sum(parser(page, "utf-8") == e for page, e in zip(pages, expected))
+        except Exception as e:
+            print(f"{name:>14}: unavailable, {e}")
+            continue
+        throughput = run(parser, pages, args.rounds)
+        print(
+            f"{name:>14}: {throughput:,.1f} pages/s, {throughput * mb:,.1f} MB/s, "
+            f"{same}/{len(pages)} same as bs4"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="Directory of saved homepage .html files")
+    parser.add_argument(
+        "--pages", type=int, default=50, help="Pages to generate without a corpus"
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds, best is shown")
+    main(parser.parse_args())
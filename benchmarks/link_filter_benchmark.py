@@ -0,0 +1,210 @@
+"""
+Microbenchmark LinkFilter classification of the links of pages with thousands of links.
+
+Generates the pages of a site, each with the same navigation and footer links and its own article links,
+in which some links look like feeds, podcasts or author pages. Classifies every link of every page with
+the previous per-link LinkFilter implementation, with classify_many(), and with classify_many() sharing
+a cached classifier across the pages, as the Spider does. Checks that all give the same decisions.
+
+Usage: python -m benchmarks.link_filter_benchmark --pages 20 --links 2000 --rounds 3
+"""
+
+import argparse
+import pathlib
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from w3lib.url import url_query_cleaner
+from yarl import URL
+
+from feedsearch_crawler.crawler.lib import parse_href_to_url
+from feedsearch_crawler.crawler.queueable import Queueable
+from feedsearch_crawler.feed_spider.link_filter import (
+    LinkFilter,
+    feed_link_types,
+    invalid_filetypes,
+    invalid_url_contents,
+    low_priority_urls,
+)
+from feedsearch_crawler.feed_spider.regexes import (
+    author_regex,
+    date_regex,
+    feedlike_regex,
+    podcast_regex,
+)
+
+HREFS = [
+    "/section/{n}/",
+    "/2019/07/article-{n}.html",
+    "https://example.com/blog/post-{n}?utm_source=home#comments",
+    "/tag/news-{n}",
+    "/author/writer-{n}",
+    "/podcasts/episode-{n}",
+    "/feeds/category-{n}.xml",
+    "/page/{n}?feed=rss",
+    "/wp-content/uploads/{n}.jpg",
+    "/search?q={n}&view=list",
+    "https://cdn.example.com/video/{n}.mp4",
+    "mailto:editor{n}@example.com",
+    "#top",
+]
+
+
+def create_pages(pages: int, links: int) -> List[List[Dict[str, str]]]:
+    """
+    Create the link attributes of each page. The navigation links are repeated on every page,
+    and article links are shared between pages, as on listing pages.
+    """
+    rnd = random.Random(0)
+    navigation = [{"tag": "a", "href": f"/section/{n}/"} for n in range(150)]
+    navigation += [
+        {
+            "tag": "link",
+            "href": "/feed.xml",
+            "type": "application/rss+xml",
+            "rel": "alternate",
+        },
+        {"tag": "a", "href": "/blog/"},
+        {"tag": "a", "href": "/podcast/"},
+    ]
+    result = []
+    for page in range(pages):
+        page_links = list(navigation)
+        page_links += [
+            {"tag": "a", "href": rnd.choice(HREFS).format(n=rnd.randrange(links * 2))}
+            for _ in range(links - len(navigation))
+        ]
+        result.append(page_links)
+    return result
+
+
+class PreviousLinkFilter(LinkFilter):
+    """The previous should_follow_link implementation, which ran each check separately on each link."""
+
+    @staticmethod
+    def is_valid_filetype(url: str) -> bool:
+        suffix = pathlib.Path(url_query_cleaner(url)).suffix.strip(".").lower()
+        return suffix not in invalid_filetypes
+
+    @staticmethod
+    def has_invalid_contents(string: str) -> bool:
+        return any(value in string.lower() for value in invalid_url_contents)
+
+    @staticmethod
+    def is_low_priority(url_string: str) -> bool:
+        if any(value in url_string.lower() for value in low_priority_urls):
+            return True
+        return bool(date_regex.search(url_string))
+
+    def should_follow_link(self, link: Dict[str, str]) -> Optional[Tuple[URL, int]]:
+        href: str = link.get("href")
+        link_type: str = link.get("type")
+
+        url: URL = parse_href_to_url(href)
+        if not url:
+            return None
+
+        if (
+            link_type
+            and any(map(link_type.lower().count, feed_link_types))
+            and "json+oembed" not in link_type
+        ):
+            return url, 2
+
+        is_feedlike_href = bool(feedlike_regex.search(url_query_cleaner(str(url))))
+        is_feedlike_querystring = self.is_querystring_matching(url, feedlike_regex)
+        is_podcast_href = bool(podcast_regex.search(url_query_cleaner(str(url))))
+        is_podcast_querystring = self.is_querystring_matching(url, podcast_regex)
+
+        is_feedlike_url = is_feedlike_querystring or is_feedlike_href
+        is_podcast_url = is_podcast_href or is_podcast_querystring
+
+        if not self.full_crawl and not is_feedlike_url and not is_podcast_url:
+            return None
+
+        has_author_info = bool(author_regex.search(url_query_cleaner(href)))
+        is_low_priority = self.is_low_priority(href)
+
+        priority: int = Queueable.priority
+        if is_low_priority:
+            priority = Queueable.priority + 2
+        if is_podcast_url:
+            priority = 5
+        if has_author_info:
+            priority = 4
+        if is_feedlike_url:
+            priority = 3
+
+        follow = (
+            not self.has_invalid_contents(href)
+            and self.is_valid_filetype(href)
+            and not self.has_invalid_querystring(url)
+        )
+        if follow and (self.full_crawl or is_feedlike_url or is_podcast_href):
+            if not is_feedlike_querystring:
+                url = url.with_query(None)
+            return url, priority
+        return None
+
+
+def previous(pages: List[List[Dict[str, str]]], full_crawl: bool) -> List[list]:
+    results = []
+    for links in pages:
+        link_filter = PreviousLinkFilter(None, None, full_crawl)
+        results.append([link_filter.should_follow_link(link) for link in links])
+    return results
+
+
+def uncached(pages: List[List[Dict[str, str]]], full_crawl: bool) -> List[list]:
+    return [LinkFilter(None, None, full_crawl).classify_many(links) for links in pages]
+
+
+def cached(pages: List[List[Dict[str, str]]], full_crawl: bool) -> List[list]:
+    classifier = LinkFilter.create_classifier()
+    return [
+        LinkFilter(None, None, full_crawl, classifier).classify_many(links)
+        for links in pages
+    ]
+
+
+def unique_followed(results: List[Optional[Tuple[URL, int]]]) -> List[Tuple[URL, int]]:
+    """The links of a page that are followed, once per URL, as classify_many() returns them."""
+    followed = {}
+    for values in results:
+        if values and values[0] not in followed:
+            followed[values[0]] = values
+    return list(followed.values())
+
+
+def main(args) -> None:
+    pages = create_pages(args.pages, args.links)
+    total = sum(len(links) for links in pages)
+    print(f"{args.pages} pages, {total:,} links")
+
+    for full_crawl in (False, True):
+        expected = [unique_followed(results) for results in previous(pages, full_crawl)]
+        assert uncached(pages, full_crawl) == expected
+        assert cached(pages, full_crawl) == expected
+        followed = sum(len(results) for results in expected)
+        print(f"full_crawl={full_crawl}: {followed:,} links followed, same decisions")
+
+        for name, func in [
+            ("previous", previous),
+            ("classify_many", uncached),
+            ("cached classify_many", cached),
+        ]:
+            best = 0
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                func(pages, full_crawl)
+                best = max(best, total / (time.perf_counter() - start))
+            print(f"{name:>22}: {best:,.0f} links/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=20, help="Pages crawled")
+    parser.add_argument("--links", type=int, default=2000, help="Links per page")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds, best is shown")
+    main(parser.parse_args())
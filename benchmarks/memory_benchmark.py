@@ -0,0 +1,98 @@
+"""
+Benchmark the memory used by each queued Request, Response and CallbackResult.
+
+Creates many objects as a crawl does, and reports the memory allocated per object with tracemalloc.
+Requests are followed from a Response and put on the Request Queue, so that their size includes
+everything a queued Request holds on to.
+
+Usage: python -m benchmarks.memory_benchmark --count 20000
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from typing import Callable, List
+
+import aiohttp
+from yarl import URL
+
+from feedsearch_crawler.crawler import Crawler, Response, CallbackResult
+from feedsearch_crawler.crawler.frontier import RequestFrontier
+
+
+class BenchmarkCrawler(Crawler):
+    async def parse(self, request, response):
+        pass
+
+    async def parse_xml(self, response_text):
+        return None
+
+    async def process_item(self, item):
+        pass
+
+
+def measure(create: Callable[[], List], count: int) -> float:
+    """Measure the memory in bytes allocated per object by create(), which must keep its objects alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = create()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+async def main(args) -> None:
+    history = [URL(f"http://example.com/depth/{n}") for n in range(5)]
+    parent = Response(url=history[-1], method="GET", history=history, status_code=200)
+    urls = [f"/page/{n}" for n in range(args.count)]
+
+    async with aiohttp.ClientSession() as session:
+        crawler = BenchmarkCrawler(session=session, max_depth=0)
+        # The ClientSession is normally set up by crawl().
+        crawler._session = session
+
+        queue = RequestFrontier()
+
+        # follow() is a coroutine, so the queued Requests are measured here rather than with measure().
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for url in urls:
+            request = await crawler.follow(url, crawler.parse, parent)
+            request.add_to_queue(queue)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        # Includes the Request URL, and its fingerprint in the duplicate filter.
+        print(f"  queued request: {(after - before) / args.count:,.0f} bytes")
+
+    text = "<html><body>" + "x" * 1000 + "</body></html>"
+    response_bytes = measure(
+        lambda: [
+            Response(
+                url=URL(f"http://example.com/page/{n}"),
+                method="GET",
+                text=text,
+                history=parent.history.append(URL(f"http://example.com/page/{n}")),
+                status_code=200,
+            )
+            for n in range(args.count)
+        ],
+        args.count,
+    )
+    print(
+        f"        response: {response_bytes:,.0f} bytes (incl. URL, excl. shared text)"
+    )
+
+    result_bytes = measure(
+        lambda: [CallbackResult(None, 0) for _ in range(args.count)], args.count
+    )
+    print(f" callback result: {result_bytes:,.0f} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000, help="Objects to create")
+    asyncio.run(main(parser.parse_args()))
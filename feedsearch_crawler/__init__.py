@@ -1,14 +1,21 @@
 import asyncio
 import logging
 from xml.etree import ElementTree
-from typing import List, Union
+from types import AsyncGeneratorType
+from typing import List, Union, Dict, Tuple, Type
 
 from yarl import URL
 
-from feedsearch_crawler.feed_spider import FeedsearchSpider, FeedInfo
+from feedsearch_crawler.client import FeedsearchClient, SearchResult
+from feedsearch_crawler.crawler import Item
+from feedsearch_crawler.feed_spider import FeedsearchSpider, FeedInfo, SiteMeta
+from feedsearch_crawler.feed_spider.favicon import Favicon
+from feedsearch_crawler.feed_spider.lib import sort_urls
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+logger = logging.getLogger(__name__)
+
 name = "Feedsearch Crawler"
 
 
@@ -48,16 +55,84 @@ async def search_async(
     return sort_urls(list(crawler.items))
 
 
-def sort_urls(feeds: List[FeedInfo]) -> List[FeedInfo]:
+async def search_iter(
+    url: Union[URL, str, List[Union[URL, str]]],
+    try_urls: Union[List[str], bool] = False,
+    item_types: Tuple[Type[Item], ...] = (FeedInfo,),
+    *args,
+    **kwargs
+) -> AsyncGeneratorType:
     """
-    Sort list of feeds based on Url score
+    Search asynchronously for feeds at a URL, yielding each feed as soon as it is found.
 
-    :param feeds: List of FeedInfo objects
-    :return: List of FeedInfo objects sorted by score
+    Feeds are yielded in the order they are found, not sorted by score. Site information is populated
+    with what has been found so far, and the same FeedInfo objects are updated as the crawl continues.
+    Closing the generator early cancels the search.
+
+    :param url: URL or list of URLs to search
+    :param try_urls: Tries different paths that may contain feeds.
+    :param item_types: Tuple of Item classes to yield, from FeedInfo, SiteMeta, and Favicon.
+    :return: AsyncGenerator yielding FeedInfo objects, and SiteMeta or Favicon objects if requested
+    """
+    crawler = FeedsearchSpider(try_urls=try_urls, *args, **kwargs)
+    items = crawler.crawl_iter(url, item_types)
+    try:
+        async for item in items:
+            yield item
+    finally:
+        # Close the crawl generator now, so that closing this generator cancels the crawl immediately.
+        await items.aclose()
+
+
+def search_many(
+    urls: List[Union[URL, str]],
+    max_concurrent_sites: int = 10,
+    try_urls: Union[List[str], bool] = False,
+    *args,
+    **kwargs
+) -> Dict[str, SearchResult]:
+    """
+    Search for feeds at many sites, crawling each site separately.
+
+    :param urls: List of URLs to search
+    :param max_concurrent_sites: Max number of sites to crawl at the same time.
+    :param try_urls: Tries different paths that may contain feeds.
+    :return: Dictionary of SearchResult objects, keyed by the URLs as strings
+    """
+    results = asyncio.run(
+        search_many_async(
+            urls,
+            max_concurrent_sites=max_concurrent_sites,
+            try_urls=try_urls,
+            *args,
+            **kwargs
+        )
+    )
+    return results
+
+
+async def search_many_async(
+    urls: List[Union[URL, str]],
+    max_concurrent_sites: int = 10,
+    try_urls: Union[List[str], bool] = False,
+    *args,
+    **kwargs
+) -> Dict[str, SearchResult]:
+    """
+    Search asynchronously for feeds at many sites, crawling each site separately.
+
+    Each site is crawled by its own FeedsearchSpider, with its own results, statistics and timeout,
+    but all crawls share one FeedsearchClient, with its ClientSession, connection pool and Executor.
+
+    :param urls: List of URLs to search
+    :param max_concurrent_sites: Max number of sites to crawl at the same time.
+    :param try_urls: Tries different paths that may contain feeds.
+    :return: Dictionary of SearchResult objects, keyed by the URLs as strings
     """
-    feeds = [f for f in feeds if isinstance(f, FeedInfo)]
-    sorted_urls = sorted(list(set(feeds)), key=lambda x: x.score, reverse=True)
-    return sorted_urls
+    async with FeedsearchClient(**kwargs) as client:
+        return await client.search_many_async(
+            urls, max_concurrent_sites, try_urls, *args
+        )
 
 
 def output_opml(feeds: List[FeedInfo]) -> bytes:
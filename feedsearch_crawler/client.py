@@ -0,0 +1,338 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from types import AsyncGeneratorType
+from typing import List, Union, Dict, NamedTuple, Any, Coroutine, Tuple, Type
+
+import aiohttp
+from yarl import URL
+
+from feedsearch_crawler.crawler import to_string, Item
+from feedsearch_crawler.crawler.lib import ExecutorTypes, create_executor
+from feedsearch_crawler.crawler.scheduler import DeadlineTuner
+from feedsearch_crawler.crawler.trace import add_trace_config, add_timing_trace_config
+from feedsearch_crawler.feed_spider import FeedsearchSpider, FeedInfo
+from feedsearch_crawler.feed_spider.lib import sort_urls
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResult(NamedTuple):
+    """Feeds and crawl statistics of a single site searched by search_many."""
+
+    url: Union[URL, str]
+    feeds: List[FeedInfo]
+    stats: dict
+
+
+class FeedsearchClient:
+    def __init__(
+        self,
+        ssl: bool = False,
+        trace: bool = False,
+        executor: Union[str, Executor] = ExecutorTypes.INLINE,
+        executor_workers: int = None,
+        ttl_dns_cache: int = 300,
+        target_latency: float = None,
+        target_quantile: float = 0.95,
+        **kwargs,
+    ):
+        """
+        Long-lived client for searching for feeds.
+
+        The ClientSession, connection pool, DNS cache and Executor are created once and reused by every search,
+        so that searches don't pay the cost of setting up connections and resolving hosts each time.
+        The client may be shared between concurrent searches.
+
+        Use the async methods from within an asyncio event loop, or the sync methods from anywhere else,
+        which run searches in an event loop on a background thread. Close the client when finished.
+
+        :param ssl: Enables strict SSL checking.
+        :param trace: Enables aiohttp trace debugging.
+        :param executor: Where to run CPU bound parsing work. One of "inline", "thread" or "process",
+            or an Executor instance which will not be shut down by the client.
+        :param executor_workers: Max number of threads or processes if the client creates the Executor.
+        :param ttl_dns_cache: Time in seconds to cache resolved DNS entries.
+        :param target_latency: Optional target duration in seconds of each search. When set, each search is
+            given a total_timeout budget with deadline scheduling, and the budget is tuned after each search
+            so that target_quantile of searches finish within the target. Cannot be combined with a default
+            total_timeout, which would replace the tuned budget.
+        :param target_quantile: Fraction of searches that should finish within target_latency.
+        :param kwargs: Default FeedsearchSpider keyword arguments for each search.
+        """
+        self._ssl = ssl
+        self._trace = trace
+        self._ttl_dns_cache = ttl_dns_cache
+        self._crawler_kwargs = kwargs
+
+        # Tunes the time budget of each search to meet the target latency.
+        self._tuner: Union[DeadlineTuner, None] = None
+        if target_latency:
+            if "total_timeout" in kwargs:
+                raise ValueError("target_latency cannot be combined with total_timeout")
+            self._tuner = DeadlineTuner(target_latency, target_quantile)
+
+        self._owns_executor = isinstance(executor, str)
+        if self._owns_executor:
+            executor = create_executor(executor, executor_workers)
+        self._executor: Union[Executor, None] = executor
+
+        # ClientSession and the event loop it belongs to. Created on first search.
+        self._session: Union[aiohttp.ClientSession, None] = None
+        self._session_loop: Union[asyncio.AbstractEventLoop, None] = None
+
+        # Event loop and thread used by the sync methods. Created on first sync search.
+        self._loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._thread: Union[threading.Thread, None] = None
+        self._lock = threading.Lock()
+
+        self.closed: bool = False
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the ClientSession, creating it within the running event loop if it doesn't exist.
+
+        :return: ClientSession
+        """
+        if self.closed:
+            raise RuntimeError("FeedsearchClient is closed")
+
+        loop = asyncio.get_running_loop()
+        if not self._session:
+            trace_configs = [add_timing_trace_config()]
+            if self._trace:
+                trace_configs.append(add_trace_config())
+
+            conn = aiohttp.TCPConnector(
+                limit=0, ssl=self._ssl, ttl_dns_cache=self._ttl_dns_cache
+            )
+            self._session = aiohttp.ClientSession(
+                connector=conn, trace_configs=trace_configs
+            )
+            self._session_loop = loop
+        elif self._session_loop is not loop:
+            raise RuntimeError(
+                "FeedsearchClient cannot be used from more than one event loop"
+            )
+        return self._session
+
+    def _create_crawler(self, try_urls: Union[List[str], bool], *args, **kwargs):
+        """
+        Create a FeedsearchSpider that uses the client ClientSession and Executor.
+
+        :param try_urls: Tries different paths that may contain feeds.
+        :return: FeedsearchSpider
+        """
+        kwargs = {**self._crawler_kwargs, **kwargs}
+        if self._tuner:
+            kwargs.setdefault("total_timeout", self._tuner.budget)
+            kwargs.setdefault("deadline_scheduling", True)
+        if self._executor:
+            kwargs["executor"] = self._executor
+        return FeedsearchSpider(
+            try_urls=try_urls, session=self._get_session(), *args, **kwargs
+        )
+
+    def _record_duration(self, start: float) -> None:
+        """
+        Record the duration of a search to tune the budget of later searches.
+
+        :param start: perf_counter time at which the search started
+        """
+        if self._tuner:
+            self._tuner.record(time.perf_counter() - start)
+
+    async def search_async(
+        self,
+        url: Union[URL, str, List[Union[URL, str]]],
+        try_urls: Union[List[str], bool] = False,
+        *args,
+        **kwargs,
+    ) -> List[FeedInfo]:
+        """
+        Search asynchronously for feeds at a URL.
+
+        :param url: URL or list of URLs to search
+        :param try_urls: Tries different paths that may contain feeds.
+        :return: List of FeedInfo objects
+        """
+        start = time.perf_counter()
+        crawler = self._create_crawler(try_urls, *args, **kwargs)
+        await crawler.crawl(url)
+        self._record_duration(start)
+
+        return sort_urls(list(crawler.items))
+
+    async def search_iter(
+        self,
+        url: Union[URL, str, List[Union[URL, str]]],
+        try_urls: Union[List[str], bool] = False,
+        item_types: Tuple[Type[Item], ...] = (FeedInfo,),
+        *args,
+        **kwargs,
+    ) -> AsyncGeneratorType:
+        """
+        Search asynchronously for feeds at a URL, yielding each feed as soon as it is found.
+
+        Feeds are yielded in the order they are found, not sorted by score.
+        Closing the generator early cancels the search.
+
+        :param url: URL or list of URLs to search
+        :param try_urls: Tries different paths that may contain feeds.
+        :param item_types: Tuple of Item classes to yield, from FeedInfo, SiteMeta, and Favicon.
+        :return: AsyncGenerator yielding FeedInfo objects, and SiteMeta or Favicon objects if requested
+        """
+        crawler = self._create_crawler(try_urls, *args, **kwargs)
+        items = crawler.crawl_iter(url, item_types)
+        try:
+            async for item in items:
+                yield item
+        finally:
+            # Close the crawl generator now, so that closing this generator cancels the crawl immediately.
+            await items.aclose()
+
+    async def search_many_async(
+        self,
+        urls: List[Union[URL, str]],
+        max_concurrent_sites: int = 10,
+        try_urls: Union[List[str], bool] = False,
+        *args,
+        **kwargs,
+    ) -> Dict[str, SearchResult]:
+        """
+        Search asynchronously for feeds at many sites, crawling each site separately.
+
+        Each site is crawled by its own FeedsearchSpider, with its own results, statistics and timeout.
+
+        :param urls: List of URLs to search
+        :param max_concurrent_sites: Max number of sites to crawl at the same time.
+        :param try_urls: Tries different paths that may contain feeds.
+        :return: Dictionary of SearchResult objects, keyed by the URLs as strings
+        """
+        semaphore = asyncio.Semaphore(max_concurrent_sites)
+
+        async def search_site(url: Union[URL, str]) -> SearchResult:
+            async with semaphore:
+                start = time.perf_counter()
+                crawler = self._create_crawler(try_urls, *args, **kwargs)
+                try:
+                    await crawler.crawl(url)
+                except Exception as e:
+                    logger.exception("Failed to search %s: %s", url, e)
+                self._record_duration(start)
+                return SearchResult(
+                    url, sort_urls(list(crawler.items)), crawler.get_stats()
+                )
+
+        results = await asyncio.gather(*(search_site(url) for url in urls))
+        return {to_string(result.url): result for result in results}
+
+    async def aclose(self) -> None:
+        """
+        Close the ClientSession and shut down the Executor if it was created by the client.
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        if self._session:
+            await self._session.close()
+        if self._executor and self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def _run(self, coro: Coroutine) -> Any:
+        """
+        Run a coroutine in the background event loop thread, and wait for the result.
+
+        :param coro: Coroutine to run
+        :return: Result of the coroutine
+        """
+        with self._lock:
+            if self.closed:
+                coro.close()
+                raise RuntimeError("FeedsearchClient is closed")
+            if not self._loop:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="FeedsearchClient", daemon=True
+                )
+                self._thread.start()
+
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def search(
+        self,
+        url: Union[URL, str, List[Union[URL, str]]],
+        try_urls: Union[List[str], bool] = False,
+        *args,
+        **kwargs,
+    ) -> List[FeedInfo]:
+        """
+        Search for feeds at a URL. Runs in the background event loop thread.
+
+        :param url: URL or list of URLs to search
+        :param try_urls: Tries different paths that may contain feeds.
+        :return: List of FeedInfo objects
+        """
+        return self._run(self.search_async(url, try_urls, *args, **kwargs))
+
+    def search_many(
+        self,
+        urls: List[Union[URL, str]],
+        max_concurrent_sites: int = 10,
+        try_urls: Union[List[str], bool] = False,
+        *args,
+        **kwargs,
+    ) -> Dict[str, SearchResult]:
+        """
+        Search for feeds at many sites, crawling each site separately. Runs in the background event loop thread.
+
+        :param urls: List of URLs to search
+        :param max_concurrent_sites: Max number of sites to crawl at the same time.
+        :param try_urls: Tries different paths that may contain feeds.
+        :return: Dictionary of SearchResult objects, keyed by the URLs as strings
+        """
+        return self._run(
+            self.search_many_async(
+                urls, max_concurrent_sites, try_urls, *args, **kwargs
+            )
+        )
+
+    def close(self) -> None:
+        """
+        Close the client and stop the background event loop thread.
+
+        If the client was used from your own event loop, use aclose() instead.
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+
+        if not loop:
+            if self._session and not self.closed:
+                raise RuntimeError(
+                    "FeedsearchClient was used from an event loop, use aclose() instead"
+                )
+            if self._executor and self._owns_executor:
+                self._executor.shutdown(wait=False)
+            self.closed = True
+            return
+
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def __aenter__(self) -> "FeedsearchClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def __enter__(self) -> "FeedsearchClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
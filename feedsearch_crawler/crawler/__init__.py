@@ -1,5 +1,6 @@
 from feedsearch_crawler.crawler.crawler import Crawler
 from feedsearch_crawler.crawler.duplicatefilter import DuplicateFilter
+from feedsearch_crawler.crawler.history import History
 from feedsearch_crawler.crawler.item import Item
 from feedsearch_crawler.crawler.item_parser import ItemParser
 from feedsearch_crawler.crawler.lib import (
@@ -16,6 +17,7 @@ __all__ = [
     "Item",
     "ItemParser",
     "DuplicateFilter",
+    "History",
     "Request",
     "Response",
     "to_bytes",
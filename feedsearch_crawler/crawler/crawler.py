@@ -4,10 +4,9 @@ import inspect
 import logging
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from fnmatch import fnmatch
-from statistics import harmonic_mean, median
+from concurrent.futures import Executor
 from types import AsyncGeneratorType
-from typing import List, Any, Dict, Set
+from typing import List, Any, Dict, Set, Callable, Optional, Iterable, Tuple
 from typing import Union
 
 import aiohttp
@@ -15,7 +14,9 @@ import time
 from aiohttp import ClientTimeout
 from yarl import URL
 
+from feedsearch_crawler.crawler.domain_matcher import DomainMatcher
 from feedsearch_crawler.crawler.duplicatefilter import DuplicateFilter
+from feedsearch_crawler.crawler.history import History
 from feedsearch_crawler.crawler.item import Item
 from feedsearch_crawler.crawler.lib import (
     coerce_url,
@@ -24,11 +25,26 @@ from feedsearch_crawler.crawler.lib import (
     CallbackResult,
     CrawlerPriorityQueue,
     parse_href_to_url,
+    ExecutorTypes,
+    create_executor,
+    StopReasons,
 )
 from feedsearch_crawler.crawler.queueable import Queueable
 from feedsearch_crawler.crawler.request import Request
 from feedsearch_crawler.crawler.response import Response
-from feedsearch_crawler.crawler.trace import add_trace_config
+from feedsearch_crawler.crawler.frontier import (
+    RequestFrontier,
+    HostFairFrontier,
+    FrontierPolicies,
+)
+from feedsearch_crawler.crawler.metrics import CrawlerMetrics
+from feedsearch_crawler.crawler.scheduler import HostScheduler
+from feedsearch_crawler.crawler.stats import StreamingStats
+from feedsearch_crawler.crawler.trace import (
+    add_trace_config,
+    add_timing_trace_config,
+    RequestTimingStats,
+)
 
 try:
     import uvloop
@@ -49,6 +65,16 @@ class Crawler(ABC):
     # Not an instantiation of the class.
     duplicate_filter_class = DuplicateFilter
 
+    # Class Name of the Host Scheduler, which spaces out Requests to the same host by the Request delay.
+    # May be overridden to use a different Host Scheduler.
+    host_scheduler_class = HostScheduler
+
+    # Class Name of the Request Queue.
+    # May be overridden to use a different Request Queue.
+    request_queue_class = RequestFrontier
+    # Request Queue class used when fair_hosts is enabled.
+    host_fair_queue_class = HostFairFrontier
+
     # Callback to be run after all workers are finished.
     post_crawl_callback = None
 
@@ -59,24 +85,38 @@ class Crawler(ABC):
 
     # Max number of concurrent http requests.
     concurrency: int = 10
+    # Number of workers processing Request callback results.
+    parse_concurrency: int = 10
+    # Max number of Request callback results waiting to be processed.
+    parse_queue_size: int = 20
     # Max size of incoming http response content.
     max_content_length = 1024 * 1024 * 10
     # Max crawl depth. i.e. The max length of the response history.
     max_depth: int = 4
     # Max callback recursion depth, to prevent accidental infinite recursion from AsyncGenerators.
     max_callback_recursion: int = 10
-    # Time in seconds to delay each HTTP request.
+    # Minimum time in seconds between HTTP requests to the same host.
     delay: float = 0
+    # Stop the crawl once this many Items have been found. 0 for no limit.
+    max_items: int = 0
+    # Stop the crawl once this many bytes of Response content have been fetched. 0 for no limit.
+    max_bytes: int = 0
+    # Stop the crawl after this many consecutive Responses are processed without finding a new Item. 0 for no limit.
+    max_idle_responses: int = 0
 
     # List of worker tasks.
     _workers = []
 
-    # ClientSession for requests. Created on Crawl start.
+    # ClientSession for requests. Created on Crawl start, unless a ClientSession is provided.
     _session: aiohttp.ClientSession
     # Task queue for Requests. Created on Crawl start.
-    _request_queue: CrawlerPriorityQueue
-    # Semaphore for controlling HTTP Request concurrency.
-    _semaphore: asyncio.Semaphore
+    _request_queue: RequestFrontier
+    # Bounded task queue for Request callback results. Created on Crawl start.
+    _parse_queue: CrawlerPriorityQueue
+    # Executor for CPU bound work. Created on Crawl start, unless an Executor instance is provided.
+    _executor: Union[Executor, None] = None
+    # Event set when the crawl should stop early. Created on Crawl start.
+    _stop_event: Union[asyncio.Event, None] = None
 
     def __init__(
         self,
@@ -94,6 +134,24 @@ class Crawler(ABC):
         max_retries: int = 3,
         ssl: bool = False,
         trace: bool = False,
+        parse_concurrency: int = None,
+        parse_queue_size: int = None,
+        executor: Union[str, Executor] = ExecutorTypes.INLINE,
+        executor_workers: int = None,
+        session: aiohttp.ClientSession = None,
+        max_items: int = 0,
+        max_bytes: int = 0,
+        max_idle_responses: int = 0,
+        metrics: CrawlerMetrics = None,
+        timing_sample_rate: float = 1.0,
+        max_queue_size: int = 0,
+        max_queue_memory: int = 0,
+        queue_policy: str = FrontierPolicies.EVICT,
+        fair_hosts: bool = False,
+        deadline_scheduling: bool = False,
+        stall_timeout: float = 0,
+        min_read_rate: int = 0,
+        bloom_error_rate: float = 0,
         *args,
         **kwargs,
     ):
@@ -103,7 +161,7 @@ class Crawler(ABC):
         :param allowed_schemes: List of strings of allowed Request URI schemes. e.g. ["http", "https"]
         :param start_urls: List of initial URLs to crawl.
         :param allowed_domains: List of domain patterns that are allowed. Uses Unix shell-style wildcards.
-        :param concurrency: Max number of workers and of concurrent HTTP requests.
+        :param concurrency: Max number of fetch workers and of concurrent HTTP requests.
         :param total_timeout: Total aiohttp ClientSession timeout in seconds.
             Crawl will end if this timeout is triggered.
         :param request_timeout: Total timeout in seconds for each individual HTTP request.
@@ -111,10 +169,41 @@ class Crawler(ABC):
         :param max_content_length: Max size in bytes of incoming http response content.
         :param max_depth: Max crawl depth. i.e. The max length of the response history.
         :param headers: Default HTTP headers to be included in each request.
-        :param delay: Time in seconds to delay each HTTP request.
+        :param delay: Minimum time in seconds between HTTP requests to the same host.
         :param max_retries: Maximum number of retries for each failed HTTP request.
         :param ssl: Enables strict SSL checking.
         :param trace: Enables aiohttp trace debugging.
+        :param parse_concurrency: Number of workers processing Request callback results. Defaults to concurrency.
+        :param parse_queue_size: Max number of Request callback results waiting to be processed.
+            Fetch workers wait for space on the queue when it is full. Defaults to twice concurrency.
+        :param executor: Where to run CPU bound parsing work. One of "inline", "thread" or "process",
+            or an Executor instance which will not be shut down by the Crawler.
+        :param executor_workers: Max number of threads or processes if the Crawler creates the Executor.
+        :param session: Optional aiohttp ClientSession to share between crawls. It will not be closed by the Crawler.
+            The ssl and trace arguments then have no effect, as they are properties of the ClientSession.
+        :param max_items: Stop the crawl once this many Items have been found. 0 for no limit.
+        :param max_bytes: Stop the crawl once this many bytes of Response content have been fetched. 0 for no limit.
+        :param max_idle_responses: Stop the crawl after this many consecutive Responses are processed
+            without finding a new Item. 0 for no limit.
+        :param metrics: Optional CrawlerMetrics to update live during the crawl, which may be shared between crawls.
+        :param timing_sample_rate: Fraction of HTTP requests to record phase timings for, between 0 and 1.
+            A provided ClientSession must include the add_timing_trace_config() TraceConfig for the timings
+            of the DNS, connect, TTFB and redirect phases to be recorded.
+        :param max_queue_size: Max number of Requests waiting to be fetched. 0 for no limit.
+        :param max_queue_memory: Max estimated memory in bytes of Requests waiting to be fetched. 0 for no limit.
+        :param queue_policy: What to do when the Request Queue is full. One of "evict", to drop the lowest priority
+            Requests, or "block", to make callbacks wait for space, evicting only if waiting could deadlock the crawl.
+        :param fair_hosts: Take Requests from each host in turn, instead of only by priority, so that one host
+            with many Requests doesn't occupy every fetch worker.
+        :param deadline_scheduling: Skip Requests that aren't expected to finish before total_timeout, based on the
+            average duration of Requests to their host, so that the crawl finishes with the results it has
+            instead of timing out with Requests in flight.
+        :param stall_timeout: Cancel an in-flight Request if it receives no response headers or content for this
+            many seconds. 0 to disable.
+        :param min_read_rate: Cancel an in-flight Request if its response content is read slower than this many
+            bytes per second, once it has been read for stall_timeout seconds. 0 for no minimum.
+        :param bloom_error_rate: Store seen URLs in a scalable Bloom filter with this false positive rate,
+            which uses much less memory on very large crawls, but may skip a URL that wasn't seen. 0 to use a set.
         :param args: Additional positional arguments for subclasses.
         :param kwargs: Additional keyword arguments for subclasses.
         """
@@ -122,6 +211,8 @@ class Crawler(ABC):
         self.allowed_domains = allowed_domains or []
 
         self.concurrency = concurrency
+        self.parse_concurrency = parse_concurrency or concurrency
+        self.parse_queue_size = parse_queue_size or concurrency * 2
 
         if not isinstance(total_timeout, ClientTimeout):
             total_timeout = aiohttp.ClientTimeout(total=total_timeout)
@@ -148,23 +239,75 @@ class Crawler(ABC):
         self.max_retries = max_retries
         self._ssl = ssl
         self._trace = trace
+        self._executor_option = executor
+        self._executor_workers = executor_workers
+        self._external_session = session
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_idle_responses = max_idle_responses
+        self.metrics = metrics
+        self.timing_sample_rate = timing_sample_rate
+
+        self.max_queue_size = max_queue_size
+        self.max_queue_memory = max_queue_memory
+        self.queue_policy = queue_policy
+        self.fair_hosts = fair_hosts
+        self.deadline_scheduling = deadline_scheduling
+
+        # Compiled allowed domain patterns.
+        self._domain_matcher: Optional[DomainMatcher] = None
+
+        # Monotonic time at which the crawl times out, if deadline scheduling is enabled.
+        self._deadline: Union[float, None] = None
+
+        self.stall_timeout = stall_timeout
+        self.min_read_rate = min_read_rate
+
+        # Requests currently being fetched.
+        self._in_flight: Set[Request] = set()
+
+        # Histograms of the phase timings of sampled HTTP requests.
+        self._request_timings = RequestTimingStats(timing_sample_rate)
+
+        # Queue sizes last added to the shared queue size metrics by this Crawler.
+        self._metrics_queue_sizes: Dict[str, int] = {"request": 0, "parse": 0}
+
+        # Number of consecutive Responses processed without finding a new Item.
+        self._idle_responses = 0
 
         # Default set for parsed items.
         self.items: set = set()
 
         # URL Duplicate Filter instance.
-        self._duplicate_filter = self.duplicate_filter_class()
-
-        # List of total durations in Milliseconds for the total handling time of all Requests.
-        self._stats_request_durations = []
-        # List of total duration in Milliseconds of all HTTP requests.
-        self._stats_request_latencies = []
-        # List of Content Length in bytes of all Responses.
-        self._stats_response_content_lengths = []
-        # List of time in Milliseconds that each item spend on the queue.
-        self._stats_queue_wait_times = []
-        # List of the size of the queue each time an item was popped off the queue.
-        self._stats_queue_sizes = []
+        if bloom_error_rate:
+            self._duplicate_filter = self.duplicate_filter_class(
+                error_rate=bloom_error_rate
+            )
+        else:
+            self._duplicate_filter = self.duplicate_filter_class()
+
+        # Host Scheduler instance.
+        self._host_scheduler = self.host_scheduler_class()
+        # Timer handles of scheduled releases of held Requests, keyed by host.
+        self._host_releases: Dict[str, asyncio.TimerHandle] = {}
+
+        # Fixed-memory summaries of values recorded during the crawl, read by record_statistics.
+        # Total durations in Milliseconds for the total handling time of all Requests.
+        self._stats_request_durations = StreamingStats()
+        # Total duration in Milliseconds of all HTTP requests.
+        self._stats_request_latencies = StreamingStats()
+        # Content Length in bytes of all Responses.
+        self._stats_response_content_lengths = StreamingStats()
+        # Time in Milliseconds that each Request spent on the request queue.
+        self._stats_queue_wait_times = StreamingStats()
+        # Size of the request queue each time a Request was popped off the queue.
+        self._stats_queue_sizes = StreamingStats()
+        # Time in Milliseconds that each callback result spent on the parse queue.
+        self._stats_parse_queue_wait_times = StreamingStats()
+        # Size of the parse queue each time a callback result was popped off the queue.
+        self._stats_parse_queue_sizes = StreamingStats()
+        # Time in Milliseconds taken to process each callback result.
+        self._stats_parse_durations = StreamingStats()
 
         # Initialise Crawl Statistics.
         self.stats: dict = {
@@ -183,6 +326,15 @@ class Crawler(ABC):
             Stats.REQUESTS_DURATION_MIN: 0,
             Stats.REQUESTS_DURATION_TOTAL: 0,
             Stats.REQUESTS_DURATION_MEDIAN: 0,
+            Stats.REQUESTS_DURATION_P90: 0,
+            Stats.REQUESTS_DURATION_P99: 0,
+            Stats.REQUESTS_LATENCY_AVG: 0,
+            Stats.REQUESTS_LATENCY_MAX: 0,
+            Stats.REQUESTS_LATENCY_MIN: 0,
+            Stats.REQUESTS_LATENCY_MEDIAN: 0,
+            Stats.REQUESTS_LATENCY_P90: 0,
+            Stats.REQUESTS_LATENCY_P99: 0,
+            Stats.REQUESTS_LATENCY_TOTAL: 0,
             Stats.TOTAL_DURATION: 0,
             Stats.STATUS_CODES: {},
             Stats.QUEUE_WAIT_MAX: 0,
@@ -194,6 +346,25 @@ class Crawler(ABC):
             Stats.QUEUE_SIZE_MEDIAN: 0,
             Stats.QUEUED_TOTAL: 0,
             Stats.REQUESTS_RETRIED: 0,
+            Stats.REQUESTS_DELAYED: 0,
+            Stats.PARSE_QUEUE_WAIT_MAX: 0,
+            Stats.PARSE_QUEUE_WAIT_MIN: 0,
+            Stats.PARSE_QUEUE_WAIT_AVG: 0,
+            Stats.PARSE_QUEUE_WAIT_MEDIAN: 0,
+            Stats.PARSE_QUEUE_SIZE_MAX: 0,
+            Stats.PARSE_QUEUE_SIZE_AVG: 0,
+            Stats.PARSE_QUEUE_SIZE_MEDIAN: 0,
+            Stats.PARSE_DURATION_MAX: 0,
+            Stats.PARSE_DURATION_TOTAL: 0,
+            Stats.PARSE_DURATION_MEDIAN: 0,
+            Stats.STOP_REASON: "",
+            Stats.REQUESTS_EVICTED: 0,
+            Stats.REQUESTS_SKIPPED: 0,
+            Stats.REQUESTS_STALLED: 0,
+            Stats.RESPONSES_TRUNCATED: 0,
+            Stats.REQUESTS_CANCELLED: 0,
+            Stats.CONTENT_LENGTH_PARTIAL: 0,
+            Stats.REQUESTS_PHASES: {},
         }
 
     async def _handle_request(self, request: Request) -> None:
@@ -210,13 +381,34 @@ class Crawler(ABC):
 
             start = time.perf_counter()
 
+            # Sample the request to record its phase timings.
+            request.timings = self._request_timings.sample()
+
             # Fetch the request and run its callback
-            # results, response = await request.fetch_callback(self._semaphore)
-            results, response = await request.fetch_callback()
+            self._in_flight.add(request)
+            if self.metrics:
+                self.metrics.requests_in_flight.inc()
+            try:
+                results, response = await request.fetch_callback()
+            except asyncio.CancelledError:
+                self.stats[Stats.REQUESTS_CANCELLED] += 1
+                self.stats[Stats.CONTENT_LENGTH_PARTIAL] += request.bytes_read
+                raise
+            finally:
+                self._in_flight.discard(request)
+                if self.metrics:
+                    self.metrics.requests_in_flight.dec()
+
+            if request.stalled:
+                self.stats[Stats.REQUESTS_STALLED] += 1
+                self.stats[Stats.CONTENT_LENGTH_PARTIAL] += request.bytes_read
+            elif request.truncated:
+                self.stats[Stats.RESPONSES_TRUNCATED] += 1
 
             dur = int((time.perf_counter() - start) * 1000)
-            self._stats_request_durations.append(dur)
-            self._stats_request_latencies.append(request.req_latency)
+            self._stats_request_durations.add(dur)
+            self._host_scheduler.record_latency(request.url.host or "", dur / 1000)
+            self._stats_request_latencies.add(request.req_latency)
             logger.debug(
                 "Fetched: url=%s dur=%dms latency=%dms read=%dms status=%s prev=%s",
                 response.url,
@@ -227,6 +419,9 @@ class Crawler(ABC):
                 response.originator_url,
             )
 
+            if response.timings:
+                self._request_timings.record(response.timings)
+
             if response.ok:
                 self.stats[Stats.REQUESTS_SUCCESSFUL] += 1
             else:
@@ -237,15 +432,32 @@ class Crawler(ABC):
             else:
                 self.stats[Stats.STATUS_CODES][response.status_code] = 1
 
-            self._stats_response_content_lengths.append(response.content_length)
+            self._stats_response_content_lengths.add(response.content_length)
+            self.stats[Stats.CONTENT_LENGTH_TOTAL] += response.content_length
+            if self.metrics:
+                self.metrics.requests.inc(status=response.status_code)
+                self.metrics.response_bytes.inc(response.content_length)
+                self.metrics.response_size.observe(response.content_length)
+                self.metrics.request_duration.observe(dur / 1000)
+            if (
+                self.max_bytes
+                and self.stats[Stats.CONTENT_LENGTH_TOTAL] >= self.max_bytes
+            ):
+                self.stop(StopReasons.MAX_BYTES)
 
             # Mark the Response URL as seen in the duplicate filter, as it may be different from the Request URL
-            # due to redirects.
-            await self._duplicate_filter.url_seen(response.url, response.method)
+            # due to redirects. Reuse the Request fingerprint if not redirected, to avoid canonicalizing the URL again.
+            fingerprint = None
+            if response.url == request.url and response.method == request.method:
+                fingerprint = request.fingerprint
+            await self._duplicate_filter.url_seen(
+                response.url, response.method, fingerprint
+            )
 
-            # Add callback results to the queue for processing.
+            # Add callback results to the parse queue for processing.
+            # Waits for space on the parse queue if the parse workers are falling behind.
             if results:
-                self._put_queue(CallbackResult(results, 0))
+                await self._put_parse_queue(CallbackResult(results, 0))
 
             # Add Request back to the queue for retrying.
             if request.should_retry:
@@ -254,10 +466,9 @@ class Crawler(ABC):
 
         except asyncio.CancelledError as e:
             logger.debug("Cancelled: %s, %s", request, e)
+            raise
         except Exception as e:
             logger.exception("Exception during %s: %s", request, e)
-        finally:
-            return
 
     async def _process_request_callback_result(
         self, result: Any, callback_recursion: int = 0
@@ -282,46 +493,80 @@ class Crawler(ABC):
                 await self._process_request_callback_result(
                     result.result, result.callback_recursion
                 )
-            # For async generators, put each value back on the queue for processing.
+            # For async generators, process each value in turn.
             # This will happen recursively until the end of the recursion chain or max_callback_recursion is reached.
             elif inspect.isasyncgen(result):
                 async for value in result:
                     if value:
-                        self._put_queue(CallbackResult(value, callback_recursion + 1))
-            # For coroutines, await the result then put the value back on the queue for further processing.
+                        await self._process_request_callback_result(
+                            value, callback_recursion + 1
+                        )
+            # For coroutines, await the result then process the value.
             elif inspect.iscoroutine(result):
                 value = await result
-                self._put_queue(CallbackResult(value, callback_recursion + 1))
+                await self._process_request_callback_result(
+                    value, callback_recursion + 1
+                )
             # Requests are put onto the queue to be fetched.
             elif isinstance(result, Request):
-                self._process_request(result)
+                await self._process_request(result)
 
             # Items are handled by the implementing Class.
             elif isinstance(result, Item):
                 await self.process_item(result)
                 self.stats[Stats.ITEMS_PROCESSED] += 1
+                if self.metrics:
+                    self.metrics.items.inc(type=result.__class__.__name__)
+                if self.max_items and len(self.items) >= self.max_items:
+                    self.stop(StopReasons.MAX_ITEMS)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.exception(e)
 
-    def _process_request(self, request: Request) -> None:
+    async def _process_request(self, request: Request, wait: bool = True) -> None:
         """
         Process a Request onto the Request Queue.
 
         :param request: HTTP Request
+        :param wait: Wait for space if the Request Queue is full and its policy is to block.
         :return: None
         """
         if not request:
             return
 
+        if wait:
+            await self._request_queue.wait_for_space()
+
         self.stats[Stats.REQUESTS_QUEUED] += 1
         logger.debug("Queue Add: %s", request)
         # Add the Request to the queue for processing.
         self._put_queue(request)
 
+    async def _process_requests(
+        self, requests: List[Request], wait: bool = True
+    ) -> None:
+        """
+        Process many Requests onto the Request Queue at once.
+
+        :param requests: List of HTTP Requests
+        :param wait: Wait for space if the Request Queue is full and its policy is to block.
+        :return: None
+        """
+        if not requests:
+            return
+
+        if wait:
+            await self._request_queue.wait_for_space()
+
+        self.stats[Stats.REQUESTS_QUEUED] += len(requests)
+        logger.debug("Queue Add: %d Requests", len(requests))
+        self._put_queue_many(requests)
+
     def is_allowed_domain(self, url: URL) -> bool:
         """
         Check that the URL host is in the list of allowed domain patterns.
-        Domain patterns are Unix shell-style wildcards.
+        Domain patterns are Unix shell-style wildcards, and are matched with a compiled DomainMatcher.
         https://docs.python.org/3/library/fnmatch.html
 
         :param url: URL object
@@ -333,10 +578,10 @@ class Crawler(ABC):
         try:
             if not url or not url.host:
                 return False
-            host = url.host
-            for domain_pattern in self.allowed_domains:
-                if fnmatch(host, domain_pattern):
-                    return True
+            # The patterns are compiled when the crawl starts, or here if checked before the crawl.
+            if self._domain_matcher is None:
+                self._domain_matcher = DomainMatcher(self.allowed_domains)
+            return self._domain_matcher.match(url.host)
         except Exception as e:
             logger.warning(e)
         return False
@@ -360,7 +605,7 @@ class Crawler(ABC):
         Follow a URL by creating an HTTP Request.
 
         If the URL is not absolute then it is joined with the previous Response URL.
-        The previous Response history is copied to the Request.
+        The previous Response history is shared with the Request.
 
         Before a Request is followed, first check that the Request URL has not already been seen,
         that the max URL depth has not been reached, and that the URI scheme is allowed.
@@ -391,7 +636,7 @@ class Crawler(ABC):
             logger.warning("Attempted to follow invalid URL: %s", original_url)
             return
 
-        history = []
+        history = None
         if response:
             # Join the URL to the Response URL if it doesn't contain a domain.
             if not url.is_absolute() or not url.scheme:
@@ -405,8 +650,8 @@ class Crawler(ABC):
                 logger.debug("Max Depth of '%d' reached: %s", self.max_depth, url)
                 return
 
-            # Copy the Response history so that it isn't a reference to a mutable object.
-            history = copy.deepcopy(response.history)
+            # History is immutable, so the Response history can be shared by every Request it links to.
+            history = response.history
         else:
             if not url.is_absolute():
                 logger.debug("URL should have domain: %s", url)
@@ -426,12 +671,134 @@ class Crawler(ABC):
             return
 
         # Check if URL is not already seen, and add it to the duplicate filter seen list.
-        if await self._duplicate_filter.url_seen(url, method):
+        fingerprint = self._duplicate_filter.url_fingerprint(url, method)
+        if await self._duplicate_filter.url_seen(url, method, fingerprint):
             return
 
+        return self.create_request(
+            url,
+            callback,
+            history,
+            method=method,
+            delay=delay,
+            priority=priority,
+            cb_kwargs=cb_kwargs,
+            max_content_length=max_content_length,
+            timeout=timeout,
+            retries=retries,
+            fingerprint=fingerprint,
+            **kwargs,
+        )
+
+    async def follow_many(
+        self,
+        urls: Iterable[Tuple[Union[str, URL], int]],
+        response: Response = None,
+        callback=None,
+        method: str = "GET",
+        allow_domain: bool = False,
+        wait: bool = True,
+        **kwargs,
+    ) -> List[Request]:
+        """
+        Follow many URLs, such as the links of a page, and put the new Requests onto the Request Queue at once.
+
+        Performs the same checks as follow(), but the checks that only depend on the Response are made once
+        for the whole batch, and the URLs are deduplicated in one pass of the duplicate filter.
+
+        :param urls: Tuples of (URL, priority) to follow. A priority of 0 keeps the default priority.
+        :param response: Previous Response that contained the URLs.
+        :param callback: Callback method to run if each Request is successful.
+        :param method: HTTP method for the Requests.
+        :param allow_domain: Optionally override the allowed domains check.
+        :param wait: Wait for space if the Request Queue is full and its policy is to block.
+        :param kwargs: Optional Request keyword arguments, as for follow().
+        :return: List of the new Requests, which were put onto the Request Queue unless it was full
+        """
+        history = None
+        if response:
+            # Restrict the depth of the Request chain to the maximum depth.
+            if self.max_depth and len(response.history) >= self.max_depth:
+                logger.debug("Max Depth of '%d' reached: %s", self.max_depth, response)
+                return []
+            history = response.history
+
+        # Priority of each URL, keeping the first priority of URLs that are followed more than once.
+        priorities: Dict[URL, int] = {}
+        for url, priority in urls:
+            if isinstance(url, str):
+                url = parse_href_to_url(url)
+            if not url:
+                continue
+
+            if response:
+                # Join the URL to the Response URL if it doesn't contain a domain.
+                if not url.is_absolute() or not url.scheme:
+                    url = coerce_url(
+                        response.origin.join(url), default_scheme=response.scheme
+                    )
+            elif not url.is_absolute():
+                continue
+            elif not url.scheme:
+                url = coerce_url(url)
+
+            if self.allowed_schemes and url.scheme not in self.allowed_schemes:
+                continue
+            if not allow_domain and not self.is_allowed_domain(url):
+                continue
+            priorities.setdefault(url, priority)
+
+        requests = [
+            self.create_request(
+                url,
+                callback,
+                history,
+                method=method,
+                priority=priorities[url],
+                fingerprint=fingerprint,
+                **kwargs,
+            )
+            for url, fingerprint in await self._duplicate_filter.filter_seen(
+                priorities, method
+            )
+        ]
+        await self._process_requests(requests, wait=wait)
+        return requests
+
+    def create_request(
+        self,
+        url: URL,
+        callback=None,
+        history: History = None,
+        method: str = "GET",
+        delay: Union[float, None] = None,
+        priority: int = 0,
+        cb_kwargs: Dict = None,
+        max_content_length: int = None,
+        timeout: float = None,
+        retries: int = None,
+        fingerprint: int = None,
+        **kwargs,
+    ) -> Request:
+        """
+        Create a Request to a URL that has passed the follow() checks, with the Crawler defaults.
+        May be overridden to add Request keyword arguments to every followed URL.
+
+        :param url: Absolute URL to request.
+        :param callback: Callback method to run if the Request is successful.
+        :param history: Response history shared with the Request.
+        :param fingerprint: Duplicate filter fingerprint of the URL.
+        :param kwargs: Optional Request keyword arguments, as for follow().
+        :return: Request
+        """
+        # Include the Crawler headers with each Request, as the ClientSession may be shared with other Crawlers.
+        headers = kwargs.pop("headers", None)
+        headers = {**self.headers, **headers} if headers else self.headers
+
         request = Request(
             url=url,
             request_session=self._session,
+            headers=headers,
             history=history,
             callback=callback,
             xml_parser=self.parse_xml,
@@ -444,6 +811,9 @@ class Crawler(ABC):
             **kwargs,
         )
 
+        # The fingerprint is kept on the Request, so that it isn't computed again once the Request is fetched.
+        request.fingerprint = fingerprint
+
         # Override the Request priority only if the kwarg is provided.
         if priority:
             request.priority = priority
@@ -460,15 +830,32 @@ class Crawler(ABC):
         self.items.add(item)
 
     @abstractmethod
-    async def parse_xml(self, response_text: str) -> Any:
+    async def parse_xml(self, data: bytes, encoding: str) -> Any:
         """
-        Parse Response text as XML.
+        Parse Response content as XML.
         Used to allow implementations to provide their own XML parser.
 
-        :param response_text: Response text as string.
+        :param data: Response content as bytes.
+        :param encoding: Character encoding of the Response content.
         """
         raise NotImplementedError("Not Implemented")
 
+    async def run_in_executor(self, func: Callable, *args) -> Any:
+        """
+        Run a CPU bound function in the Crawler Executor, or directly if parsing is inline.
+
+        Functions run in a process pool must be picklable, as must their arguments and return values,
+        so pass raw data in and only return compact results.
+
+        :param func: Function to run
+        :param args: Positional arguments to pass to the function
+        :return: Result of the function
+        """
+        if not self._executor:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
     @abstractmethod
     async def parse(self, request: Request, response: Response) -> AsyncGeneratorType:
         """
@@ -485,46 +872,309 @@ class Crawler(ABC):
 
         :param queueable: An object that inherits from Queueable.
         """
+        if self._admit_queue(queueable):
+            queueable.add_to_queue(self._request_queue)
+
+    def _put_queue_many(self, queueables: List[Queueable]) -> None:
+        """
+        Put many objects that inherit from Queueable onto the Request Queue in one queue operation.
+
+        :param queueables: List of objects that inherit from Queueable.
+        """
+        ready = [queueable for queueable in queueables if self._admit_queue(queueable)]
+        for queueable in ready:
+            queueable.set_queue_put_time()
+        self._request_queue.put_many(ready)
+
+    def _admit_queue(self, queueable: Queueable) -> bool:
+        """
+        Admit an object onto the Request Queue, dropping it if there's no space or time left for it,
+        and delaying retried Requests until their backoff has passed.
+
+        :param queueable: An object that inherits from Queueable.
+        :return: True if the object should be put onto the queue now.
+        """
         if not isinstance(queueable, Queueable):
             raise ValueError("Object must inherit from Queueable Class")
 
-        queueable.add_to_queue(self._request_queue)
+        if isinstance(queueable, Request) and self._deadline:
+            wait = self._host_scheduler.wait_time(
+                queueable.url.host or "",
+                backoff=queueable.delay if queueable.should_retry else 0,
+            )
+            if not self._can_finish_in_time(queueable, wait):
+                self.stats[Stats.REQUESTS_SKIPPED] += 1
+                logger.debug("Not enough time left, skipped: %s", queueable)
+                return False
+
+        # Make space on the Request Queue if it's full, or drop the Request if it has the lowest priority.
+        if not self._request_queue.admit(queueable):
+            self.stats[Stats.REQUESTS_EVICTED] = self._request_queue.evictions
+            logger.debug("Queue full, dropped: %s", queueable)
+            return False
+        self.stats[Stats.REQUESTS_EVICTED] = self._request_queue.evictions
+
         self.stats[Stats.QUEUED_TOTAL] += 1
 
-    async def _work(self, task_num):
+        if isinstance(queueable, Request) and queueable.should_retry:
+            # Hold a retried Request back until its backoff has passed, instead of delaying within a worker.
+            # The host's fetch slot is only reserved once a fetch worker takes the Request, so that Requests
+            # to the same host are fetched in priority order, and dropped Requests don't hold a slot.
+            if queueable.delay > 0:
+                self.stats[Stats.REQUESTS_DELAYED] += 1
+                self._request_queue.put_later(queueable, queueable.delay)
+                return False
+        return True
+
+    def _reserve_host(self, request: Request) -> bool:
         """
-        Worker function for handling request queue items.
+        Reserve the fetch slot of a Request's host when a fetch worker takes the Request,
+        or hold the Request in the host's FIFO until the slot frees.
+
+        Held Requests have already been admitted, so they are never evicted or admitted again,
+        and remain unfinished tasks of the Request Queue until they are released.
+
+        :param request: Request taken from the Request Queue
+        :return: True if the Request may be fetched now.
+        """
+        host = request.url.host or ""
+        if self._host_scheduler.acquire(host, request, request.delay):
+            # Release the next held Request once the interval has passed.
+            self._schedule_host_release(host)
+            return True
+
+        self._host_scheduler.hold(host, request)
+        self._schedule_host_release(host)
+        self.stats[Stats.REQUESTS_DELAYED] += 1
+        return False
+
+    def _schedule_host_release(self, host: str) -> None:
+        """
+        Schedule the release of the next Request held for a host, if one isn't already scheduled.
+
+        :param host: URL host
+        """
+        wait = self._host_scheduler.next_release(host)
+        if wait is not None:
+            self._host_releases[host] = asyncio.get_running_loop().call_later(
+                wait, self._release_host, host
+            )
+
+    def _release_host(self, host: str) -> None:
+        """
+        Put the Request at the head of a host's FIFO back onto the Request Queue, once the host's slot frees.
+
+        :param host: URL host
+        """
+        self._host_releases.pop(host, None)
+        request = self._host_scheduler.release(host)
+        if request:
+            self._request_queue.requeue(request)
+
+    def _can_finish_in_time(self, request: Request, wait: float = 0) -> bool:
+        """
+        Check whether a Request is expected to finish before the crawl deadline.
+
+        The expected duration is the average duration of Requests to the same host,
+        or the median duration of all Requests if the host hasn't been fetched yet.
+
+        :param request: Request
+        :param wait: Time in seconds before the Request may be fetched
+        :return: True if the Request is expected to finish in time, or deadline scheduling is disabled.
+        """
+        if not self._deadline:
+            return True
+        expected = self._host_scheduler.latency(
+            request.url.host or "", self._stats_request_durations.median / 1000
+        )
+        return time.monotonic() + wait + expected < self._deadline
+
+    async def _put_parse_queue(self, result: CallbackResult) -> None:
+        """
+        Put a callback result onto the bounded Parse Queue, waiting for space if the queue is full.
+
+        :param result: CallbackResult
+        """
+        result.set_queue_put_time()
+        if self._parse_queue.full():
+            # Callbacks waiting for space on the Request Queue can't wait for fetch workers that are themselves
+            # waiting for the parse workers, so wake them to evict instead.
+            self._request_queue.wake_space_waiters()
+        await self._parse_queue.put(result)
+        self.stats[Stats.QUEUED_TOTAL] += 1
+
+    async def _fetch_work(self, task_num):
+        """
+        Worker function for fetching Requests from the Request Queue.
         """
         try:
             while True:
-                self._stats_queue_sizes.append(self._request_queue.qsize())
+                self._stats_queue_sizes.add(self._request_queue.qsize())
                 item: Queueable = await self._request_queue.get()
-                # logger.debug("Priority: %s Item: %s", item.priority, item)
-                if item.get_queue_wait_time():
-                    # logger.debug(
-                    #     "Waited: %sms Item: %s", item.get_queue_wait_time(), item
-                    # )
-                    self._stats_queue_wait_times.append(item.get_queue_wait_time())
-
-                if self._session.closed:
-                    logger.debug("Session is closed. Cannot run %s", item)
-                    continue
+                if self.metrics:
+                    self._update_queue_size_metric("request")
+                # Held Requests remain unfinished tasks until they are released and fetched.
+                held = False
 
                 try:
-                    # Fetch Request and handle callbacks
+                    if self._session.closed:
+                        logger.debug("Session is closed. Cannot run %s", item)
+                        continue
+
+                    # Fetch Request and queue the callback results
                     if isinstance(item, Request):
+                        # Delayed Requests may have been queued with time to spare, but no longer have it.
+                        if not self._can_finish_in_time(item):
+                            self.stats[Stats.REQUESTS_SKIPPED] += 1
+                            logger.debug("Not enough time left, skipped: %s", item)
+                            self._forfeit_host(item)
+                            continue
+                        if not self._reserve_host(item):
+                            held = True
+                            continue
+                        self._record_queue_wait(item)
                         await self._handle_request(item)
-                    # Process Callback results
-                    elif isinstance(item, CallbackResult):
-                        await self._process_request_callback_result(
-                            item.result, item.callback_recursion
-                        )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.exception("Error handling item: %s : %s", item, e)
+                finally:
+                    if not held:
+                        self._request_queue.task_done()
+        except asyncio.CancelledError:
+            logger.debug("Cancelled Fetch Worker: %s", task_num)
+
+    def _record_queue_wait(self, item: Queueable) -> None:
+        """
+        Record the time an item waited on the Request Queue, including any time it was held for its host.
+
+        :param item: An object that inherits from Queueable
+        """
+        wait_time = item.get_queue_wait_time()
+        if wait_time:
+            self._stats_queue_wait_times.add(wait_time)
+            if self.metrics:
+                self.metrics.request_queue_wait.observe(wait_time / 1000)
+
+    def _forfeit_host(self, request: Request) -> None:
+        """
+        Give up the host's fetch slot claim of a released Request that won't be fetched,
+        and release the next Request held for the host.
+
+        :param request: Request that won't be fetched
+        """
+        host = request.url.host or ""
+        self._host_scheduler.forfeit(host, request)
+        self._schedule_host_release(host)
+
+    async def _watch_in_flight(self) -> None:
+        """
+        Watchdog that cancels in-flight Requests that have stalled, so that servers that stop responding,
+        or trickle their response, don't hold fetch workers and connections until the request timeout.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.stall_timeout / 2)
+                now = time.monotonic()
+                for request in list(self._in_flight):
+                    if request.is_stalled(self.stall_timeout, self.min_read_rate, now):
+                        logger.debug("Stalled: %s", request)
+                        request.cancel_stalled()
+        except asyncio.CancelledError:
+            logger.debug("Cancelled In-Flight Watchdog")
+
+    async def _parse_work(self, task_num):
+        """
+        Worker function for processing Request callback results from the Parse Queue.
+        """
+        try:
+            while True:
+                self._stats_parse_queue_sizes.add(self._parse_queue.qsize())
+                item: CallbackResult = await self._parse_queue.get()
+                if item.get_queue_wait_time():
+                    self._stats_parse_queue_wait_times.add(item.get_queue_wait_time())
+
+                start = time.perf_counter()
+                items_found = len(self.items)
+                try:
+                    await self._process_request_callback_result(
+                        item.result, item.callback_recursion
+                    )
+                    self._check_idle_responses(len(self.items) > items_found)
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
                     logger.exception("Error handling item: %s : %s", item, e)
                 finally:
-                    self._request_queue.task_done()
+                    self._stats_parse_durations.add(
+                        int((time.perf_counter() - start) * 1000)
+                    )
+                    if self.metrics:
+                        self._update_queue_size_metric("parse")
+                        self.metrics.parse_duration.observe(time.perf_counter() - start)
+                    self._parse_queue.task_done()
         except asyncio.CancelledError:
-            logger.debug("Cancelled Worker: %s", task_num)
+            logger.debug("Cancelled Parse Worker: %s", task_num)
+
+    def _update_queue_size_metric(self, name: str, size: int = None) -> None:
+        """
+        Update a shared queue size metric with the change in size of this Crawler's queue.
+
+        :param name: Queue name, "request" or "parse"
+        :param size: New size of the queue. Defaults to the current queue size.
+        """
+        if name == "request":
+            gauge = self.metrics.request_queue_size
+            if size is None:
+                size = self._request_queue.qsize() + self._request_queue.delayed_size()
+        else:
+            gauge = self.metrics.parse_queue_size
+            if size is None:
+                size = self._parse_queue.qsize()
+        gauge.inc(size - self._metrics_queue_sizes[name])
+        self._metrics_queue_sizes[name] = size
+
+    def _check_idle_responses(self, found_item: bool) -> None:
+        """
+        Count the consecutive Responses processed without finding a new Item,
+        and stop the crawl if there have been too many.
+
+        :param found_item: Whether processing the Response found a new Item.
+        """
+        if found_item:
+            self._idle_responses = 0
+            return
+
+        self._idle_responses += 1
+        if self.max_idle_responses and self._idle_responses >= self.max_idle_responses:
+            self.stop(StopReasons.MAX_IDLE_RESPONSES)
+
+    def stop(self, reason: str) -> None:
+        """
+        Stop the crawl early. Queued Requests are dropped, and in-flight Requests and callbacks are cancelled.
+
+        May be called by implementations when they have found what they are looking for.
+
+        :param reason: Reason for stopping the crawl, recorded in the crawl statistics.
+        """
+        if self.stats[Stats.STOP_REASON]:
+            return
+        logger.debug("Stopping crawl: %s", reason)
+        self.stats[Stats.STOP_REASON] = reason
+        if self._stop_event:
+            self._stop_event.set()
+
+    async def _join_queues(self) -> None:
+        """
+        Wait until both the Request Queue and the Parse Queue have no unfinished tasks.
+
+        Each stage may add new tasks to the other, so wait until neither queue has gained any new tasks.
+        """
+        while True:
+            await self._request_queue.join()
+            await self._parse_queue.join()
+            if self._request_queue.is_finished():
+                return
 
     @staticmethod
     async def _run_callback(callback, *args, **kwargs) -> None:
@@ -540,10 +1190,10 @@ class Crawler(ABC):
             return
         if inspect.iscoroutinefunction(callback):
             await callback(*args, **kwargs)
-        elif inspect.isfunction(callback):
+        elif callable(callback):
             callback(*args, **kwargs)
         else:
-            logger.warning("Callback %s must be a coroutine or function", callback)
+            logger.warning("Callback %s must be a coroutine or callable", callback)
 
     def create_start_urls(self, urls: List[Union[URL, str]]) -> List[URL]:
         """
@@ -568,67 +1218,79 @@ class Crawler(ABC):
 
     def record_statistics(self) -> None:
         """
-        Record statistics.
+        Record statistics. May be called at any time during the crawl.
         """
-        self.stats[Stats.REQUESTS_DURATION_TOTAL] = int(
-            sum(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_AVG] = int(
-            harmonic_mean(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_MAX] = int(
-            max(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_MIN] = int(
-            min(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_MEDIAN] = int(
-            median(self._stats_request_durations)
-        )
-
-        self.stats[Stats.CONTENT_LENGTH_TOTAL] = int(
-            sum(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_AVG] = int(
-            harmonic_mean(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_MAX] = int(
-            max(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_MIN] = int(
-            min(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_MEDIAN] = int(
-            median(self._stats_response_content_lengths)
-        )
-
-        self.stats[Stats.URLS_SEEN] = len(self._duplicate_filter.fingerprints)
-
-        self.stats[Stats.QUEUE_WAIT_AVG] = harmonic_mean(self._stats_queue_wait_times)
-        self.stats[Stats.QUEUE_WAIT_MIN] = min(self._stats_queue_wait_times)
-        self.stats[Stats.QUEUE_WAIT_MAX] = max(self._stats_queue_wait_times)
-        self.stats[Stats.QUEUE_WAIT_MEDIAN] = median(self._stats_queue_wait_times)
-
-        self.stats[Stats.QUEUE_SIZE_MAX] = max(self._stats_queue_sizes)
-        self.stats[Stats.QUEUE_SIZE_AVG] = int(harmonic_mean(self._stats_queue_sizes))
-        self.stats[Stats.QUEUE_SIZE_MEDIAN] = int(median(self._stats_queue_sizes))
+        durations = self._stats_request_durations
+        if durations.count:
+            self.stats[Stats.REQUESTS_DURATION_TOTAL] = int(durations.total)
+            self.stats[Stats.REQUESTS_DURATION_AVG] = int(durations.harmonic_mean)
+            self.stats[Stats.REQUESTS_DURATION_MAX] = int(durations.max)
+            self.stats[Stats.REQUESTS_DURATION_MIN] = int(durations.min)
+            self.stats[Stats.REQUESTS_DURATION_MEDIAN] = int(durations.median)
+            self.stats[Stats.REQUESTS_DURATION_P90] = int(durations.quantile(0.9))
+            self.stats[Stats.REQUESTS_DURATION_P99] = int(durations.quantile(0.99))
+
+        content_lengths = self._stats_response_content_lengths
+        if content_lengths.count:
+            self.stats[Stats.CONTENT_LENGTH_AVG] = int(content_lengths.harmonic_mean)
+            self.stats[Stats.CONTENT_LENGTH_MAX] = int(content_lengths.max)
+            self.stats[Stats.CONTENT_LENGTH_MIN] = int(content_lengths.min)
+            self.stats[Stats.CONTENT_LENGTH_MEDIAN] = int(content_lengths.median)
+
+        self.stats[Stats.URLS_SEEN] = len(self._duplicate_filter)
+        self.stats[Stats.REQUESTS_PHASES] = self._request_timings.summary()
+
+        queue_wait_times = self._stats_queue_wait_times
+        if queue_wait_times.count:
+            self.stats[Stats.QUEUE_WAIT_AVG] = queue_wait_times.harmonic_mean
+            self.stats[Stats.QUEUE_WAIT_MIN] = queue_wait_times.min
+            self.stats[Stats.QUEUE_WAIT_MAX] = queue_wait_times.max
+            self.stats[Stats.QUEUE_WAIT_MEDIAN] = queue_wait_times.median
+
+        queue_sizes = self._stats_queue_sizes
+        if queue_sizes.count:
+            self.stats[Stats.QUEUE_SIZE_MAX] = queue_sizes.max
+            self.stats[Stats.QUEUE_SIZE_AVG] = int(queue_sizes.harmonic_mean)
+            self.stats[Stats.QUEUE_SIZE_MEDIAN] = int(queue_sizes.median)
+
+        latencies = self._stats_request_latencies
+        if latencies.count:
+            self.stats[Stats.REQUESTS_LATENCY_AVG] = latencies.harmonic_mean
+            self.stats[Stats.REQUESTS_LATENCY_MAX] = int(latencies.max)
+            self.stats[Stats.REQUESTS_LATENCY_MIN] = int(latencies.min)
+            self.stats[Stats.REQUESTS_LATENCY_MEDIAN] = int(latencies.median)
+            self.stats[Stats.REQUESTS_LATENCY_P90] = int(latencies.quantile(0.9))
+            self.stats[Stats.REQUESTS_LATENCY_P99] = int(latencies.quantile(0.99))
+            self.stats[Stats.REQUESTS_LATENCY_TOTAL] = int(latencies.total)
+
+        parse_queue_wait_times = self._stats_parse_queue_wait_times
+        if parse_queue_wait_times.count:
+            self.stats[Stats.PARSE_QUEUE_WAIT_AVG] = (
+                parse_queue_wait_times.harmonic_mean
+            )
+            self.stats[Stats.PARSE_QUEUE_WAIT_MIN] = parse_queue_wait_times.min
+            self.stats[Stats.PARSE_QUEUE_WAIT_MAX] = parse_queue_wait_times.max
+            self.stats[Stats.PARSE_QUEUE_WAIT_MEDIAN] = parse_queue_wait_times.median
+
+        parse_queue_sizes = self._stats_parse_queue_sizes
+        if parse_queue_sizes.count:
+            self.stats[Stats.PARSE_QUEUE_SIZE_MAX] = parse_queue_sizes.max
+            self.stats[Stats.PARSE_QUEUE_SIZE_AVG] = int(
+                parse_queue_sizes.harmonic_mean
+            )
+            self.stats[Stats.PARSE_QUEUE_SIZE_MEDIAN] = int(parse_queue_sizes.median)
 
-        self.stats[Stats.REQUESTS_LATENCY_AVG] = harmonic_mean(
-            self._stats_request_latencies
-        )
-        self.stats[Stats.REQUESTS_LATENCY_MAX] = int(max(self._stats_request_latencies))
-        self.stats[Stats.REQUESTS_LATENCY_MIN] = int(min(self._stats_request_latencies))
-        self.stats[Stats.REQUESTS_LATENCY_MEDIAN] = int(
-            median(self._stats_request_latencies)
-        )
-        self.stats[Stats.REQUESTS_LATENCY_TOTAL] = int(
-            sum(self._stats_request_latencies)
-        )
+        parse_durations = self._stats_parse_durations
+        if parse_durations.count:
+            self.stats[Stats.PARSE_DURATION_MAX] = parse_durations.max
+            self.stats[Stats.PARSE_DURATION_TOTAL] = parse_durations.total
+            self.stats[Stats.PARSE_DURATION_MEDIAN] = int(parse_durations.median)
 
     def get_stats(self) -> dict:
         """
-        Return crawl statistics as a sorted dictionary.
+        Return crawl statistics as a sorted dictionary. May be called at any time during the crawl.
         """
+        self.record_statistics()
         stats = {str(k): v for k, v in self.stats.items()}
         return dict(OrderedDict(sorted(stats.items())).items())
 
@@ -654,61 +1316,134 @@ class Crawler(ABC):
         if not self.start_urls:
             raise ValueError("crawler.start_urls are required")
 
-        # Create the Request Queue within the asyncio loop.
-        self._request_queue = CrawlerPriorityQueue()
-
-        # Create the Semaphore for controlling HTTP Request concurrency within the asyncio loop.
-        self._semaphore = asyncio.Semaphore(self.concurrency)
-
-        trace_configs = []
-        if self._trace:
-            trace_configs.append(add_trace_config())
+        # Compile the allowed domain patterns, which may have been changed since the Crawler was created.
+        self._domain_matcher = DomainMatcher(self.allowed_domains)
 
-        conn = aiohttp.TCPConnector(
-            limit=0, ssl=self._ssl, ttl_dns_cache=self.total_timeout.total
+        # Create the Request Queue within the asyncio loop.
+        queue_class = (
+            self.host_fair_queue_class if self.fair_hosts else self.request_queue_class
         )
-        # Create the ClientSession for HTTP Requests within the asyncio loop.
-        self._session = aiohttp.ClientSession(
-            timeout=self.total_timeout,
-            headers=self.headers,
-            connector=conn,
-            trace_configs=trace_configs,
+        self._request_queue = queue_class(
+            max_items=self.max_queue_size,
+            max_memory=self.max_queue_memory,
+            policy=self.queue_policy,
+            can_block=lambda: not self._parse_queue.full(),
         )
+        # Create the bounded Parse Queue within the asyncio loop.
+        self._parse_queue = CrawlerPriorityQueue(maxsize=self.parse_queue_size)
+        # Create the stop Event within the asyncio loop.
+        self._stop_event = asyncio.Event()
 
-        # Create a Request for each start URL and add it to the Request Queue.
-        for url in self.start_urls:
-            req = await self.follow(coerce_url(url), self.parse, delay=0)
-            if req:
-                self._process_request(req)
-
-        # Create workers to process the Request Queue.
-        # Create twice as many workers as potential concurrent requests, to help handle request callbacks without
-        # delay while other workers may be locked by the Semaphore.
-        self._workers = [
-            asyncio.create_task(self._work(i)) for i in range(self.concurrency * 2)
-        ]
+        if self._external_session:
+            self._session = self._external_session
+        else:
+            trace_configs = []
+            if self._trace:
+                trace_configs.append(add_trace_config())
+            if self.timing_sample_rate > 0:
+                trace_configs.append(add_timing_trace_config())
+
+            conn = aiohttp.TCPConnector(
+                limit=0, ssl=self._ssl, ttl_dns_cache=self.total_timeout.total
+            )
+            # Create the ClientSession for HTTP Requests within the asyncio loop.
+            self._session = aiohttp.ClientSession(
+                timeout=self.total_timeout,
+                connector=conn,
+                trace_configs=trace_configs,
+            )
+
+        if self.metrics:
+            self.metrics.crawls_in_progress.inc()
 
         try:
-            # Run workers within the ClientSession.
-            async with self._session:
-                await asyncio.wait_for(
-                    self._request_queue.join(), timeout=self.total_timeout.total
+            # Create the Executor for CPU bound work, unless one was provided.
+            if isinstance(self._executor_option, Executor):
+                self._executor = self._executor_option
+            else:
+                self._executor = create_executor(
+                    self._executor_option, self._executor_workers
+                )
+
+            # Create a Request for each start URL and add it to the Request Queue.
+            # There are no workers yet to make space on the Request Queue, so don't wait for space.
+            for url in self.start_urls:
+                req = await self.follow(coerce_url(url), self.parse, delay=0)
+                if req:
+                    await self._process_request(req, wait=False)
+
+            # Create fetch workers to process the Request Queue, one for each potential concurrent HTTP request.
+            # Create separate parse workers to process the Parse Queue, so that processing Request callbacks
+            # doesn't hold up fetching.
+            if self.deadline_scheduling and self.total_timeout.total:
+                self._deadline = time.monotonic() + self.total_timeout.total
+
+            self._workers = [
+                asyncio.create_task(self._fetch_work(i))
+                for i in range(self.concurrency)
+            ] + [
+                asyncio.create_task(self._parse_work(i))
+                for i in range(self.parse_concurrency)
+            ]
+            if self.stall_timeout:
+                self._workers.append(asyncio.create_task(self._watch_in_flight()))
+
+            # Wait until all work is finished, a stop condition is met, or the crawl times out.
+            join_task = asyncio.ensure_future(self._join_queues())
+            stop_task = asyncio.ensure_future(self._stop_event.wait())
+            try:
+                done, _ = await asyncio.wait(
+                    [join_task, stop_task],
+                    timeout=self.total_timeout.total,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logger.debug(
+                        "Timed out after %s seconds with %d Requests in flight",
+                        self.total_timeout.total,
+                        len(self._in_flight),
+                    )
+                    self.stop(StopReasons.TIMEOUT)
+            finally:
+                join_task.cancel()
+                stop_task.cancel()
+                # Make sure all workers are cancelled, including any in-flight Requests.
+                for w in self._workers:
+                    w.cancel()
+                # Wait until all worker tasks are cancelled.
+                await asyncio.gather(
+                    join_task, stop_task, *self._workers, return_exceptions=True
                 )
-        except asyncio.TimeoutError:
-            logger.debug("Timed out after %s seconds", self.total_timeout.total)
-            self._request_queue.clear()
+                # Drop any remaining work, including delayed and held Requests.
+                for handle in self._host_releases.values():
+                    handle.cancel()
+                self._host_releases.clear()
+                self._host_scheduler.clear_held()
+                self._request_queue.clear()
+                self._parse_queue.clear()
+
+            if not self.stats[Stats.STOP_REASON]:
+                self.stats[Stats.STOP_REASON] = StopReasons.FINISHED
+
+            # Run the post crawl callback if it exists.
+            await self._run_callback(self.post_crawl_callback)
         finally:
-            # Make sure all workers are cancelled.
-            for w in self._workers:
-                w.cancel()
-            # Wait until all worker tasks are cancelled.
-            await asyncio.gather(*self._workers, return_exceptions=True)
+            if self.metrics:
+                self._update_queue_size_metric("request", 0)
+                self._update_queue_size_metric("parse", 0)
+                self.metrics.crawls_in_progress.dec()
+                self.metrics.crawls.inc(
+                    stop_reason=self.stats[Stats.STOP_REASON] or "cancelled"
+                )
 
-        # Run the post crawl callback if it exists.
-        await self._run_callback(self.post_crawl_callback)
+            # The ClientSession is closed only after all work is completed, and only if it was created by the Crawler.
+            if self._session is not self._external_session:
+                await self._session.close()
 
-        # The ClientSession is closed only after all work is completed.
-        await self._session.close()
+            # Only shut down the Executor if it was created by the Crawler, including when the crawl failed to start.
+            if self._executor and self._executor is not self._executor_option:
+                self._executor.shutdown(wait=False)
+            self._executor = None
 
         duration = int((time.perf_counter() - start) * 1000)
         self.stats[Stats.TOTAL_DURATION] = duration
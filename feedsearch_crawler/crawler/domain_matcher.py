@@ -0,0 +1,84 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Pattern, Union
+
+# Characters that make a domain pattern a Unix shell-style wildcard.
+WILDCARD_CHARS = frozenset("*?[")
+
+# Trie keys marking that a domain, or any of its subdomains, is allowed. Never equal to a label.
+_EXACT = object()
+_SUBDOMAINS = object()
+
+
+class DomainMatcher:
+    """
+    Matches hosts against many domain patterns in close to constant time, with the same results as
+    checking each pattern with fnmatch.
+
+    Plain domains such as "example.com", and subdomain patterns such as "*.example.com", are stored in a
+    trie of domain labels from the top level domain down, so that a host is matched by walking its labels.
+    The remaining wildcard patterns are combined into a single regex. Results are cached by host.
+    """
+
+    # Number of host results to cache.
+    cache_size = 10000
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        :param patterns: Domain patterns, which may be Unix shell-style wildcards.
+        """
+        self.patterns = list(patterns)
+        # Trie of domain labels, from the top level domain down.
+        self._trie: Dict[Union[str, object], Any] = {}
+        wildcards = []
+
+        for pattern in self.patterns:
+            if pattern.startswith("*.") and not WILDCARD_CHARS.intersection(
+                pattern[2:]
+            ):
+                self._add(pattern[2:], _SUBDOMAINS)
+            elif not WILDCARD_CHARS.intersection(pattern):
+                self._add(pattern, _EXACT)
+            else:
+                wildcards.append(translate(pattern))
+
+        # Combined regex of the patterns that don't fit in the trie.
+        self._wildcards: Optional[Pattern] = (
+            re.compile("|".join(wildcards)) if wildcards else None
+        )
+        # Least recently used cache of results, keyed by host, each matcher having its own cache.
+        self.match = lru_cache(maxsize=self.cache_size)(self._match)
+
+    def _add(self, domain: str, key: object) -> None:
+        node = self._trie
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[key] = True
+
+    def _match(self, host: str) -> bool:
+        """
+        Check whether the host matches any of the domain patterns.
+
+        :param host: URL host
+        :return: boolean
+        """
+        node = self._trie
+        labels = host.split(".")
+        for index in range(len(labels) - 1, -1, -1):
+            node = node.get(labels[index])
+            if node is None:
+                break
+            # A subdomain pattern matches hosts with at least one more label.
+            if index and _SUBDOMAINS in node:
+                return True
+        else:
+            if _EXACT in node:
+                return True
+
+        if self._wildcards:
+            return self._wildcards.match(host) is not None
+        return False
+
+    def __len__(self) -> int:
+        return len(self.patterns)
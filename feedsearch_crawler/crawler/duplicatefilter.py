@@ -1,37 +1,179 @@
-import asyncio
 import hashlib
+import math
+from typing import Iterable, List, Set, Tuple, Union
 
 from yarl import URL
 
 from feedsearch_crawler.crawler.lib import to_bytes
 
 
+class BloomFilter:
+    """
+    Fixed capacity Bloom filter of 64-bit integer fingerprints.
+
+    Bit positions are derived from the two 32-bit halves of each fingerprint by double hashing,
+    so the fingerprints are not hashed again.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        :param capacity: Number of fingerprints the filter holds at the error rate.
+        :param error_rate: False positive rate when the filter is at capacity, between 0 and 1.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Number of bits, and number of bits set for each fingerprint, for the optimal false positive rate.
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        # Number of fingerprints added.
+        self.count: int = 0
+
+    def __contains__(self, fingerprint: int) -> bool:
+        bits = self._bits
+        num_bits = self.num_bits
+        position = fingerprint & 0xFFFFFFFF
+        step = (fingerprint >> 32) | 1
+        for _ in range(self.num_hashes):
+            position %= num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+        return True
+
+    def add(self, fingerprint: int) -> None:
+        bits = self._bits
+        num_bits = self.num_bits
+        position = fingerprint & 0xFFFFFFFF
+        step = (fingerprint >> 32) | 1
+        for _ in range(self.num_hashes):
+            position %= num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+            position += step
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter of 64-bit integer fingerprints that grows as fingerprints are added.
+
+    When the current filter is at capacity a larger filter is added, with a lower error rate, so that the
+    overall false positive rate stays below the given error rate however many fingerprints are added.
+    Uses a few bytes per fingerprint, instead of the tens of bytes used by a set of integers.
+    """
+
+    # Capacity of each filter relative to the previous filter.
+    growth = 2
+    # Error rate of each filter relative to the previous filter.
+    tightening = 0.8
+
+    def __init__(self, error_rate: float = 0.001, initial_capacity: int = 10000):
+        """
+        :param error_rate: Max overall false positive rate, between 0 and 1.
+        :param initial_capacity: Capacity of the first filter.
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.filters: List[BloomFilter] = []
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return any(fingerprint in f for f in self.filters)
+
+    def add(self, fingerprint: int) -> None:
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            num = len(self.filters)
+            # The error rates form a geometric series that sums to the overall error rate.
+            self.filters.append(
+                BloomFilter(
+                    self.initial_capacity * self.growth**num,
+                    self.error_rate * (1 - self.tightening) * self.tightening**num,
+                )
+            )
+        self.filters[-1].add(fingerprint)
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self.filters)
+
+
 class DuplicateFilter:
     """
     Filters duplicate URLs.
+
+    URLs are stored as 64-bit integer fingerprints, in a set, or in a scalable Bloom filter
+    if an error rate is given. A Bloom filter uses much less memory on very large crawls,
+    but may report a URL as seen when it wasn't.
     """
 
-    def __init__(self):
-        # Dictionary whose keys are the hashed fingerprints of the URLs
-        self.fingerprints = dict()
-        # Locks the fingerprints dict when accessing keys.
-        self._seen_lock = asyncio.Lock()
+    def __init__(self, error_rate: float = 0):
+        """
+        :param error_rate: False positive rate of the Bloom filter used to store fingerprints.
+            0 to store fingerprints in a set, without false positives.
+        """
+        # Fingerprints of the seen URLs.
+        self.fingerprints: Union[Set[int], ScalableBloomFilter] = (
+            ScalableBloomFilter(error_rate) if error_rate else set()
+        )
 
-    async def url_seen(self, url: URL, method: str = "") -> bool:
+    async def url_seen(
+        self, url: URL, method: str = "", fingerprint: int = None
+    ) -> bool:
         """
         Checks if the URL has already been seen, and adds the URL fingerprint if not.
 
+        Doesn't wait on anything, as the Crawler runs on a single event loop.
+
         :param url: URL object
         :param method: Optional HTTP method to use for hashing
+        :param fingerprint: Optional precomputed fingerprint of the URL and method, from url_fingerprint()
         :return: True if URL already seen
         """
-        url_str: str = self.parse_url(url)
-        fp = self.url_fingerprint_hash(url_str, method)
-        async with self._seen_lock:
-            if fp in self.fingerprints:
-                return True
-            self.fingerprints[fp] = url_str
-            return False
+        fp = (
+            fingerprint
+            if fingerprint is not None
+            else self.url_fingerprint(url, method)
+        )
+        if fp in self.fingerprints:
+            return True
+        self.fingerprints.add(fp)
+        return False
+
+    async def filter_seen(
+        self, urls: Iterable[URL], method: str = ""
+    ) -> List[Tuple[URL, int]]:
+        """
+        Filters out the URLs that have already been seen, and adds the fingerprints of the others.
+        URLs with the same fingerprint as an earlier URL in the batch are also filtered out.
+
+        :param urls: URL objects
+        :param method: Optional HTTP method to use for hashing
+        :return: List of Tuples of (URL, fingerprint) of the URLs that weren't seen
+        """
+        fingerprints = self.fingerprints
+        unseen: List[Tuple[URL, int]] = []
+        for url in urls:
+            fp = self.url_fingerprint(url, method)
+            if fp not in fingerprints:
+                fingerprints.add(fp)
+                unseen.append((url, fp))
+        return unseen
+
+    def __len__(self) -> int:
+        """
+        Number of URLs seen.
+        """
+        return len(self.fingerprints)
+
+    def url_fingerprint(self, url: URL, method: str = "") -> int:
+        """
+        Create the fingerprint of a URL as stored by the filter.
+
+        :param url: URL object
+        :param method: Optional HTTP method to use for hashing
+        :return: Fingerprint as integer
+        """
+        return self.url_fingerprint_hash(self.parse_url(url), method)
 
     def parse_url(self, url: URL) -> str:
         """
@@ -43,17 +185,15 @@ class DuplicateFilter:
         return str(url)
 
     @staticmethod
-    def url_fingerprint_hash(url: str, method: str = "") -> str:
+    def url_fingerprint_hash(url: str, method: str = "") -> int:
         """
-        Create a fingerprint hash of a URL string along with the method if provided.
+        Create a 64-bit fingerprint hash of a URL string along with the method if provided.
 
         :param url: URL as string
         :param method: Optional HTTP method
-        :return: Hashed string
+        :return: Fingerprint as integer
         """
-        # noinspection InsecureHash
-        fp = hashlib.sha1()
-        fp.update(to_bytes(url))
+        fp = hashlib.blake2b(to_bytes(url), digest_size=8)
         if method:
             fp.update(to_bytes(method))
-        return fp.hexdigest()
+        return int.from_bytes(fp.digest(), "big")
@@ -0,0 +1,322 @@
+import asyncio
+import heapq
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from feedsearch_crawler.crawler.lib import CrawlerPriorityQueue
+from feedsearch_crawler.crawler.queueable import Queueable
+from feedsearch_crawler.crawler.request import Request
+
+
+class FrontierPolicies:
+    # Drop the lowest priority Requests to make space for higher priority Requests.
+    EVICT = "evict"
+    # Make callbacks wait for space, and only evict if waiting could deadlock the crawl.
+    BLOCK = "block"
+
+
+def item_host(item: Queueable) -> str:
+    """
+    Get the URL host of a queued item, or an empty string if the item isn't a Request.
+
+    :param item: An object that inherits from Queueable
+    :return: URL host
+    """
+    if isinstance(item, Request):
+        return item.url.host or ""
+    return ""
+
+
+def estimate_size(item: Queueable) -> int:
+    """
+    Roughly estimate the memory used by a queued item in bytes.
+    Requests are dominated by their URL, as their Response history is shared with the Response they were
+    followed from. Other Queueables are counted as a fixed size.
+
+    :param item: An object that inherits from Queueable
+    :return: Estimated size in bytes
+    """
+    size = 1000
+    if isinstance(item, Request):
+        size += len(str(item.url)) * 2
+    return size
+
+
+class RequestFrontier(CrawlerPriorityQueue):
+    """
+    Request priority queue with optional limits on the number of queued Requests and their estimated memory.
+
+    Items are admitted with admit() before being put onto the queue. When the frontier is full, the lowest
+    priority item is evicted to make space for a higher priority item, or the new item is dropped if it has
+    the lowest priority. Delayed items count towards the limits, and may also be evicted.
+
+    Evicted items are left on the heap and skipped when they reach the top, and the heap is compacted once
+    evicted items make up half of it, so eviction is O(log n).
+    """
+
+    def __init__(
+        self,
+        max_items: int = 0,
+        max_memory: int = 0,
+        policy: str = FrontierPolicies.EVICT,
+        can_block: Callable[[], bool] = None,
+    ):
+        """
+        :param max_items: Max number of queued and delayed items. 0 for no limit.
+        :param max_memory: Max estimated memory in bytes of queued and delayed items. 0 for no limit.
+        :param policy: One of FrontierPolicies.
+        :param can_block: Function returning whether callbacks may wait for space without deadlocking the crawl.
+        """
+        super().__init__()
+        if policy not in (FrontierPolicies.EVICT, FrontierPolicies.BLOCK):
+            raise ValueError(f"{policy} is not a valid frontier policy")
+        self.max_items = max_items
+        self.max_memory = max_memory
+        self.policy = policy
+        self.can_block = can_block or (lambda: True)
+
+        # Number of items evicted or dropped because the frontier was full.
+        self.evictions: int = 0
+        # Estimated memory in bytes of the queued and delayed items.
+        self.memory: int = 0
+
+        # Estimated size of each queued and delayed item, keyed by item id.
+        self._sizes: Dict[int, int] = {}
+        # Delayed item keys, keyed by item id.
+        self._delayed_keys: Dict[int, int] = {}
+        # Ids of evicted items that are still on the heap.
+        self._evicted: Set[int] = set()
+        # Max-heap of eviction candidates, as (-priority, -order, item). Contains stale entries for removed items.
+        self._lowest: List[Tuple[int, int, Queueable]] = []
+        self._order: int = 0
+        # Callbacks waiting for space on the frontier.
+        self._space_waiters: Deque[asyncio.Future] = deque()
+
+    def size(self) -> int:
+        """
+        Number of queued and delayed items.
+        """
+        return len(self._sizes)
+
+    def is_full(self, item_size: int = 0) -> bool:
+        """
+        Check whether the frontier has no space for another item.
+
+        :param item_size: Estimated size in bytes of the item to add.
+        """
+        if self.max_items and self.size() >= self.max_items:
+            return True
+        if self.max_memory and self.memory + item_size > self.max_memory:
+            return True
+        return False
+
+    def admit(self, item: Queueable) -> bool:
+        """
+        Reserve space for an item before it is put onto the queue, evicting lower priority items if full.
+
+        :param item: An object that inherits from Queueable
+        :return: True if the item may be queued, or False if it was dropped.
+        """
+        item_size = estimate_size(item)
+        while self.is_full(item_size):
+            lowest = self._peek_lowest()
+            if not lowest or lowest.priority <= item.priority:
+                self.evictions += 1
+                return False
+            self._evict(lowest)
+
+        self._sizes[id(item)] = item_size
+        self.memory += item_size
+        self._order += 1
+        heapq.heappush(self._lowest, (-item.priority, -self._order, item))
+        return True
+
+    async def wait_for_space(self) -> None:
+        """
+        Wait until the frontier has space, if the policy is to block and blocking can't deadlock the crawl.
+        """
+        if self.policy != FrontierPolicies.BLOCK:
+            return
+        loop = asyncio.get_running_loop()
+        while self.is_full() and self.can_block():
+            waiter = loop.create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+
+    def wake_space_waiters(self) -> None:
+        """
+        Wake all callbacks waiting for space, so that they check again whether they can block.
+        """
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _wake_space_waiter(self) -> None:
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _peek_lowest(self) -> Optional[Queueable]:
+        """
+        Find the lowest priority queued or delayed item, dropping stale entries.
+        """
+        while self._lowest:
+            item = self._lowest[0][2]
+            if id(item) in self._sizes:
+                return item
+            heapq.heappop(self._lowest)
+        return None
+
+    def _untrack(self, item: Queueable) -> None:
+        item_size = self._sizes.pop(id(item), None)
+        if item_size is None:
+            return
+        self.memory -= item_size
+        # Compact the eviction heap if it's mostly stale entries.
+        if len(self._lowest) > 2 * len(self._sizes) + 100:
+            self._lowest = [e for e in self._lowest if id(e[2]) in self._sizes]
+            heapq.heapify(self._lowest)
+        self._wake_space_waiter()
+
+    def _evict(self, item: Queueable) -> None:
+        """
+        Remove a queued or delayed item from the frontier.
+
+        :param item: Item to evict
+        """
+        self.evictions += 1
+        key = self._delayed_keys.pop(id(item), None)
+        if key is not None:
+            self.cancel_delayed(key)
+        else:
+            self._evicted.add(id(item))
+            self._unfinished_tasks -= 1
+            if self._unfinished_tasks == 0:
+                self._finished.set()
+            # Compact the heap once evicted items make up half of it.
+            if len(self._evicted) > self.qsize():
+                self._compact()
+        self._untrack(item)
+
+    def _compact(self) -> None:
+        """
+        Remove evicted items from the heap.
+        """
+        self._queue = [i for i in self._queue if id(i) not in self._evicted]
+        heapq.heapify(self._queue)
+        self._evicted.clear()
+
+    def put_later(self, item: Queueable, delay: float) -> int:
+        key = super().put_later(item, delay)
+        self._delayed_keys[id(item)] = key
+        return key
+
+    def _put_delayed(self, key: int, item: Queueable) -> None:
+        self._delayed_keys.pop(id(item), None)
+        super()._put_delayed(key, item)
+
+    def _get(self) -> Queueable:
+        item = heapq.heappop(self._queue)
+        while id(item) in self._evicted:
+            self._evicted.discard(id(item))
+            item = heapq.heappop(self._queue)
+        self._untrack(item)
+        return item
+
+    def qsize(self) -> int:
+        return len(self._queue) - len(self._evicted)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def clear(self):
+        super().clear()
+        self._sizes.clear()
+        self._delayed_keys.clear()
+        self._evicted.clear()
+        self._lowest.clear()
+        self.memory = 0
+        self.wake_space_waiters()
+
+
+class HostFairFrontier(RequestFrontier):
+    """
+    RequestFrontier that keeps a priority sub-queue for each host, and takes from the hosts in turn.
+
+    The next item is the highest priority item at the head of any sub-queue, with ties going to the host
+    that was least recently served. A host with many equal priority Requests therefore can't monopolize the
+    fetch workers, and Requests to other hosts are fetched while a slow host is still responding.
+
+    Choosing the next host is linear in the number of hosts with queued items, which is small for a crawl
+    restricted to the allowed domains.
+    """
+
+    def _init(self, maxsize: int) -> None:
+        # Heap sub-queues of items, keyed by host.
+        self._queue: Dict[str, List[Queueable]] = {}
+        # Number of items on the sub-queues, including evicted items.
+        self._queued: int = 0
+        # Order in which each host was last served, keyed by host.
+        self._served: Dict[str, int] = {}
+        self._serve_count: int = 0
+
+    def _put(self, item: Queueable) -> None:
+        heapq.heappush(self._queue.setdefault(item_host(item), []), item)
+        self._queued += 1
+
+    def _put_many(self, items: List[Queueable]) -> None:
+        # The sub-queues are mostly small, so push each item onto its host's sub-queue.
+        for item in items:
+            self._put(item)
+
+    def _next_host(self) -> str:
+        """
+        Choose the host with the highest priority item, or the least recently served host if tied.
+        """
+        return min(
+            self._queue,
+            key=lambda host: (self._queue[host][0].priority, self._served.get(host, 0)),
+        )
+
+    def _get(self) -> Queueable:
+        while True:
+            host = self._next_host()
+            heap = self._queue[host]
+            item = heapq.heappop(heap)
+            self._queued -= 1
+            if not heap:
+                del self._queue[host]
+            if id(item) not in self._evicted:
+                break
+            self._evicted.discard(id(item))
+
+        self._serve_count += 1
+        self._served[host] = self._serve_count
+        self._untrack(item)
+        return item
+
+    def _compact(self) -> None:
+        for host, heap in list(self._queue.items()):
+            heap = [i for i in heap if id(i) not in self._evicted]
+            if heap:
+                heapq.heapify(heap)
+                self._queue[host] = heap
+            else:
+                del self._queue[host]
+        self._queued = sum(len(heap) for heap in self._queue.values())
+        self._evicted.clear()
+
+    def qsize(self) -> int:
+        return self._queued - len(self._evicted)
+
+    def clear(self):
+        super().clear()
+        self._queued = 0
+        self._served.clear()
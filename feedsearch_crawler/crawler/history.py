@@ -0,0 +1,100 @@
+from typing import Iterable, Iterator, List, Union
+
+from yarl import URL
+
+
+class History:
+    """
+    Immutable chain of the URLs of the Responses that led to a Request, from the original URL to the latest.
+
+    Each History points to the History of the previous Response, so that every Request followed from a Response
+    shares the same chain instead of copying it. Appending a URL, the length, and indexing the first and the
+    last two URLs are O(1). Other indexes and iteration walk the chain from the latest URL.
+    """
+
+    __slots__ = ("url", "parent", "root", "_length")
+
+    def __init__(self, url: URL = None, parent: "History" = None):
+        """
+        :param url: Latest URL in the chain, or None for an empty History.
+        :param parent: History of the URLs before the latest URL.
+        """
+        # Latest URL in the chain.
+        self.url = url
+        # History of the URLs before the latest URL, or None.
+        self.parent = parent or None
+        if url is None:
+            self.root = None
+            self._length = 0
+        elif self.parent:
+            # Original URL in the chain.
+            self.root = self.parent.root
+            self._length = self.parent._length + 1
+        else:
+            self.root = url
+            self._length = 1
+
+    @classmethod
+    def from_urls(cls, urls: Iterable[URL]) -> "History":
+        """
+        Create a History from a sequence of URLs.
+
+        :param urls: URLs from the original URL to the latest
+        :return: History
+        """
+        if isinstance(urls, History):
+            return urls
+        history = cls()
+        for url in urls:
+            history = history.append(url)
+        return history
+
+    def append(self, url: URL) -> "History":
+        """
+        Create a new History with a URL after the URLs of this History. This History is not modified.
+
+        :param url: Latest URL
+        :return: New History
+        """
+        return History(url, self)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[URL]:
+        return iter(self._urls())
+
+    def _urls(self) -> List[URL]:
+        urls = []
+        node = self
+        while node and node.url is not None:
+            urls.append(node.url)
+            node = node.parent
+        urls.reverse()
+        return urls
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[URL, List[URL]]:
+        if isinstance(index, slice):
+            return self._urls()[index]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("History index out of range")
+        if index == 0:
+            return self.root
+
+        node = self
+        for _ in range(self._length - 1 - index):
+            node = node.parent
+        return node.url
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, History):
+            return self is other or self._urls() == other._urls()
+        if isinstance(other, list):
+            return self._urls() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._urls()})"
@@ -1,8 +1,10 @@
+import asyncio
+import heapq
 import logging
 from asyncio import PriorityQueue
-from dataclasses import dataclass
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 from enum import Enum
-from typing import Any, Union, Dict
+from typing import Any, Union, Dict, Optional, List
 
 from yarl import URL
 
@@ -15,29 +17,181 @@ logger = logging.getLogger(__name__)
 class CrawlerPriorityQueue(PriorityQueue):
     _unfinished_tasks: int
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Timer handles of items waiting to be put onto the queue.
+        self._delayed: Dict[int, asyncio.TimerHandle] = {}
+        self._delayed_count: int = 0
+
+    def put_later(self, item: Queueable, delay: float) -> int:
+        """
+        Put an item onto the queue after a delay, without blocking the caller.
+
+        The item is counted as an unfinished task immediately, so that join() waits for the delayed item.
+
+        :param item: An object that inherits from Queueable
+        :param delay: Time in seconds before the item is put onto the queue
+        :return: Key of the delayed item
+        """
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._delayed_count += 1
+        key = self._delayed_count
+        loop = asyncio.get_running_loop()
+        self._delayed[key] = loop.call_later(delay, self._put_delayed, key, item)
+        return key
+
+    def put_many(self, items: List[Queueable]) -> None:
+        """
+        Put many items onto the queue without blocking, ordering the queue once for the whole batch.
+
+        :param items: List of objects that inherit from Queueable
+        """
+        if self._maxsize > 0 and self.qsize() + len(items) > self._maxsize:
+            raise asyncio.QueueFull
+        self._put_many(items)
+        self._unfinished_tasks += len(items)
+        if items:
+            self._finished.clear()
+        for _ in items:
+            if not self._getters:
+                break
+            self._wakeup_next(self._getters)
+
+    def _put_many(self, items: List[Queueable]) -> None:
+        # Pushing each item is O(k log n), while rebuilding the heap is O(n + k), so rebuild for large batches.
+        if len(items) > len(self._queue) // 4:
+            self._queue.extend(items)
+            heapq.heapify(self._queue)
+        else:
+            for item in items:
+                self._put(item)
+
+    def cancel_delayed(self, key: int) -> bool:
+        """
+        Remove a delayed item before it is put onto the queue.
+
+        :param key: Key of the delayed item
+        :return: True if the delayed item was removed
+        """
+        handle = self._delayed.pop(key, None)
+        if not handle:
+            return False
+        handle.cancel()
+        self._unfinished_tasks -= 1
+        if self._unfinished_tasks == 0:
+            self._finished.set()
+        return True
+
+    def _put_delayed(self, key: int, item: Queueable) -> None:
+        """
+        Put a delayed item onto the queue once its delay has passed.
+
+        :param key: Key of the delayed item timer handle
+        :param item: An object that inherits from Queueable
+        """
+        self._delayed.pop(key, None)
+        item.set_queue_put_time()
+        # put_nowait also increments the unfinished tasks, which were already incremented by put_later.
+        self.put_nowait(item)
+        self._unfinished_tasks -= 1
+
+    def requeue(self, item: Queueable) -> None:
+        """
+        Put an item that was taken from the queue, and not yet marked as done, back onto the queue.
+
+        The item is still an unfinished task, so it isn't counted again, and its queue put time is kept.
+
+        :param item: An object that inherits from Queueable
+        """
+        item.queue_get_time = None
+        self.put_nowait(item)
+        self._unfinished_tasks -= 1
+
+    def delayed_size(self) -> int:
+        """
+        Number of items waiting to be put onto the queue.
+        """
+        return len(self._delayed)
+
+    def is_finished(self) -> bool:
+        """
+        Check that the Queue has no unfinished tasks, including delayed items.
+        """
+        return self._unfinished_tasks == 0
+
     def clear(self):
         """
         Clear the Queue of any unfinished tasks.
         """
+        for handle in self._delayed.values():
+            handle.cancel()
+        self._delayed.clear()
         self._queue.clear()
         self._unfinished_tasks = 0
         self._finished.set()
 
 
-@dataclass
 class CallbackResult(Queueable):
-    """Dataclass for holding callback results and recording recursion"""
+    """Holds callback results and records recursion"""
+
+    __slots__ = ("result", "callback_recursion", "queue_put_time", "queue_get_time")
 
-    result: Any
-    callback_recursion: int
     # CallbackResult priority is high so that we clear Callbacks off the queue and process them as fast as possible.
     # Otherwise the workers always process Requests and don't often process the Request results.
     priority = 1
 
+    def __init__(self, result: Any, callback_recursion: int):
+        self.result = result
+        self.callback_recursion = callback_recursion
+        self.queue_put_time: Optional[float] = None
+        self.queue_get_time: Optional[float] = None
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.result.__class__.__name__})"
 
 
+class ExecutorTypes:
+    # Run CPU bound work directly on the event loop.
+    INLINE = "inline"
+    # Run CPU bound work in a thread pool.
+    THREAD = "thread"
+    # Run CPU bound work in a process pool.
+    PROCESS = "process"
+
+
+class StopReasons:
+    # All queued Requests were fetched and processed.
+    FINISHED = "finished"
+    # The crawl total timeout expired.
+    TIMEOUT = "timeout"
+    # The max number of Items was found.
+    MAX_ITEMS = "max_items"
+    # The max total Response content length in bytes was fetched.
+    MAX_BYTES = "max_bytes"
+    # The max number of consecutive Responses without a new Item was processed.
+    MAX_IDLE_RESPONSES = "max_idle_responses"
+    # An Item with at least the stop score was found.
+    STOP_SCORE = "stop_score"
+
+
+def create_executor(executor_type: str, max_workers: int = None) -> Optional[Executor]:
+    """
+    Create an Executor for running CPU bound work, such as parsing, off the event loop.
+
+    :param executor_type: One of ExecutorTypes
+    :param max_workers: Optional max number of threads or processes
+    :return: Executor, or None if work should be run inline
+    """
+    if executor_type == ExecutorTypes.INLINE:
+        return None
+    if executor_type == ExecutorTypes.THREAD:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if executor_type == ExecutorTypes.PROCESS:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"{executor_type} is not a valid executor type")
+
+
 class Stats(Enum):
     # Number of Requests added to the queue.
     REQUESTS_QUEUED = "requests_queued"
@@ -53,7 +207,7 @@ class Stats(Enum):
     CONTENT_LENGTH_MAX = "content_length_max"
     # Lowest HTTP Response content length in bytes.
     CONTENT_LENGTH_MIN = "content_length_min"
-    # Median HTTP Response content length in bytes.
+    # Estimated median HTTP Response content length in bytes.
     CONTENT_LENGTH_MEDIAN = "content_length_med"
     # Number of Items processed.
     ITEMS_PROCESSED = "items_processed"
@@ -67,40 +221,86 @@ class Stats(Enum):
     REQUESTS_DURATION_MIN = "requests_duration_min"
     # Total Request duration in Milliseconds.
     REQUESTS_DURATION_TOTAL = "requests_duration_total"
-    # Median Request duration in Milliseconds.
+    # Estimated median Request duration in Milliseconds.
     REQUESTS_DURATION_MEDIAN = "requests_duration_med"
+    # Estimated 90th percentile Request duration in Milliseconds.
+    REQUESTS_DURATION_P90 = "requests_duration_p90"
+    # Estimated 99th percentile Request duration in Milliseconds.
+    REQUESTS_DURATION_P99 = "requests_duration_p99"
     # Harmonic mean of HTTP request latency in Milliseconds.
     REQUESTS_LATENCY_AVG = "requests_latency_avg"
     # Highest HTTP Request latency in Milliseconds.
     REQUESTS_LATENCY_MAX = "requests_latency_max"
     # Lowest HTTP Request latency in Milliseconds.
     REQUESTS_LATENCY_MIN = "requests_latency_min"
-    # Median HTTP Request latency in Milliseconds.
+    # Estimated median HTTP Request latency in Milliseconds.
     REQUESTS_LATENCY_MEDIAN = "requests_latency_med"
+    # Estimated 90th percentile HTTP Request latency in Milliseconds.
+    REQUESTS_LATENCY_P90 = "requests_latency_p90"
+    # Estimated 99th percentile HTTP Request latency in Milliseconds.
+    REQUESTS_LATENCY_P99 = "requests_latency_p99"
     # Total HTTP Request latency in Milliseconds.
     REQUESTS_LATENCY_TOTAL = "requests_latency_total"
     # Total duration of crawl in Milliseconds.
     TOTAL_DURATION = "total_duration"
     # Response status codes.
     STATUS_CODES = "status_codes"
-    # Highest queue wait time in Milliseconds.
+    # Highest request queue wait time in Milliseconds.
     QUEUE_WAIT_MAX = "queue_wait_max"
-    # Lowest queue wait time in Milliseconds.
+    # Lowest request queue wait time in Milliseconds.
     QUEUE_WAIT_MIN = "queue_wait_min"
-    # Harmonic mean of queue wait time in Milliseconds.
+    # Harmonic mean of request queue wait time in Milliseconds.
     QUEUE_WAIT_AVG = "queue_wait_avg"
-    # Median queue wait time in Milliseconds.
+    # Estimated median request queue wait time in Milliseconds.
     QUEUE_WAIT_MEDIAN = "queue_wait_med"
-    # Highest queue size.
+    # Highest request queue size.
     QUEUE_SIZE_MAX = "queue_size_max"
-    # Harmonic mean of queue size.
+    # Harmonic mean of request queue size.
     QUEUE_SIZE_AVG = "queue_size_avg"
-    # Median queue size.
+    # Estimated median request queue size.
     QUEUE_SIZE_MEDIAN = "queue_size_med"
     # Total objects put on queue.
     QUEUED_TOTAL = "queued_total"
     # Total number of retried Requests
     REQUESTS_RETRIED = "requests_retried"
+    # Total number of Requests held back by the Host Scheduler before being queued.
+    REQUESTS_DELAYED = "requests_delayed"
+    # Highest parse queue wait time in Milliseconds.
+    PARSE_QUEUE_WAIT_MAX = "parse_queue_wait_max"
+    # Lowest parse queue wait time in Milliseconds.
+    PARSE_QUEUE_WAIT_MIN = "parse_queue_wait_min"
+    # Harmonic mean of parse queue wait time in Milliseconds.
+    PARSE_QUEUE_WAIT_AVG = "parse_queue_wait_avg"
+    # Estimated median parse queue wait time in Milliseconds.
+    PARSE_QUEUE_WAIT_MEDIAN = "parse_queue_wait_med"
+    # Highest parse queue size.
+    PARSE_QUEUE_SIZE_MAX = "parse_queue_size_max"
+    # Harmonic mean of parse queue size.
+    PARSE_QUEUE_SIZE_AVG = "parse_queue_size_avg"
+    # Estimated median parse queue size.
+    PARSE_QUEUE_SIZE_MEDIAN = "parse_queue_size_med"
+    # Highest duration in Milliseconds to process a Request callback result.
+    PARSE_DURATION_MAX = "parse_duration_max"
+    # Total duration in Milliseconds spent processing Request callback results.
+    PARSE_DURATION_TOTAL = "parse_duration_total"
+    # Estimated median duration in Milliseconds to process a Request callback result.
+    PARSE_DURATION_MEDIAN = "parse_duration_med"
+    # Number of Requests evicted or dropped because the request queue was full.
+    REQUESTS_EVICTED = "requests_evicted"
+    # Number of Requests skipped because they weren't expected to finish before the crawl deadline.
+    REQUESTS_SKIPPED = "requests_skipped"
+    # Number of Requests cancelled because their Response stopped making progress.
+    REQUESTS_STALLED = "requests_stalled"
+    # Number of in-flight Requests cancelled when the crawl stopped.
+    REQUESTS_CANCELLED = "requests_cancelled"
+    # Total bytes read from Responses that stalled or were cancelled before they finished.
+    CONTENT_LENGTH_PARTIAL = "content_length_partial"
+    # Number of Responses whose content was only partly read, because a chunk callback stopped reading.
+    RESPONSES_TRUNCATED = "responses_truncated"
+    # Count and estimated median, p90 and p99 durations in Milliseconds of each phase of the timed HTTP requests.
+    REQUESTS_PHASES = "requests_phases"
+    # Reason the crawl stopped, one of StopReasons, or a reason given by the Crawler implementation.
+    STOP_REASON = "stop_reason"
 
     def __repr__(self):
         return self.value
@@ -0,0 +1,324 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple, Union, Iterable
+
+# Content-Type of the text produced by MetricsRegistry.generate().
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Default Histogram buckets for durations in seconds.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Default Histogram buckets for sizes in bytes.
+SIZE_BUCKETS = tuple(1024 * 4**n for n in range(8))
+
+
+def _format_value(value: Union[int, float]) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _format_bound(bound: float) -> str:
+    # OpenMetrics expects bucket bounds in canonical float form, e.g. le="1.0" rather than le="1".
+    if bound == math.inf:
+        return "+Inf"
+    return repr(float(bound))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    labels = ",".join(
+        f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + labels + "}"
+
+
+class Metric:
+    """
+    Base class for a metric family, with a value for each combination of label values.
+
+    Metrics are updated from any thread, so that one registry can be shared by crawls running in different
+    event loops.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Union[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} requires labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def get(self, **labels) -> Union[int, float]:
+        """
+        Get the current value for a combination of label values.
+
+        :param labels: Label values, keyed by label name
+        :return: Current value
+        """
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        """
+        Get the OpenMetrics sample lines of this metric.
+
+        :return: List of sample lines
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+    def generate(self) -> str:
+        """
+        Get the OpenMetrics text of this metric family.
+
+        :return: OpenMetrics text
+        """
+        lines = [
+            f"# TYPE {self.name} {self.type_name}",
+            f"# HELP {self.name} {self.documentation}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Metric with a value that only increases, such as the number of Requests completed."""
+
+    type_name = "counter"
+
+    def inc(self, amount: Union[int, float] = 1, **labels) -> None:
+        """
+        Increment the counter.
+
+        :param amount: Non-negative amount to increment by
+        :param labels: Label values, keyed by label name
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Metric):
+    """Metric with a value that goes up and down, such as the number of in-flight Requests."""
+
+    type_name = "gauge"
+
+    def set(self, value: Union[int, float], **labels) -> None:
+        """
+        Set the gauge value.
+
+        :param value: New value
+        :param labels: Label values, keyed by label name
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: Union[int, float] = 1, **labels) -> None:
+        """
+        Increment the gauge value.
+
+        :param amount: Amount to increment by
+        :param labels: Label values, keyed by label name
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: Union[int, float] = 1, **labels) -> None:
+        """
+        Decrement the gauge value.
+
+        :param amount: Amount to decrement by
+        :param labels: Label values, keyed by label name
+        """
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Metric that counts observed values, such as durations, in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float] = DURATION_BUCKETS,
+    ):
+        super().__init__(name, documentation)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: List[int] = [0] * len(self.buckets)
+        self._sum: float = 0
+
+    def observe(self, value: Union[int, float]) -> None:
+        """
+        Observe a value.
+
+        :param value: Observed value
+        """
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        """Number of values observed."""
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        """Sum of the values observed."""
+        return self._sum
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(
+                f'{self.name}_bucket{{le="{_format_bound(bound)}"}} {cumulative}'
+            )
+        lines.append(f"{self.name}_count {cumulative}")
+        lines.append(f"{self.name}_sum {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics that can be exported together in the OpenMetrics text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Register a metric, or return the existing metric with the same name and type.
+
+        :param metric: Metric
+        :return: Registered Metric
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} is already registered")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, buckets: Iterable[float] = DURATION_BUCKETS
+    ):
+        return self.register(Histogram(name, documentation, buckets))
+
+    def generate(self) -> str:
+        """
+        Export all registered metrics in the OpenMetrics text format.
+
+        :return: OpenMetrics text, with Content-Type CONTENT_TYPE
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.generate() for metric in metrics) + "# EOF\n"
+
+
+class CrawlerMetrics:
+    """
+    Metrics of Crawler internals, updated live by every Crawler that is given this instance.
+
+    Metrics are registered in the given registry, so all CrawlerMetrics on the same registry share their values.
+    """
+
+    def __init__(self, registry: MetricsRegistry = None, prefix: str = "feedsearch"):
+        """
+        :param registry: MetricsRegistry to register the metrics in. Defaults to the process-wide REGISTRY.
+        :param prefix: Prefix of the metric names.
+        """
+        self.registry = registry or REGISTRY
+        r = self.registry
+
+        self.requests = r.counter(
+            f"{prefix}_requests", "HTTP requests completed, by status code.", ["status"]
+        )
+        self.response_bytes = r.counter(
+            f"{prefix}_response_bytes", "HTTP response content received in bytes."
+        )
+        self.response_size = r.histogram(
+            f"{prefix}_response_size_bytes",
+            "HTTP response content length in bytes.",
+            SIZE_BUCKETS,
+        )
+        self.request_duration = r.histogram(
+            f"{prefix}_request_duration_seconds",
+            "Time to fetch each HTTP request, including reading the response.",
+        )
+        self.requests_in_flight = r.gauge(
+            f"{prefix}_requests_in_flight", "HTTP requests currently being fetched."
+        )
+        self.request_queue_size = r.gauge(
+            f"{prefix}_request_queue_size", "Requests waiting on the request queues."
+        )
+        self.request_queue_wait = r.histogram(
+            f"{prefix}_request_queue_wait_seconds",
+            "Time each Request spent on the request queue.",
+        )
+        self.parse_queue_size = r.gauge(
+            f"{prefix}_parse_queue_size",
+            "Callback results waiting on the parse queues.",
+        )
+        self.parse_duration = r.histogram(
+            f"{prefix}_parse_duration_seconds",
+            "Time to process each Request callback result.",
+        )
+        self.items = r.counter(
+            f"{prefix}_items", "Items processed, by Item class.", ["type"]
+        )
+        self.crawls_in_progress = r.gauge(
+            f"{prefix}_crawls_in_progress", "Crawls currently running."
+        )
+        self.crawls = r.counter(
+            f"{prefix}_crawls", "Crawls finished, by stop reason.", ["stop_reason"]
+        )
+
+
+# Process-wide default registry.
+REGISTRY = MetricsRegistry()
@@ -5,6 +5,10 @@ import time
 
 
 class Queueable:
+    # Queueable has no instance attributes of its own, so that subclasses may use __slots__.
+    # Subclasses with __slots__ must set queue_put_time, queue_get_time, and priority in __init__.
+    __slots__ = ()
+
     queue_put_time = None
     queue_get_time = None
     # Default lowest queue priority is 100 (higher number means lower priority)
@@ -1,26 +1,69 @@
 import asyncio
 import copy
+import itertools
 import json
 import logging
-import uuid
 from asyncio import Semaphore, IncompleteReadError, LimitOverrunError, CancelledError
-from random import random
-from typing import List, Tuple, Any, Union, Optional, Dict
+from typing import List, Tuple, Any, Union, Optional, Dict, Callable, Awaitable
 
 import aiohttp
 import time
 from aiohttp import ClientSession, ClientTimeout, hdrs
 from yarl import URL
 
+from feedsearch_crawler.crawler.history import History
 from feedsearch_crawler.crawler.queueable import Queueable
 from feedsearch_crawler.crawler.response import Response
+from feedsearch_crawler.crawler.trace import RequestTimings
 
 logger = logging.getLogger(__name__)
 
+# Sequential Request ids, which are cheaper to create than UUIDs.
+_request_ids = itertools.count(1)
+
 
 class Request(Queueable):
     METHOD = ["GET", "POST"]
 
+    # Many Requests may be queued at once, so they use __slots__ instead of an instance __dict__.
+    __slots__ = (
+        "url",
+        "method",
+        "request_session",
+        "headers",
+        "timeout",
+        "history",
+        "encoding",
+        "_callback",
+        "_failure_callback",
+        "_chunk_callback",
+        "id",
+        "_xml_parser",
+        "max_content_length",
+        "json_data",
+        "data",
+        "params",
+        "has_run",
+        "delay",
+        "cb_kwargs",
+        "should_retry",
+        "_max_retries",
+        "_num_retries",
+        "req_latency",
+        "content_read",
+        "timings",
+        "bytes_read",
+        "last_progress",
+        "_read_start",
+        "stalled",
+        "truncated",
+        "_fetch_task",
+        "fingerprint",
+        "priority",
+        "queue_put_time",
+        "queue_get_time",
+    )
+
     def __init__(
         self,
         url: URL,
@@ -32,7 +75,7 @@ class Request(Queueable):
         method: str = "GET",
         headers: Dict = None,
         timeout: Union[float, ClientTimeout] = 5.0,
-        history: List = None,
+        history: Union[History, List[URL]] = None,
         callback=None,
         xml_parser=None,
         failure_callback=None,
@@ -40,6 +83,7 @@ class Request(Queueable):
         delay: float = 0,
         retries: int = 3,
         cb_kwargs: Dict = None,
+        chunk_callback=None,
         **kwargs,
     ):
         """
@@ -55,14 +99,16 @@ class Request(Queueable):
         :param method: HTTP method
         :param headers: HTTP headers for the request
         :param timeout: Seconds before Request times out
-        :param history: Response history, list of previous URLs
+        :param history: Response history, History or list of previous URLs
         :param callback: Callback function to run after request is successful
         :param xml_parser: Function to parse Response XML
         :param failure_callback: Callback function to run if request is unsuccessful
         :param max_content_length: Maximum allowed size in bytes of Response content
-        :param delay: Time in seconds to delay Request
+        :param delay: Minimum time in seconds between this Request and the previous Request to the same host
         :param retries: Number of times to retry a failed Request
         :param cb_kwargs: Optional Dictionary of keyword arguments to be passed to the callback function.
+        :param chunk_callback: Optional async function called with each chunk of successful Response content as it
+            is read, along with the Request and a Response of the headers. Returns False to stop reading the content.
         :param kwargs: Optional keyword arguments
         """
         self.url = url
@@ -74,13 +120,14 @@ class Request(Queueable):
         self.request_session = request_session
         self.headers = headers
         if not isinstance(timeout, ClientTimeout):
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            timeout = aiohttp.ClientTimeout(total=timeout)
         self.timeout = timeout
-        self.history = history or []
+        self.history: History = History.from_urls(history or [])
         self.encoding = encoding
         self._callback = callback
         self._failure_callback = failure_callback
-        self.id = uuid.uuid4()
+        self._chunk_callback = chunk_callback
+        self.id: int = next(_request_ids)
         self._xml_parser = xml_parser
         self.max_content_length = max_content_length
         self.json_data = json_data
@@ -89,6 +136,9 @@ class Request(Queueable):
         self.has_run: bool = False
         self.delay = delay
         self.cb_kwargs = cb_kwargs or {}
+        self.priority: int = Queueable.priority
+        self.queue_put_time: Optional[float] = None
+        self.queue_get_time: Optional[float] = None
 
         self.should_retry: bool = False
         self._max_retries = retries
@@ -98,11 +148,34 @@ class Request(Queueable):
         self.req_latency: int = 0
         # Time in Milliseconds for the HTTP response content to be read.
         self.content_read: int = 0
+        # Phase timings of the HTTP request, if the Crawler has sampled it to be timed.
+        self.timings: Optional[RequestTimings] = None
+        # Number of bytes of HTTP response content read so far.
+        self.bytes_read: int = 0
+        # Monotonic time at which the HTTP request last made progress.
+        self.last_progress: float = 0
+        # Monotonic time at which the HTTP response content started to be read.
+        self._read_start: float = 0
+        # Whether the HTTP request was cancelled because it stopped making progress.
+        self.stalled: bool = False
+        # Whether the chunk callback stopped the HTTP response content from being read in full.
+        self.truncated: bool = False
+        # Task running the HTTP request while it is in flight.
+        self._fetch_task: Optional[asyncio.Task] = None
+        # Duplicate filter fingerprint of the URL and method, if already computed when the Request was followed.
+        self.fingerprint: Optional[int] = None
 
         for key, value in kwargs:
             if hasattr(self, key):
                 setattr(self, key, value)
 
+    @property
+    def chunk_callback(self) -> Optional[Callable]:
+        """
+        Async function called with each chunk of successful Response content as it is read, if any.
+        """
+        return self._chunk_callback
+
     async def fetch_callback(self, semaphore: Semaphore = None) -> Tuple[Any, Response]:
         """
         Fetch HTTP Response and run Callbacks.
@@ -136,22 +209,28 @@ class Request(Queueable):
 
         :return: Response object
         """
-        # Delay the request if self.delay is > 0
-        await self.delay_request()
-
-        # Copy the Request history so that it isn't a pointer.
-        history = copy.deepcopy(self.history)
+        # History is immutable, so appending creates a new History for the Response.
+        history = self.history
 
         # Make sure that retry is reset.
         self.should_retry = False
         response = None
         start = time.perf_counter()
 
+        # Reset the progress of the HTTP request, which may be watched while it is in flight.
+        self._fetch_task = asyncio.current_task()
+        self.stalled = False
+        self.truncated = False
+        self.bytes_read = 0
+        self._read_start = 0
+        self.last_progress = time.monotonic()
+
         try:
             async with self._create_request() as resp:
                 resp_recieved = time.perf_counter()
                 self.req_latency = int((resp_recieved - start) * 1000)
-                history.append(resp.url)
+                self._read_start = self.last_progress = time.monotonic()
+                history = history.append(resp.url)
 
                 # Fail the response if the content length header is too large.
                 content_length: int = int(resp.headers.get(hdrs.CONTENT_LENGTH, "0"))
@@ -164,8 +243,17 @@ class Request(Queueable):
                     )
                     return self._failed_response(413)
 
+                # Pass the content of successful responses to the chunk callback as it is read.
+                on_chunk = None
+                if self._chunk_callback and resp.status < 300:
+                    on_chunk = self._create_chunk_handler(resp, history)
+
                 # Read the response content, and fail the response if the actual content size is too large.
-                content_read, actual_content_length = await self._read_response(resp)
+                content_read, actual_content_length = await self._read_response(
+                    resp, on_chunk
+                )
+                if self.timings:
+                    self.timings.body = (time.perf_counter() - resp_recieved) * 1000
                 if not content_read:
                     return self._failed_response(413)
 
@@ -214,6 +302,7 @@ class Request(Queueable):
                     redirect_history=resp.history,
                     content_length=actual_content_length,
                     meta=copy.copy(self.cb_kwargs),
+                    truncated=self.truncated,
                 )
 
                 # Raise exception after the Response object is created, because we only catch TimeoutErrors and
@@ -222,27 +311,47 @@ class Request(Queueable):
 
         except asyncio.TimeoutError:
             logger.debug("Failed fetch: url=%s reason=timeout", self.url)
-            history.append(self.url)
+            history = history.append(self.url)
             response = self._failed_response(408, history)
         except aiohttp.ClientResponseError as e:
             logger.debug("Failed fetch: url=%s reason=%s", self.url, e.message)
             if not response:
                 response = self._failed_response(e.status, history)
+        except CancelledError:
+            if not self.stalled:
+                # Let cancellation propagate, so that a stopped crawl doesn't process the failed Response.
+                logger.debug("Cancelled fetch: url=%s", self.url)
+                raise
+            logger.debug(
+                "Failed fetch: url=%s reason=stalled read=%d bytes",
+                self.url,
+                self.bytes_read,
+            )
+            # The cancellation was only meant for this HTTP request, not for the task running it.
+            task = asyncio.current_task()
+            if hasattr(task, "uncancel"):
+                task.uncancel()
+            history = history.append(self.url)
+            response = self._failed_response(408, history)
         except Exception as e:
             logger.debug("Failed fetch: url=%s reason=%s", self.url, e)
-            if isinstance(e, CancelledError) and not response:
-                response = self._failed_response(499, history)
         finally:
             self.has_run = True
-            # Make sure there is a valid Response object.
-            if not response:
-                response = self._failed_response(500, history)
+            self._fetch_task = None
+
+        # Make sure there is a valid Response object.
+        if not response:
+            response = self._failed_response(500, history)
+
+        # Tell the crawler to retry this Request, unless the server stalled, as it will likely stall again.
+        if response.status_code in [429, 503, 408] and not self.stalled:
+            self.set_retry()
 
-            # Tell the crawler to retry this Request
-            if response.status_code in [429, 503, 408]:
-                self.set_retry()
+        if self.timings:
+            self.timings.total = (time.perf_counter() - start) * 1000
+            response.timings = self.timings
 
-            return response
+        return response
 
     def _create_request(self):
         """
@@ -252,7 +361,11 @@ class Request(Queueable):
         """
         if self.method.upper() == "GET":
             return self.request_session.get(
-                self.url, headers=self.headers, timeout=self.timeout, params=self.params
+                self.url,
+                headers=self.headers,
+                timeout=self.timeout,
+                params=self.params,
+                trace_request_ctx=self.timings,
             )
         elif self.method.upper() == "POST":
             return self.request_session.post(
@@ -262,35 +375,76 @@ class Request(Queueable):
                 params=self.params,
                 data=self.data,
                 json=self.json_data,
+                trace_request_ctx=self.timings,
             )
         else:
             raise ValueError(
                 "HTTP method %s is not valid. Must be GET or POST", self.method
             )
 
-    async def _read_response(self, resp) -> Tuple[bool, int]:
+    def _create_chunk_handler(
+        self, resp, history: History
+    ) -> Callable[[bytes], Awaitable[bool]]:
+        """
+        Create a function that passes each chunk of content to the chunk callback,
+        with a Response of the headers that is created once.
+
+        :param resp: asyncio HTTP Response
+        :param history: Response history
+        :return: Async function taking a chunk of content, returning False to stop reading
+        """
+        response = Response(
+            url=resp.url,
+            method=resp.method,
+            # The encoding can't be guessed from the content before it is read.
+            encoding=self.encoding or resp.charset or "",
+            status_code=resp.status,
+            history=history,
+            headers=resp.headers,
+            meta=copy.copy(self.cb_kwargs),
+        )
+
+        async def on_chunk(chunk: bytes) -> bool:
+            result = await self._chunk_callback(
+                request=self, response=response, chunk=chunk
+            )
+            return result is not False
+
+        return on_chunk
+
+    async def _read_response(
+        self, resp, on_chunk: Callable[[bytes], Awaitable[bool]] = None
+    ) -> Tuple[bool, int]:
         """
         Read HTTP Response content as bytes.
 
         :param resp: asyncio HTTP Response
+        :param on_chunk: Optional async function called with each chunk, returning False to stop reading
         :return: Tuple (read status, content length in bytes)
         """
-        body: bytes = b""
+        chunks: List[bytes] = []
         try:
             async for chunk in resp.content.iter_chunked(1024):
                 if not chunk:
                     break
-                body += chunk
-                if len(body) > self.max_content_length:
+                chunks.append(chunk)
+                self.bytes_read += len(chunk)
+                self.last_progress = time.monotonic()
+                if self.bytes_read > self.max_content_length:
                     logger.debug(
                         "Content Length of Response body greater than max %d: %s",
                         self.max_content_length,
                         self,
                     )
                     return False, 0
+                if on_chunk and not await on_chunk(chunk):
+                    # The unread content is discarded when the response is closed.
+                    self.truncated = True
+                    break
         except (IncompleteReadError, LimitOverrunError) as e:
             logger.exception("Failed to read Response content: %s: %s", self, e)
             return False, 0
+        body = b"".join(chunks)
         resp._body = body
         return True, len(body)
 
@@ -316,14 +470,51 @@ class Request(Queueable):
         except ValueError:
             return None
 
+    def is_stalled(
+        self, stall_timeout: float, min_read_rate: int = 0, now: float = None
+    ) -> bool:
+        """
+        Check whether the in-flight HTTP request has stopped making progress.
+
+        :param stall_timeout: Max time in seconds without receiving the response headers or any content
+        :param min_read_rate: Min average rate in bytes per second at which the response content is read,
+            checked once the content has been read for stall_timeout. 0 for no minimum.
+        :param now: Optional current monotonic time in seconds
+        :return: True if the request is in flight and has stalled
+        """
+        if not self._fetch_task:
+            return False
+        if now is None:
+            now = time.monotonic()
+
+        if now - self.last_progress > stall_timeout:
+            return True
+        reading = now - self._read_start
+        if min_read_rate and self._read_start and reading > stall_timeout:
+            return self.bytes_read / reading < min_read_rate
+        return False
+
+    def cancel_stalled(self) -> bool:
+        """
+        Cancel the in-flight HTTP request because it has stopped making progress.
+        The fetch then returns a failed Response with status 408, instead of being cancelled.
+
+        :return: True if the request was in flight and has been cancelled
+        """
+        if not self._fetch_task or self.stalled:
+            return False
+        self.stalled = True
+        self._fetch_task.cancel()
+        return True
+
     def _failed_response(
-        self, status: int, history: List[URL] = None, headers=None
+        self, status: int, history: History = None, headers=None
     ) -> Response:
         """
         Create a failed Response object with the provided Status Code.
 
         :param status: HTTP Status Code
-        :param history: Response History as list of URLs
+        :param history: Response History
         :param headers: Response Headers
         :return: Failed Response object
         """
@@ -331,20 +522,21 @@ class Request(Queueable):
             url=self.url,
             method=self.method,
             encoding=self.encoding,
-            history=history or [],
+            history=history,
             status_code=status,
             headers=headers or {},
         )
 
-    async def _parse_xml(self, response_text: str) -> Any:
+    async def _parse_xml(self, data: bytes, encoding: str) -> Any:
         """
         Use provided XML Parsers method to attempt to parse Response content as XML.
 
-        :param response_text: Response content as text string.
+        :param data: Response content as bytes.
+        :param encoding: Character encoding of the Response content.
         :return: Response content as parsed XML. Type depends on XML parser.
         """
         try:
-            return await self._xml_parser(response_text)
+            return await self._xml_parser(data, encoding)
         except Exception as e:
             logger.exception("Error parsing response xml: %s", e)
             return None
@@ -358,13 +550,5 @@ class Request(Queueable):
             self._num_retries += 1
             self.delay = self._num_retries * 1
 
-    async def delay_request(self) -> None:
-        """
-        Delay the request by sleeping.
-        """
-        if self.delay > 0:
-            # Sleep for the delay plus up to one extra second of random time, to spread out requests.
-            await asyncio.sleep(self.delay + random())
-
     def __repr__(self):
         return f"{self.__class__.__name__}({str(self.url)})"
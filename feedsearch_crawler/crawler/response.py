@@ -1,13 +1,38 @@
-import uuid
-from typing import List, Dict, Any, Optional
+import itertools
+from typing import List, Dict, Any, Optional, Union
 
 from yarl import URL
 
-from feedsearch_crawler.crawler.lib import is_same_domain
+from feedsearch_crawler.crawler.history import History
+from feedsearch_crawler.crawler.lib import is_same_domain, to_bytes
+
+# Sequential Response ids, which are cheaper to create than UUIDs.
+_response_ids = itertools.count(1)
 
 
 class Response:
-    _xml = None
+    # Responses use __slots__ instead of an instance __dict__, as one is created for every Request.
+    __slots__ = (
+        "url",
+        "encoding",
+        "method",
+        "text",
+        "json",
+        "data",
+        "history",
+        "headers",
+        "status_code",
+        "cookies",
+        "id",
+        "_xml_parser",
+        "_xml",
+        "redirect_history",
+        "content_length",
+        "meta",
+        "timings",
+        "origin",
+        "truncated",
+    )
 
     def __init__(
         self,
@@ -17,7 +42,7 @@ class Response:
         text: str = "",
         json: Dict = None,
         data: bytes = b"",
-        history: List[URL] = None,
+        history: Union[History, List[URL]] = None,
         headers=None,
         status_code: int = -1,
         cookies=None,
@@ -25,6 +50,8 @@ class Response:
         redirect_history=None,
         content_length: int = 0,
         meta: Dict = None,
+        timings=None,
+        truncated: bool = False,
     ):
         self.url = url
         self.encoding = encoding
@@ -32,16 +59,21 @@ class Response:
         self.text = text
         self.json = json
         self.data = data
-        self.history = history or []
+        self.history: History = History.from_urls(history or [])
         self.headers = headers or {}
         self.status_code = status_code
         self.cookies = cookies
-        self.id = uuid.uuid4()
+        self.id: int = next(_response_ids)
         self._xml_parser = xml_parser
+        self._xml = None
         self.redirect_history = redirect_history
         self.content_length = content_length
         self.meta = meta
+        # RequestTimings of the HTTP request phases, if the Request was sampled to be timed.
+        self.timings = timings
         self.origin: URL = url.origin()
+        # Whether only the start of the content was read, because the Request chunk callback stopped reading.
+        self.truncated = truncated
 
     @property
     def ok(self) -> bool:
@@ -75,12 +107,20 @@ class Response:
         if not self._xml_parser:
             return None
 
-        if not self.text and self.data and self.encoding:
-            self.text = self.data.decode(self.encoding)
+        data = self.data
+        if not data and self.text:
+            data = to_bytes(self.text, self.encoding or "utf-8")
+        if not data:
+            return None
 
-        self._xml = await self._xml_parser(self.text)
+        self._xml = await self._xml_parser(data, self.encoding)
         return self._xml
 
+    @xml.setter
+    def xml(self, value: Any) -> None:
+        # Set the parsed content if it was already parsed as it was read, so that it isn't parsed again.
+        self._xml = value
+
     def is_max_depth_reached(self, max_depth: int) -> bool:
         """
         Check if the max response depth has been reached.
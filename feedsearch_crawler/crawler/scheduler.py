@@ -0,0 +1,248 @@
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+import time
+
+
+class HostScheduler:
+    """
+    Schedules Requests so that each host is only fetched once per delay interval.
+
+    Rather than sleeping inside a worker, the scheduler calculates when a Request's host will next
+    allow a fetch, so that the Request can be held back until then without tying up a worker.
+    Requests to other hosts are unaffected and may be fetched immediately.
+
+    Requests that find their host busy when a fetch worker takes them are held in a FIFO for that host.
+    Each time the host's fetch slot frees, only the Request at the head of the FIFO is released, and the
+    released Request has the next claim on the slot, so held Requests are fetched one at a time in order.
+
+    The scheduler also keeps a moving average of each host's Request durations, so that the Crawler can
+    estimate whether a Request will finish before the crawl deadline.
+    """
+
+    # Weight of the latest duration in the moving average of each host's Request durations.
+    latency_weight = 0.3
+
+    def __init__(self):
+        # Dictionary of hosts and the monotonic time at which each host may next be fetched.
+        self._next_allowed: Dict[str, float] = {}
+        # Dictionary of hosts and the moving average of their Request durations in seconds.
+        self._latencies: Dict[str, float] = {}
+        # Dictionary of hosts and the FIFO of Requests waiting for the host's fetch slot.
+        self._held: Dict[str, Deque[Any]] = {}
+        # Dictionary of hosts and the Request released from the host's FIFO, which has the next claim on the slot.
+        self._released: Dict[str, Any] = {}
+        # Hosts with a release scheduled, or a released Request that hasn't yet claimed the slot.
+        self._releasing: Set[str] = set()
+
+    def reserve(
+        self, host: str, interval: float, backoff: float = 0, now: float = None
+    ) -> float:
+        """
+        Reserve the next available fetch slot for a host.
+
+        The host is then unavailable to any other Request until the interval has passed.
+
+        :param host: URL host of the Request
+        :param interval: Minimum time in seconds between fetches to the host
+        :param backoff: Minimum time in seconds from now before the Request may be fetched. Used for retries.
+        :param now: Optional current monotonic time in seconds
+        :return: Time in seconds to wait before the Request may be fetched
+        """
+        if now is None:
+            now = time.monotonic()
+
+        wait = self.wait_time(host, backoff, now)
+        self._next_allowed[host] = now + wait + max(interval, 0)
+        return wait
+
+    def wait_time(self, host: str, backoff: float = 0, now: float = None) -> float:
+        """
+        Get the time until the next available fetch slot for a host, without reserving it.
+
+        :param host: URL host of the Request
+        :param backoff: Minimum time in seconds from now before the Request may be fetched. Used for retries.
+        :param now: Optional current monotonic time in seconds
+        :return: Time in seconds to wait before a Request to the host may be fetched
+        """
+        if now is None:
+            now = time.monotonic()
+
+        return max(now + max(backoff, 0), self._next_allowed.get(host, 0)) - now
+
+    def acquire(
+        self, host: str, request: Any, interval: float, now: float = None
+    ) -> bool:
+        """
+        Reserve the fetch slot of a host for a Request that a fetch worker has taken, if the slot is free
+        and no earlier Request is waiting for it.
+
+        :param host: URL host of the Request
+        :param request: Request to be fetched
+        :param interval: Minimum time in seconds between fetches to the host
+        :param now: Optional current monotonic time in seconds
+        :return: True if the slot was reserved and the Request may be fetched now.
+        """
+        if host in self._releasing:
+            if self._released.get(host) is not request:
+                return False
+        elif self._held.get(host):
+            return False
+        if self.wait_time(host, now=now) > 0:
+            return False
+
+        if self._released.pop(host, None) is not None:
+            self._releasing.discard(host)
+        self.reserve(host, interval, now=now)
+        return True
+
+    def hold(self, host: str, request: Any) -> None:
+        """
+        Hold a Request in the FIFO of its host until the host's fetch slot frees.
+
+        :param host: URL host of the Request
+        :param request: Request that couldn't acquire the slot
+        """
+        held = self._held.setdefault(host, deque())
+        if self._released.get(host) is request:
+            # The released Request lost its claim, so it stays at the head of the FIFO.
+            del self._released[host]
+            self._releasing.discard(host)
+            held.appendleft(request)
+        else:
+            held.append(request)
+
+    def next_release(self, host: str, now: float = None) -> Optional[float]:
+        """
+        Get the time until the next held Request of a host should be released, and mark the release as scheduled.
+
+        :param host: URL host
+        :param now: Optional current monotonic time in seconds
+        :return: Time in seconds until the release, or None if there's nothing to release
+            or a release is already scheduled.
+        """
+        if host in self._releasing or not self._held.get(host):
+            return None
+        self._releasing.add(host)
+        return self.wait_time(host, now=now)
+
+    def release(self, host: str) -> Optional[Any]:
+        """
+        Release the Request at the head of a host's FIFO, giving it the next claim on the host's fetch slot.
+
+        :param host: URL host
+        :return: The released Request, or None if no Requests are held for the host.
+        """
+        held = self._held.get(host)
+        if not held:
+            self._releasing.discard(host)
+            return None
+        request = held.popleft()
+        if not held:
+            del self._held[host]
+        self._released[host] = request
+        return request
+
+    def forfeit(self, host: str, request: Any) -> None:
+        """
+        Give up the claim of a released Request that won't be fetched, so that the next held Request
+        may be released.
+
+        :param host: URL host of the Request
+        :param request: Request that won't be fetched
+        """
+        if self._released.get(host) is request:
+            del self._released[host]
+            self._releasing.discard(host)
+
+    def held(self, host: str) -> int:
+        """
+        Number of Requests held for a host.
+
+        :param host: URL host
+        """
+        return len(self._held.get(host, ()))
+
+    def clear_held(self) -> None:
+        """
+        Drop all held and released Requests.
+        """
+        self._held.clear()
+        self._released.clear()
+        self._releasing.clear()
+
+    def record_latency(self, host: str, duration: float) -> None:
+        """
+        Record the duration of a Request to a host.
+
+        :param host: URL host of the Request
+        :param duration: Request duration in seconds
+        """
+        average = self._latencies.get(host)
+        if average is None:
+            self._latencies[host] = duration
+        else:
+            self._latencies[host] = average + self.latency_weight * (duration - average)
+
+    def latency(self, host: str, default: float = 0) -> float:
+        """
+        Get the moving average duration of Requests to a host.
+
+        :param host: URL host
+        :param default: Duration to return if no Requests to the host have been recorded
+        :return: Average Request duration in seconds
+        """
+        return self._latencies.get(host, default)
+
+
+class DeadlineTuner:
+    """
+    Tunes the time budget of each search, so that a target quantile of search durations is within a target latency.
+
+    Each search that takes longer than the target shrinks the budget by a fixed step, and each search within
+    the target grows it by a smaller step. The steps are sized so that the budget settles where the target
+    quantile of searches finish in time, without keeping a history of search durations.
+    """
+
+    def __init__(
+        self,
+        target: float,
+        quantile: float = 0.95,
+        step: float = 0.1,
+        min_budget: float = None,
+    ):
+        """
+        :param target: Target search duration in seconds
+        :param quantile: Fraction of searches that should finish within the target, between 0 and 1.
+        :param step: Fraction by which the budget shrinks after a search that overruns the target.
+        :param min_budget: Lowest budget in seconds. Defaults to a tenth of the target.
+        """
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if not 0 < step < 1:
+            raise ValueError("step must be between 0 and 1")
+
+        self.target = target
+        self.quantile = quantile
+        self.min_budget = min_budget if min_budget is not None else target / 10
+
+        # Time budget in seconds for the next search.
+        self.budget: float = target
+
+        self._shrink = 1 - step
+        # At equilibrium, (1 - quantile) * log(shrink) + quantile * log(grow) == 0.
+        self._grow = math.exp(-math.log(self._shrink) * (1 - quantile) / quantile)
+
+    def record(self, duration: float) -> float:
+        """
+        Record the duration of a search and adjust the budget.
+
+        :param duration: Search duration in seconds
+        :return: Time budget in seconds for the next search
+        """
+        if duration > self.target:
+            self.budget = max(self.min_budget, self.budget * self._shrink)
+        else:
+            self.budget = min(self.target, self.budget * self._grow)
+        return self.budget
@@ -0,0 +1,116 @@
+import math
+from typing import Dict, Union
+
+
+class StreamingStats:
+    """
+    Fixed-memory summary statistics of a stream of non-negative values, such as durations or sizes.
+
+    Count, total, min, max and harmonic mean are exact. Quantiles are estimated from a logarithmic histogram,
+    and are accurate to within the relative accuracy of the actual value. With the default accuracy of 1%,
+    values between 1 and 10^9 need at most around 1000 buckets, however many values are added.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        :param relative_accuracy: Max relative error of estimated quantiles, between 0 and 1.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        # Number of values added.
+        self.count: int = 0
+        # Sum of all values added.
+        self.total: Union[int, float] = 0
+        # Lowest value added.
+        self.min: Union[int, float] = 0
+        # Highest value added.
+        self.max: Union[int, float] = 0
+
+        # Count of values in each histogram bucket, keyed by bucket index.
+        self._buckets: Dict[int, int] = {}
+        # Count of values too small to be bucketed, including zeroes.
+        self._zero_count: int = 0
+        # Sum of reciprocals of the positive values, for the harmonic mean.
+        self._reciprocal_total: float = 0
+
+    def add(self, value: Union[int, float]) -> None:
+        """
+        Add a value to the summary.
+
+        :param value: Non-negative value
+        """
+        if value < 0:
+            raise ValueError("StreamingStats values must be non-negative")
+
+        if not self.count:
+            self.min = value
+            self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+
+        self.count += 1
+        self.total += value
+
+        if value < 1e-9:
+            self._zero_count += 1
+            return
+
+        self._reciprocal_total += 1 / value
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> Union[int, float]:
+        """
+        Estimate the value at a quantile.
+
+        :param q: Quantile between 0 and 1, e.g. 0.9 for the 90th percentile.
+        :return: Estimated value, or 0 if no values have been added.
+        """
+        if not self.count:
+            return 0
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return self.min
+
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # The midpoint of the bucket is within the relative accuracy of every value in the bucket.
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return max(self.min, min(self.max, value))
+
+        return self.max
+
+    @property
+    def median(self) -> Union[int, float]:
+        """Estimated median value."""
+        return self.quantile(0.5)
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean, or 0 if no values have been added."""
+        return self.total / self.count if self.count else 0
+
+    @property
+    def harmonic_mean(self) -> float:
+        """Harmonic mean, or 0 if no values have been added or any value is zero."""
+        if not self.count or self._zero_count:
+            return 0
+        return self.count / self._reciprocal_total
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(count={self.count}, min={self.min}, "
+            f"max={self.max}, median={self.median})"
+        )
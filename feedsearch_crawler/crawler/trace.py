@@ -1,8 +1,14 @@
 import asyncio
 import logging
+import time
+from dataclasses import dataclass, field
+from random import random
+from typing import Optional, Dict
 
 import aiohttp
 
+from feedsearch_crawler.crawler.stats import StreamingStats
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,3 +80,192 @@ def add_trace_config():
     trace_config.on_connection_create_start.append(on_connection_create_start)
     trace_config.on_connection_create_end.append(on_connection_create_end)
     return trace_config
+
+
+# Names of the RequestTimings phases.
+TIMING_PHASES = ("dns", "connect", "ttfb", "body", "redirect", "total")
+
+
+@dataclass
+class RequestTimings:
+    """
+    Durations in Milliseconds of each phase of an HTTP request, or None if the phase didn't happen.
+
+    Phases of every redirect hop are summed. aiohttp does not report the TLS handshake separately,
+    so it is included in the connect phase.
+    """
+
+    # Resolving the host with DNS, excluding DNS cache hits.
+    dns: Optional[float] = None
+    # Creating new connections, including the TLS handshake but excluding DNS.
+    connect: Optional[float] = None
+    # From sending the final request to receiving the response headers.
+    ttfb: Optional[float] = None
+    # Reading the response body.
+    body: Optional[float] = None
+    # Following redirects, from the request start until the final redirect response.
+    redirect: Optional[float] = None
+    # Whole request, from the request start until the response body is read.
+    total: Optional[float] = None
+
+    # perf_counter marks of phases in progress.
+    _start: float = field(default=0, repr=False)
+    _dns_start: float = field(default=0, repr=False)
+    _connect_start: float = field(default=0, repr=False)
+    _connect_dns: float = field(default=0, repr=False)
+    _ttfb_start: float = field(default=0, repr=False)
+
+    def phases(self) -> Dict[str, float]:
+        """
+        Get the durations of the phases that happened.
+
+        :return: Dictionary of phase durations in Milliseconds, keyed by phase name
+        """
+        return {
+            name: getattr(self, name)
+            for name in TIMING_PHASES
+            if getattr(self, name) is not None
+        }
+
+
+def _timings(trace_config_ctx) -> Optional[RequestTimings]:
+    timings = trace_config_ctx.trace_request_ctx
+    return timings if isinstance(timings, RequestTimings) else None
+
+
+def _elapsed(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+async def on_timing_request_start(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings._start = timings._ttfb_start = time.perf_counter()
+
+
+async def on_timing_dns_resolvehost_start(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings._dns_start = time.perf_counter()
+
+
+async def on_timing_dns_resolvehost_end(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings.dns = (timings.dns or 0) + _elapsed(timings._dns_start)
+
+
+async def on_timing_connection_create_start(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings._connect_start = time.perf_counter()
+        timings._connect_dns = timings.dns or 0
+
+
+async def on_timing_connection_create_end(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        # DNS resolution happens while creating the connection, so exclude it from the connect time.
+        dns = (timings.dns or 0) - timings._connect_dns
+        connect = _elapsed(timings._connect_start) - dns
+        timings.connect = (timings.connect or 0) + connect
+        timings._ttfb_start = time.perf_counter()
+
+
+async def on_timing_connection_reuseconn(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings._ttfb_start = time.perf_counter()
+
+
+async def on_timing_request_headers_sent(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings._ttfb_start = time.perf_counter()
+
+
+async def on_timing_request_redirect(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings.redirect = _elapsed(timings._start)
+        timings._ttfb_start = time.perf_counter()
+
+
+async def on_timing_request_end(session, trace_config_ctx, params):
+    timings = _timings(trace_config_ctx)
+    if timings:
+        timings.ttfb = _elapsed(timings._ttfb_start)
+
+
+def add_timing_trace_config() -> aiohttp.TraceConfig:
+    """
+    Create a TraceConfig that records the phase timings of requests made with a RequestTimings
+    as the trace_request_ctx. Requests without a RequestTimings are not timed.
+
+    :return: aiohttp TraceConfig
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_timing_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_timing_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_timing_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_timing_connection_create_start)
+    trace_config.on_connection_create_end.append(on_timing_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_timing_connection_reuseconn)
+    trace_config.on_request_redirect.append(on_timing_request_redirect)
+    trace_config.on_request_end.append(on_timing_request_end)
+    # Only available in newer versions of aiohttp.
+    if hasattr(trace_config, "on_request_headers_sent"):
+        trace_config.on_request_headers_sent.append(on_timing_request_headers_sent)
+    return trace_config
+
+
+class RequestTimingStats:
+    """
+    Samples requests to be timed, and aggregates their phase timings into fixed-memory histograms.
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        """
+        :param sample_rate: Fraction of requests to time, between 0 and 1.
+        """
+        self.sample_rate = sample_rate
+        # Summary of the durations of each phase, keyed by phase name.
+        self.phases: Dict[str, StreamingStats] = {
+            name: StreamingStats() for name in TIMING_PHASES
+        }
+
+    def sample(self) -> Optional[RequestTimings]:
+        """
+        Decide whether to time a request.
+
+        :return: RequestTimings to pass as the request trace_request_ctx, or None if the request isn't sampled.
+        """
+        if self.sample_rate >= 1 or random() < self.sample_rate:
+            return RequestTimings()
+        return None
+
+    def record(self, timings: RequestTimings) -> None:
+        """
+        Add the phase timings of a finished request to the histograms.
+
+        :param timings: RequestTimings
+        """
+        for name, duration in timings.phases().items():
+            self.phases[name].add(duration)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the count and estimated percentiles of each phase that has been timed.
+
+        :return: Dictionary of count, median, p90 and p99 in Milliseconds, keyed by phase name
+        """
+        return {
+            name: {
+                "count": stats.count,
+                "median": int(stats.median),
+                "p90": int(stats.quantile(0.9)),
+                "p99": int(stats.quantile(0.99)),
+            }
+            for name, stats in self.phases.items()
+            if stats.count
+        }
@@ -1,17 +1,59 @@
-from w3lib.url import url_query_cleaner, canonicalize_url
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode
+
 from yarl import URL
 
 from feedsearch_crawler.crawler import DuplicateFilter
 
 
+def canonicalize(url: URL, keep_query: bool = True) -> str:
+    """
+    Canonicalize a URL directly from its yarl components, without parsing the URL string again.
+
+    yarl has already lowercased the scheme and host, encoded the host with IDNA, removed dot segments
+    from the path, and normalized its percent-encoding. The default port and the fragment are removed,
+    an empty path becomes "/", and the query parameters are sorted.
+    Equivalent to w3lib canonicalize_url() for almost all URLs, see benchmarks/canonicalize_benchmark.py.
+
+    :param url: Absolute URL object
+    :param keep_query: Keep the sorted query string, or remove it
+    :return: Canonical URL as string
+    """
+    authority = url.raw_authority
+    if url.is_default_port():
+        port = f":{url.port}"
+        if authority.endswith(port):
+            authority = authority[: -len(port)]
+    canonical = f"{url.scheme}://{authority}{url.raw_path or '/'}"
+
+    query = url.raw_query_string
+    if keep_query and query:
+        # Decoded as Latin-1 so that the query bytes are sorted and encoded again unchanged,
+        # even if they aren't valid UTF-8.
+        pairs = parse_qsl(query, keep_blank_values=True, encoding="latin-1")
+        canonical += "?" + urlencode(sorted(pairs), encoding="latin-1")
+    return canonical
+
+
 class NoQueryDupeFilter(DuplicateFilter):
     valid_keys = ["feedformat", "feed", "rss", "atom", "jsonfeed", "format", "podcast"]
 
+    # Number of canonical URLs to cache. Pages of the same site mostly link to the same URLs.
+    cache_size = 10000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Least recently used cache of canonical URLs, keyed by URL object, each filter having its own cache.
+        self._canonicalize = lru_cache(maxsize=self.cache_size)(self._parse_url)
+
     def parse_url(self, url: URL) -> str:
+        return self._canonicalize(url)
+
+    def _parse_url(self, url: URL) -> str:
         # Keep the query strings if they might be feed strings.
         # Wikipedia for example uses query strings to differentiate feeds.
-        if any(key in url.query for key in self.valid_keys):
-            return canonicalize_url(str(url))
+        if url.raw_query_string and any(key in url.query for key in self.valid_keys):
+            return canonicalize(url)
 
-        # Canonicalizing the URL is about 4x slower, but worth it to prevent duplicate requests.
-        return canonicalize_url(url_query_cleaner(str(url)))
+        # Canonicalizing the URL is worth it to prevent duplicate requests.
+        return canonicalize(url, keep_query=False)
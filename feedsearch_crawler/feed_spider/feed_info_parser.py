@@ -2,18 +2,24 @@ import logging
 from datetime import datetime, date
 from statistics import mean
 from types import AsyncGeneratorType
-from typing import Tuple, List, Union, Dict
+from typing import Tuple, List, Union, Dict, Optional
 
 import feedparser
 import time
 from aiohttp import hdrs
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 from yarl import URL
 
 from feedsearch_crawler.crawler import ItemParser, Request, Response, to_string
 from feedsearch_crawler.crawler.lib import headers_to_dict, remove_www
 from feedsearch_crawler.feed_spider.favicon import Favicon
 from feedsearch_crawler.feed_spider.feed_info import FeedInfo
+from feedsearch_crawler.feed_spider.feed_summarizer import (
+    UnsupportedFeed,
+    summarize_feed,
+)
+from feedsearch_crawler.feed_spider.feed_summary import FeedSummary
 from feedsearch_crawler.feed_spider.lib import (
     parse_header_links,
     datestring_to_utc_datetime,
@@ -54,7 +60,7 @@ class FeedInfoParser(ItemParser):
             if parse_type == ParseTypes.JSON:
                 valid_feed = self.parse_json(item, response.json)
             elif parse_type == ParseTypes.XML:
-                valid_feed = self.parse_xml(
+                valid_feed = await self.parse_xml(
                     item,
                     response.data,
                     response.encoding,
@@ -85,74 +91,116 @@ class FeedInfoParser(ItemParser):
         self.score_item(item, response.history[0])
         yield item
 
-    def parse_xml(
+    async def parse_xml(
         self, item: FeedInfo, data: Union[str, bytes], encoding: str, headers: Dict
     ) -> bool:
         """
         Get info from XML (RSS or ATOM) feed.
-        """
 
-        # Parse data with feedparser
+        The feed is parsed in the Crawler Executor, which returns a compact FeedSummary.
+        """
         try:
-            parsed = self.parse_raw_data(data, encoding, headers)
+            summary: FeedSummary = await self.crawler.run_in_executor(
+                FeedInfoParser.summarize_xml,
+                data,
+                encoding,
+                headers,
+                self.crawler.htmlparser,
+            )
         except Exception as e:
             logger.exception("Unable to parse feed %s: %s", item, e)
             return False
 
-        if not parsed:
-            logger.warning("No valid feed data for %s", item)
+        if not summary:
+            logger.debug("No valid feed data for %s", item)
             return False
 
+        if summary.bozo:
+            item.bozo = 1
+
+        # Only use feed links if no hubs already present from headers
+        if not item.hubs:
+            item.hubs, item.self_url = summary.hubs, summary.self_url
+
+        if item.hubs and item.self_url:
+            item.is_push = True
+
+        item.version = summary.version
+        item.title = summary.title
+        item.description = summary.description
+        item.is_podcast = summary.is_podcast
+        item.item_count = summary.item_count
+
+        try:
+            dates = summary.entry_dates
+
+            if dates:
+                item.last_updated = sorted(dates, reverse=True)[0]
+                item.velocity = self.entry_velocity(dates)
+            elif summary.updated:
+                item.last_updated = datestring_to_utc_datetime(summary.updated)
+        except Exception as e:
+            logger.exception("Unable to get feed published date: %s", e)
+            pass
+
+        return True
+
+    @staticmethod
+    def summarize_xml(
+        data: Union[str, bytes], encoding: str, headers: Dict, htmlparser: str
+    ) -> Optional[FeedSummary]:
+        """
+        Parse XML (RSS or ATOM) feed data into a FeedSummary.
+
+        Runs in the Crawler Executor, so takes raw data and returns only the values needed for a FeedInfo.
+
+        :param data: RSS/Atom XML feed
+        :param encoding: Character encoding of data
+        :param headers: Response headers
+        :param htmlparser: BeautifulSoup tree builder name used to clean the feed title
+        :return: FeedSummary, or None if the data is not a valid feed
+        """
+        parsed = FeedInfoParser.parse_raw_data(data, encoding, headers, summarize=True)
+        if not parsed:
+            return None
+
+        summary = FeedSummary()
+
         if parsed.get("bozo") == 1:
             bozo_exception = parsed.get("bozo_exception", None)
             if isinstance(bozo_exception, feedparser.CharacterEncodingOverride):
-                item.bozo = 1
+                summary.bozo = 1
             elif isinstance(
                 bozo_exception,
                 (feedparser.CharacterEncodingUnknown, feedparser.UndeclaredNamespace),
             ):
-                logger.warning("No valid feed data for %s: %s", item, bozo_exception)
-                return False
+                logger.warning("No valid feed data: %s", bozo_exception)
+                return None
 
         feed = parsed.get("feed")
         if not feed:
-            return False
-        if not parsed.get("entries"):
-            return False
-
-        # Only search if no hubs already present from headers
-        if not item.hubs:
-            item.hubs, item.self_url = self.websub_links(feed)
-
-        if item.hubs and item.self_url:
-            item.is_push = True
-
-        item.version = parsed.get("version")
-        item.title = self.feed_title(feed)
-        item.description = self.feed_description(feed)
-        item.is_podcast = self.is_podcast(parsed)
+            return None
+        entries = parsed.get("entries")
+        if not entries:
+            return None
+
+        summary.hubs, summary.self_url = FeedInfoParser.websub_links(feed)
+        summary.version = parsed.get("version")
+        summary.title = FeedInfoParser.feed_title(feed, htmlparser)
+        summary.description = FeedInfoParser.feed_description(feed)
+        summary.is_podcast = FeedInfoParser.is_podcast(parsed)
+        summary.item_count = len(entries)
+        summary.updated = feed.get("updated", "")
 
         try:
-            dates = []
             now_date = datetime.utcnow().date()
-
-            entries = parsed.get("entries", [])
-            item.item_count = len(entries)
-
-            dates.extend(
+            summary.entry_dates = list(
                 FeedInfoParser.entry_dates(entries, ["updated", "published"], now_date)
             )
-
-            if dates:
-                item.last_updated = sorted(dates, reverse=True)[0]
-                item.velocity = self.entry_velocity(dates)
-            elif feed.get("updated"):
-                item.last_updated = datestring_to_utc_datetime(feed.get("updated"))
         except Exception as e:
             logger.exception("Unable to get feed published date: %s", e)
-            pass
 
-        return True
+        return summary
 
     def parse_json(self, item: FeedInfo, data: dict) -> bool:
         """
@@ -211,7 +259,10 @@ class FeedInfoParser(ItemParser):
 
     @staticmethod
     def parse_raw_data(
-        raw_data: Union[str, bytes], encoding: str = "utf-8", headers: Dict = None
+        raw_data: Union[str, bytes],
+        encoding: str = "utf-8",
+        headers: Dict = None,
+        summarize: bool = False,
     ) -> Dict:
         """
         Loads the raw RSS/Atom XML data.
@@ -223,6 +274,8 @@ class FeedInfoParser(ItemParser):
         :param encoding: Character encoding of raw_data
         :type encoding: str
         :param headers: Response headers
+        :param summarize: Only parse the values used in a FeedSummary, in one streaming pass.
+            Falls back to feedparser for malformed or uncommon feeds.
         :return: Dict
         """
         if not encoding:
@@ -249,9 +302,17 @@ class FeedInfoParser(ItemParser):
             raw_data = raw_data.strip()
             content_length = len(raw_data)
 
-            # We want to pass data into feedparser as bytes, otherwise if we accidentally pass a url string
-            # it will attempt a fetch
-            data = feedparser.parse(raw_data, response_headers=h)
+            data = None
+            if summarize:
+                try:
+                    data = summarize_feed(raw_data, h)
+                except UnsupportedFeed as e:
+                    logger.debug("Feed Summary fallback: %s", e)
+
+            if data is None:
+                # We want to pass data into feedparser as bytes, otherwise if we accidentally pass a url string
+                # it will attempt a fetch
+                data = feedparser.parse(raw_data, response_headers=h)
 
             dur = int((time.perf_counter() - start) * 1000)
             logger.debug("Feed Parse: size=%s dur=%sms", content_length, dur)
@@ -260,28 +321,35 @@ class FeedInfoParser(ItemParser):
         except Exception as e:
             logger.exception("Could not parse RSS data: %s", e)
 
-    def feed_title(self, feed: dict) -> str:
+    @staticmethod
+    def feed_title(feed: dict, htmlparser: str = "html.parser") -> str:
         """
         Get feed title
 
         :param feed: feed dict
+        :param htmlparser: BeautifulSoup tree builder name
         :return: str
         """
         title = feed.get("title", None)
         if not title:
             return ""
-        return self.clean_title(title)
+        return FeedInfoParser.clean_title(title, htmlparser)
 
-    def clean_title(self, title: str) -> str:
+    @staticmethod
+    def clean_title(title: str, htmlparser: str = "html.parser") -> str:
         """
         Cleans title string, and shortens if too long.
         Have had issues with dodgy feed titles.
 
         :param title: Title string
+        :param htmlparser: BeautifulSoup tree builder name
         :return: str
         """
+        # The Spider htmlparser may be the name of an HTML parser backend that isn't a tree builder.
+        if not builder_registry.lookup(htmlparser):
+            htmlparser = "html.parser"
         try:
-            title = BeautifulSoup(title, self.crawler.htmlparser).get_text()
+            title = BeautifulSoup(title, htmlparser).get_text()
             if len(title) > 1024:
                 title = title[:1020] + "..."
             return title
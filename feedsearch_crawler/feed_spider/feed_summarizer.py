@@ -0,0 +1,822 @@
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+from xml.parsers import expat
+
+from feedparser import FeedParserDict
+from feedparser.encodings import convert_to_utf8
+from feedparser.mixin import _FeedParserMixin
+from feedparser.sanitizer import replace_doctype
+from feedparser.urls import make_safe_absolute_uri
+
+# Namespace URIs and their standard prefixes, from feedparser so that elements are named the same.
+_namespaces: Dict[str, str] = {
+    uri.lower(): prefix for uri, prefix in _FeedParserMixin.namespaces.items()
+}
+
+# Win-1252 characters that feedparser maps to their code points.
+_cp1252: Dict[int, str] = {}
+for _code in range(0x80, 0xA0):
+    try:
+        _cp1252[_code] = bytes([_code]).decode("cp1252")
+    except UnicodeDecodeError:
+        pass
+
+# The feedparser fix for URIs with extra slashes after the scheme.
+_urifixer = re.compile("^([A-Za-z][A-Za-z0-9+-.]*://)(/*)(.*?)")
+
+# Text that feedparser may guess is HTML, in a plain text element of a feed that isn't Atom.
+_html_like_regex = re.compile(r"</\w+>|&#?\w+;")
+
+# Text that feedparser may change when it sanitizes HTML: tags, entities and carriage returns.
+_markup_regex = re.compile(r"[<\r]|&[#\w]")
+
+_html_types = {"application/xhtml+xml", "text/html"}
+
+# Contexts that feedparser stores values in.
+FEED, ENTRY, IMAGE, TEXTINPUT, SOURCE = range(5)
+
+# Feed values that are summarized.
+_feed_values = {"title", "subtitle", "summary", "description"}
+
+# Elements that feedparser has handlers for, which may or may not store a value.
+_feedparser_elements = frozenset(
+    name.split("_", 2)[2]
+    for name in dir(_FeedParserMixin)
+    if name.startswith(("_start_", "_end_"))
+)
+
+
+class UnsupportedFeed(Exception):
+    """
+    The feed is malformed, or has an uncommon structure that the FeedSummarizer can't summarize
+    with the same results as feedparser, so should be parsed by feedparser instead.
+    """
+
+
+def _urljoin(base: str, uri: str) -> str:
+    uri = _urifixer.sub(r"\1\3", uri)
+    try:
+        return urljoin(base, uri)
+    except ValueError:
+        return ""
+
+
+def _clean_text(text: str) -> str:
+    """
+    Fix text the same as feedparser: UTF-8 that was decoded as ISO-8859-1, and Win-1252 characters.
+    """
+    try:
+        text = text.encode("iso-8859-1").decode("utf-8")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    return text.translate(_cp1252)
+
+
+def _map_content_type(content_type: str) -> str:
+    content_type = content_type.lower()
+    if content_type in ("text", "plain"):
+        return "text/plain"
+    if content_type == "html":
+        return "text/html"
+    if content_type == "xhtml":
+        return "application/xhtml+xml"
+    return content_type
+
+
+def _is_base64(attrs: Dict[str, str], content_type: str) -> bool:
+    if attrs.get("mode", "") == "base64":
+        return True
+    return not (
+        content_type.startswith("text/")
+        or content_type.endswith("+xml")
+        or content_type.endswith("/xml")
+    )
+
+
+class FeedSummarizer:
+    """
+    Streaming expat parser of only the XML feed values that are used in a FeedSummary: the version,
+    the feed title, description, links and updated date, the namespaces, and the dates and enclosures
+    of each entry.
+
+    Follows the same rules as the feedparser strict parser for these values, so the results have the
+    same values in the same FeedParserDict structure as feedparser.parse(). Other elements of the feed
+    are only recorded by name, and other elements of the entries are skipped, so entry content isn't
+    sanitized and its relative URIs aren't resolved.
+
+    Raises UnsupportedFeed for malformed documents, and for the few uncommon structures in which
+    the feedparser values depend on sanitized HTML or on parser quirks, such as markup in the feed title.
+
+    Each FeedSummarizer parses one document.
+    """
+
+    def __init__(self, baseuri: str = "", baselang: Optional[str] = None):
+        """
+        :param baseuri: Base URI of the document, from the Content-Location header
+        :param baselang: Language of the document, from the Content-Language header
+        """
+        self.baseuri: str = baseuri or ""
+        self.baselang = baselang
+        self.version: str = ""
+        self.feed = FeedParserDict()
+        self.entries: List[FeedParserDict] = []
+        self.namespaces_in_use: Dict[str, str] = {}
+        # Standard prefixes of known namespaces, by declared prefix.
+        self._namespacemap: Dict[Optional[str], str] = {}
+        # Element names and handlers by expat name, cleared when a namespace is declared.
+        self._names: Dict[str, tuple] = {}
+        # xlink namespace declarations, which feedparser adds to the attributes of the next element.
+        self._decls: Dict[str, str] = {}
+        # Base URIs joined with xml:base values.
+        self._joined: Dict[Tuple[str, str], str] = {}
+        self._basestack: List[str] = []
+        self._depth = 0
+        self._infeed = False
+        self._inentry = False
+        self._inimage = False
+        self._intextinput = False
+        self._insource = False
+        self._incontent = False
+        # Type of the content element being parsed. None once it has ended.
+        self._content_type: Optional[str] = None
+        # Content element being parsed, as a tuple of (element name, context it is stored in, is base64).
+        self._content: Optional[tuple] = None
+        self._has_content = False
+        self._summary_key: Optional[str] = None
+        # Possible depths of the last title with a value. More than one if a title had markup,
+        # as it could be empty once sanitized.
+        self._title_depths: Set[int] = {-1}
+        self._feed_has_image = False
+        self._feed_has_textinput = False
+        # Whether the feed has elements that feedparser may store values of.
+        self._feed_has_other = False
+        # Contexts that have a summary value.
+        self._summaries: Set[int] = set()
+        # Depths of the dates of the current entry.
+        self._entry_date_depths: Dict[str, int] = {}
+        # Name of the date being parsed.
+        self._date: Optional[str] = None
+        # Text of the value being parsed, or None.
+        self._text: Optional[List[str]] = None
+        # Whether the value being parsed may have inline markup elements.
+        self._text_inline = False
+        # Whether the value being parsed has had inline markup elements.
+        self._text_has_inline = False
+
+    def parse(self, data: bytes) -> None:
+        """
+        Parse a UTF-8 XML document.
+
+        :param data: XML document, as converted to UTF-8 by feedparser
+        :raises UnsupportedFeed: If the document should be parsed by feedparser
+        """
+        parser = expat.ParserCreate(None, " ")
+        parser.namespace_prefixes = True
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.data
+        parser.StartNamespaceDeclHandler = self.start_namespace
+        # Skip external entities, as the feedparser SAX parser does.
+        parser.ExternalEntityRefHandler = lambda *args: 1
+        parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_UNLESS_STANDALONE)
+        try:
+            parser.Parse(data, True)
+        except expat.ExpatError as e:
+            raise UnsupportedFeed(f"Malformed XML: {e}") from e
+        if not self.feed and self._feed_has_other:
+            raise UnsupportedFeed("Feed may only have values of other elements")
+
+    def context(self) -> int:
+        """
+        Get the context that values are stored in, the same as feedparser.
+        """
+        if self._insource:
+            return SOURCE
+        if self._inimage and self._feed_has_image:
+            return IMAGE
+        if self._intextinput:
+            return TEXTINPUT
+        if self._inentry:
+            return ENTRY
+        return FEED
+
+    def start_namespace(self, prefix: Optional[str], uri: str) -> None:
+        if not uri:
+            return
+        self._names.clear()
+        loweruri = uri.lower()
+        if not self.version:
+            if prefix is None and loweruri == "http://my.netscape.com/rdf/simple/0.9/":
+                self.version = "rss090"
+            elif loweruri == "http://purl.org/rss/1.0/":
+                self.version = "rss10"
+            elif loweruri == "http://www.w3.org/2005/atom":
+                self.version = "atom10"
+        if "backend.userland.com/rss" in loweruri:
+            uri = loweruri = "http://backend.userland.com/rss"
+        if loweruri in _namespaces:
+            self._namespacemap[prefix] = _namespaces[loweruri]
+            self.namespaces_in_use[_namespaces[loweruri]] = uri
+        else:
+            self.namespaces_in_use[prefix or ""] = uri
+        if prefix and uri == "http://www.w3.org/1999/xlink":
+            self._decls["xmlns:" + prefix] = uri
+
+    def _names_of(self, name: str) -> tuple:
+        """
+        Get the names of an element, as feedparser names them, and its handler methods.
+
+        :param name: expat element name, of its namespace URI, local name and prefix
+        :return: Tuple of (element name, handler name, has a namespace prefix, start handler, end handler)
+        """
+        names = self._names.get(name)
+        if names:
+            return names
+
+        parts = name.split(" ")
+        namespace = parts[0] if len(parts) > 1 else None
+        localname = parts[1] if namespace else parts[0]
+        lowernamespace = (namespace or "").lower()
+        if "backend.userland.com/rss" in lowernamespace:
+            namespace = lowernamespace = "http://backend.userland.com/rss"
+
+        tag = localname
+        prefix = _namespaces.get(lowernamespace)
+        if prefix:
+            tag = prefix + ":" + localname
+        elif namespace:
+            for key, value in self.namespaces_in_use.items():
+                if key and value == namespace:
+                    tag = key + ":" + localname
+                    break
+        tag = tag.lower()
+
+        prefix, suffix = tag.split(":", 1) if ":" in tag else ("", tag)
+        prefix = self._namespacemap.get(prefix, prefix)
+        handler = prefix + "_" + suffix if prefix else suffix
+        names = (
+            tag,
+            handler,
+            bool(prefix),
+            getattr(self, "_start_" + handler, None),
+            getattr(self, "_end_" + handler, None),
+        )
+        self._names[name] = names
+        return names
+
+    def _attributes(self, attrs: Dict[str, str]) -> Dict[str, str]:
+        """
+        Get the attributes of an element with the names and values that feedparser gives them.
+        """
+        result = self._decls
+        self._decls = {}
+        qnames = []
+        for name, value in attrs.items():
+            parts = name.split(" ")
+            if len(parts) == 1:
+                key = qname = name
+            else:
+                prefix = _namespaces.get(parts[0].lower(), "")
+                key = prefix + ":" + parts[1] if prefix else parts[1]
+                qname = parts[2] + ":" + parts[1] if len(parts) == 3 else parts[1]
+            result[key.lower()] = value
+            qnames.append((qname.lower(), value))
+        result.update(qnames)
+        for key in ("rel", "type"):
+            if key in result:
+                result[key] = result[key].lower()
+        return result
+
+    def _join_base(self, base: str) -> str:
+        """
+        Get the base URI of an element, the same as feedparser.
+
+        :param base: xml:base of the element, or the current base URI
+        """
+        key = (self.baseuri, base)
+        joined = self._joined.get(key)
+        if joined is None:
+            if self.baseuri:
+                joined = make_safe_absolute_uri(self.baseuri, base) or self.baseuri
+            else:
+                joined = _urljoin(self.baseuri, base)
+            self._joined[key] = joined
+        return joined
+
+    def data(self, text: str) -> None:
+        if self._text is not None:
+            self._text.append(text)
+
+    def start(self, name: str, attrs: Dict[str, str]) -> None:
+        self._depth += 1
+        tag, handler, has_prefix, start_handler, _ = self._names_of(name)
+        attrs = self._attributes(attrs) if attrs or self._decls else {}
+
+        base = attrs.get("xml:base", attrs.get("base")) or self.baseuri
+        self.baseuri = self._join_base(base)
+        self._basestack.append(self.baseuri)
+
+        if tag in ("feed", "rss"):
+            lang = attrs.get("xml:lang", attrs.get("lang"))
+            if lang is None:
+                lang = self.baselang
+            if lang:
+                self.feed["language"] = lang.replace("_", "-")
+
+        # Child elements of content are inline markup, unless the content type is XML.
+        if self._incontent and not (self._content_type or "xml").endswith("xml"):
+            if tag in ("xhtml:div", "div"):
+                self._start_inline(handler, start_handler)
+                return
+            self._content_type = "application/xhtml+xml"
+        if self._incontent and self._content_type == "application/xhtml+xml":
+            self._start_inline(handler, start_handler)
+            return
+
+        if self._text is not None:
+            raise UnsupportedFeed(f"{tag} element in a summarized value")
+
+        # As feedparser, which resets these for elements that aren't expected in an image or textinput.
+        if not has_prefix and tag not in ("title", "link", "description", "name"):
+            self._intextinput = False
+        if not has_prefix and tag not in (
+            "title",
+            "link",
+            "description",
+            "url",
+            "href",
+            "width",
+            "height",
+        ):
+            self._inimage = False
+
+        if not start_handler:
+            self._start_other(handler, attrs)
+        elif self._incontent:
+            raise UnsupportedFeed(f"{tag} element in content")
+        else:
+            start_handler(attrs)
+
+    def end(self, name: str) -> None:
+        tag, _, _, _, end_handler = self._names_of(name)
+        if end_handler:
+            end_handler()
+
+        if self._incontent and not (self._content_type or "xml").endswith("xml"):
+            if tag in ("xhtml:div", "div"):
+                # feedparser doesn't end the scope of a div in escaped markup.
+                return
+            self._content_type = "application/xhtml+xml"
+
+        self._basestack.pop()
+        if self._basestack and self._basestack[-1]:
+            self.baseuri = self._basestack[-1]
+        self._depth -= 1
+
+    def _start_inline(self, handler: str, start_handler: Optional[Callable]) -> None:
+        """
+        Check an element of inline markup in content, which feedparser only calls the end handler of.
+        """
+        if start_handler:
+            raise UnsupportedFeed(f"{handler} element in content")
+        if handler in _feedparser_elements and self.context() == FEED:
+            self._feed_has_other = True
+        if self._text is not None:
+            if not self._text_inline:
+                raise UnsupportedFeed("Markup in a summarized value")
+            self._text_has_inline = True
+
+    def _start_other(self, handler: str, attrs: Dict[str, str]) -> None:
+        """
+        Record the name of an element that is stored in the feed, with its value or attributes.
+        """
+        if handler in ("links", "enclosures"):
+            raise UnsupportedFeed(f"{handler} element")
+        if self.context() != FEED:
+            return
+        if handler in _feedparser_elements:
+            self._feed_has_other = True
+        elif attrs or self._infeed:
+            self.feed.setdefault(handler, None)
+
+    def _collect_text(self, inline: bool = False) -> None:
+        self._text = []
+        self._text_inline = inline
+        self._text_has_inline = False
+
+    def _pop_text(self) -> str:
+        text = "".join(self._text).strip()
+        self._text = None
+        return text
+
+    def _start_rss(self, attrs: Dict[str, str]) -> None:
+        if not self.version.startswith("rss"):
+            version = attrs.get("version", "")
+            self.version = {
+                "0.91": "rss091u",
+                "0.92": "rss092",
+                "0.93": "rss093",
+                "0.94": "rss094",
+            }.get(version) or ("rss20" if version.startswith("2.") else "rss")
+
+    def _start_feed(self, attrs: Dict[str, str]) -> None:
+        self._infeed = True
+        if not self.version:
+            self.version = {"0.1": "atom01", "0.2": "atom02", "0.3": "atom03"}.get(
+                attrs.get("version"), "atom"
+            )
+
+    def _start_channel(self, attrs: Dict[str, str]) -> None:
+        self._infeed = True
+        self._cdf_common(attrs)
+
+    def _end_channel(self) -> None:
+        self._infeed = False
+
+    _end_feed = _end_channel
+
+    def _cdf_common(self, attrs: Dict[str, str]) -> None:
+        if "lastmod" in attrs:
+            self._store_date("updated", attrs["lastmod"])
+        if "href" in attrs:
+            self._add_link(self.context(), {"rel": "alternate"})
+
+    def _start_item(self, attrs: Dict[str, str]) -> None:
+        self.entries.append(FeedParserDict())
+        self._entry_date_depths = {}
+        self._inentry = True
+        self._title_depths = {-1}
+        self._summaries.discard(ENTRY)
+        self._cdf_common(attrs)
+
+    def _end_item(self) -> None:
+        self._inentry = False
+        self._has_content = False
+
+    _start_entry = _start_item
+    _end_entry = _end_item
+
+    def _start_image(self, attrs: Dict[str, str]) -> None:
+        if not self._inentry and self.context() == FEED:
+            self._feed_has_image = True
+            self.feed.setdefault("image", None)
+        self._inimage = True
+        self._title_depths = {-1}
+
+    def _end_image(self) -> None:
+        self._inimage = False
+
+    def _start_itunes_image(self, attrs: Dict[str, str]) -> None:
+        if (attrs.get("href") or attrs.get("url")) and self.context() == FEED:
+            self._feed_has_image = True
+            self.feed.setdefault("image", None)
+
+    _start_itunes_link = _start_itunes_image
+
+    def _start_textinput(self, attrs: Dict[str, str]) -> None:
+        if self.context() == FEED:
+            self._feed_has_textinput = True
+            self.feed.setdefault("textinput", None)
+        elif not self._feed_has_textinput:
+            # feedparser fails to store the values of a textinput outside of the feed.
+            raise UnsupportedFeed("textinput element outside of the feed")
+        self._intextinput = True
+        self._title_depths = {-1}
+
+    def _end_textinput(self) -> None:
+        self._intextinput = False
+
+    def _start_source(self, attrs: Dict[str, str]) -> None:
+        self._insource = True
+        self._title_depths = {-1}
+
+    def _end_source(self) -> None:
+        self._insource = False
+        self._summaries.discard(SOURCE)
+        if self.context() == FEED:
+            self.feed.setdefault("source", None)
+
+    def _start_svg(self, attrs: Dict[str, str]) -> None:
+        raise UnsupportedFeed("svg element")
+
+    _start_math = _start_svg
+
+    def _push_content(
+        self,
+        element: str,
+        attrs: Dict[str, str],
+        default_type: str,
+        expecting_text: bool,
+    ) -> None:
+        """
+        Start a content element, which may contain escaped or inline markup.
+
+        :param element: Name of the value, e.g. "title"
+        :param attrs: Element attributes
+        :param default_type: Content type if the element has no type attribute
+        :param expecting_text: Whether the value is stored
+        """
+        self._incontent = True
+        self._content_type = content_type = _map_content_type(
+            attrs.get("type", default_type)
+        )
+        context = None
+        if expecting_text:
+            if self._inentry and not self._insource:
+                context = ENTRY
+            elif self._infeed or self._insource:
+                context = self.context()
+        is_base64 = _is_base64(attrs, content_type)
+        self._content = (element, context, is_base64)
+
+        if context == FEED and element in _feed_values:
+            if is_base64 or content_type == "application/xhtml+xml":
+                raise UnsupportedFeed(f"Feed {element} of type {content_type}")
+            self._collect_text()
+        elif element == "title":
+            self._collect_text(inline=True)
+
+    def _pop_content(self) -> Tuple[Optional[str], bool]:
+        """
+        End a content element, and store its value.
+
+        :return: Tuple of (value, whether the value is certain), where the value is only returned for titles
+            and the feed values, and may not be certain for titles with markup.
+        """
+        element, context, is_base64 = self._content
+        content_type = self._content_type
+        self._content = self._content_type = None
+        self._incontent = False
+        if self._text is None:
+            value = None
+            certain = True
+        elif context == FEED and element in _feed_values:
+            value = self._pop_text()
+            if not self.version.startswith("atom") and content_type == "text/plain":
+                if _html_like_regex.search(value):
+                    raise UnsupportedFeed(f"Feed {element} may be HTML")
+            elif content_type in _html_types and _markup_regex.search(value):
+                raise UnsupportedFeed(f"Feed {element} is HTML")
+            value = _clean_text(value)
+            certain = True
+        else:
+            value = self._pop_text()
+            # An empty title is stored as is, but a title may be empty once feedparser sanitizes its markup.
+            certain = (
+                context is None
+                or not value
+                or not (
+                    is_base64 or self._text_has_inline or _markup_regex.search(value)
+                )
+            )
+
+        if context is None or (element == "title" and self._skip_title()):
+            return value, certain
+        if element == "description":
+            element = "summary" if context == ENTRY else "subtitle"
+        if element == "summary":
+            self._summaries.add(context)
+        if context == FEED:
+            self.feed[element] = value
+        return value, certain
+
+    def _skip_title(self) -> bool:
+        """
+        Check whether a title isn't stored as a title with a value has already been found, as feedparser does.
+        """
+        skip = {-1 < depth <= self._depth for depth in self._title_depths}
+        if len(skip) > 1:
+            raise UnsupportedFeed("Title depends on sanitized markup")
+        return skip.pop()
+
+    def _start_title(self, attrs: Dict[str, str]) -> None:
+        self._push_content(
+            "title",
+            attrs,
+            "text/plain",
+            self._infeed or self._inentry or self._insource,
+        )
+
+    def _end_title(self) -> None:
+        value, certain = self._pop_content()
+        if certain:
+            if value:
+                self._title_depths = {self._depth}
+        else:
+            self._title_depths.add(self._depth)
+
+    _start_dc_title = _start_title
+    _end_dc_title = _end_title
+    _start_media_title = _start_title
+
+    def _end_media_title(self) -> None:
+        title_depths = self._title_depths
+        self._end_title()
+        self._title_depths = title_depths
+
+    def _start_subtitle(self, attrs: Dict[str, str]) -> None:
+        self._push_content("subtitle", attrs, "text/plain", True)
+
+    def _end_subtitle(self) -> None:
+        self._pop_content()
+
+    _start_tagline = _start_itunes_subtitle = _start_subtitle
+    _end_tagline = _end_itunes_subtitle = _end_subtitle
+
+    def _start_rights(self, attrs: Dict[str, str]) -> None:
+        self._push_content("rights", attrs, "text/plain", True)
+
+    _start_copyright = _start_dc_rights = _start_rights
+    _end_rights = _end_copyright = _end_dc_rights = _end_subtitle
+
+    def _start_info(self, attrs: Dict[str, str]) -> None:
+        self._push_content("info", attrs, "text/plain", True)
+
+    _start_feedburner_browserfriendly = _start_info
+    _end_info = _end_feedburner_browserfriendly = _end_subtitle
+
+    def _start_description(self, attrs: Dict[str, str]) -> None:
+        if self.context() in self._summaries and not self._has_content:
+            self._summary_key = "content"
+            self._start_content(attrs)
+        else:
+            self._push_content(
+                "description",
+                attrs,
+                "text/html",
+                self._infeed or self._inentry or self._insource,
+            )
+
+    def _start_abstract(self, attrs: Dict[str, str]) -> None:
+        self._push_content(
+            "description",
+            attrs,
+            "text/plain",
+            self._infeed or self._inentry or self._insource,
+        )
+
+    def _end_description(self) -> None:
+        if self._summary_key == "content":
+            self._end_content()
+        else:
+            self._pop_content()
+        self._summary_key = None
+
+    _start_dc_description = _start_media_description = _start_description
+    _end_abstract = _end_dc_description = _end_media_description = _end_description
+
+    def _start_summary(self, attrs: Dict[str, str]) -> None:
+        if self.context() in self._summaries and not self._has_content:
+            self._summary_key = "content"
+            self._start_content(attrs)
+        else:
+            self._summary_key = "summary"
+            self._push_content("summary", attrs, "text/plain", True)
+
+    _end_summary = _end_description
+    _start_itunes_summary = _start_summary
+    _end_itunes_summary = _end_description
+
+    def _start_content(
+        self, attrs: Dict[str, str], default_type: str = "text/plain"
+    ) -> None:
+        self._check_content()
+        self._has_content = True
+        self._push_content("content", attrs, default_type, True)
+
+    def _check_content(self) -> None:
+        if self.context() == FEED and FEED not in self._summaries:
+            # The content of the feed would be its summary, once sanitized.
+            raise UnsupportedFeed("Content element in the feed")
+
+    def _end_content(self) -> None:
+        content_type = self._content_type or ""
+        self._pop_content()
+        if content_type == "text/plain" or content_type in _html_types:
+            # The content is copied to the summary if there is none.
+            self._summaries.add(self.context())
+
+    def _start_body(self, attrs: Dict[str, str]) -> None:
+        self._check_content()
+        self._push_content("content", attrs, "application/xhtml+xml", True)
+
+    def _start_content_encoded(self, attrs: Dict[str, str]) -> None:
+        self._start_content(attrs, "text/html")
+
+    _start_xhtml_body = _start_body
+    _start_fullitem = _start_content_encoded
+    _end_body = _end_xhtml_body = _end_content_encoded = _end_fullitem = _end_content
+
+    def _add_link(self, context: int, attrs: Dict[str, str]) -> None:
+        if context == FEED:
+            self.feed.setdefault("links", []).append(FeedParserDict(attrs))
+        elif context == ENTRY and attrs["rel"] == "enclosure":
+            # Only the enclosures of entries are used.
+            self.entries[-1].setdefault("links", []).append(FeedParserDict(attrs))
+
+    @staticmethod
+    def _enforce_href(attrs: Dict[str, str]) -> Dict[str, str]:
+        href = attrs.get("url", attrs.get("uri", attrs.get("href")))
+        if href:
+            attrs.pop("url", None)
+            attrs.pop("uri", None)
+            attrs["href"] = href
+        return attrs
+
+    def _start_link(self, attrs: Dict[str, str]) -> None:
+        attrs.setdefault("rel", "alternate")
+        context = self.context()
+        attrs = self._enforce_href(attrs)
+        if "href" in attrs:
+            attrs["href"] = _urljoin(self.baseuri or "", attrs["href"])
+        if not (self._inentry and self._inimage):
+            self._add_link(context, attrs)
+        if "href" not in attrs:
+            # The href of the link is its text, which feedparser sets on the last link of the context.
+            if context == FEED and self._infeed and attrs["rel"] in ("hub", "self"):
+                raise UnsupportedFeed("Feed link without href")
+            if self._inentry and self._inimage:
+                raise UnsupportedFeed("Link without href in an entry image")
+
+    def _start_enclosure(self, attrs: Dict[str, str]) -> None:
+        attrs = self._enforce_href(attrs)
+        attrs["rel"] = "enclosure"
+        self._add_link(self.context(), attrs)
+
+    def _start_date(self, name: str) -> None:
+        self._date = name
+        self._collect_text()
+
+    def _end_date(self) -> None:
+        self._store_date(self._date, self._pop_text())
+
+    def _store_date(self, name: str, value: str) -> None:
+        """
+        Store a date of the feed or the current entry, as feedparser does.
+
+        :param name: "published" or "updated"
+        :param value: Date string
+        """
+        value = _clean_text(value.strip())
+        if self._inentry and not self._insource:
+            # The date nearest to the entry element is used.
+            depth = self._entry_date_depths.get(name)
+            if depth is None or self._depth <= depth:
+                self._entry_date_depths[name] = self._depth
+                self.entries[-1][name] = value
+        elif self._infeed and self.context() == FEED:
+            self.feed[name] = value
+        if self.context() == FEED:
+            self.feed.setdefault(name + "_parsed", None)
+
+    def _start_published(self, attrs: Dict[str, str]) -> None:
+        self._start_date("published")
+
+    def _start_updated(self, attrs: Dict[str, str]) -> None:
+        self._start_date("updated")
+
+    _start_issued = _start_pubdate = _start_dcterms_issued = _start_published
+    _start_modified = _start_lastbuilddate = _start_updated
+    _start_dc_date = _start_dcterms_modified = _start_updated
+    _end_published = _end_issued = _end_pubdate = _end_dcterms_issued = _end_date
+    _end_updated = _end_modified = _end_lastbuilddate = _end_date
+    _end_dc_date = _end_dcterms_modified = _end_date
+
+
+def summarize_feed(data: bytes, headers: Dict[str, str]) -> FeedParserDict:
+    """
+    Parse only the values of an XML feed that are used in a FeedSummary, with a FeedSummarizer.
+
+    :param data: XML feed
+    :param headers: Response headers, with lowercase names
+    :return: FeedParserDict with the same bozo, feed, entries, version and namespaces values as feedparser.parse()
+    :raises UnsupportedFeed: If the feed should be parsed by feedparser
+    """
+    result = FeedParserDict(bozo=False, entries=[], feed=FeedParserDict(), headers={})
+    if not data:
+        return result
+
+    result["headers"].update(headers or {})
+    data = convert_to_utf8(result["headers"], data, result)
+    if not result["encoding"]:
+        # feedparser parses documents of unknown encoding as HTML.
+        raise UnsupportedFeed("Unknown character encoding")
+    version, data, _ = replace_doctype(data)
+
+    contentloc = result["headers"].get("content-location", "")
+    baseuri = make_safe_absolute_uri("", contentloc) or make_safe_absolute_uri(
+        contentloc
+    )
+    baselang = result["headers"].get("content-language")
+    if isinstance(baselang, bytes):
+        baselang = baselang.decode("utf-8", "ignore")
+
+    summarizer = FeedSummarizer(baseuri, baselang)
+    summarizer.parse(data)
+    result["feed"] = summarizer.feed
+    result["entries"] = summarizer.entries
+    result["version"] = version or summarizer.version
+    result["namespaces"] = summarizer.namespaces_in_use
+    return result
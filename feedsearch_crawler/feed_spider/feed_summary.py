@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class FeedSummary:
+    """
+    Compact summary of a parsed XML feed, holding only the values used to create a FeedInfo.
+
+    Small enough to be returned cheaply from a thread or process Executor instead of the full parsed feed.
+    """
+
+    version: str = ""
+    title: str = ""
+    description: Optional[str] = None
+    # WebSub hub urls found in the feed links.
+    hubs: List[str] = field(default_factory=list)
+    # WebSub self url found in the feed links.
+    self_url: str = ""
+    item_count: int = 0
+    is_podcast: bool = False
+    # Set to 1 if the feed data is not well formed.
+    bozo: int = 0
+    # Updated or published dates of the feed entries, excluding dates in the future.
+    entry_dates: List[datetime] = field(default_factory=list)
+    # Updated date of the feed itself.
+    updated: str = ""
@@ -0,0 +1,267 @@
+from dataclasses import dataclass, field
+from functools import partial
+from html.parser import HTMLParser
+from typing import Callable, List, Dict, Optional, Tuple
+
+import bs4
+from bs4.dammit import UnicodeDammit
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+@dataclass
+class HtmlPage:
+    """
+    Compact result of parsing an HTML page, holding only the values used by the Spider.
+
+    Small enough to be returned cheaply from a thread or process Executor instead of a full DOM.
+    """
+
+    # Attributes of each tag with an href, as dicts with "tag", "href", and optional "type" and "rel" keys.
+    links: List[Dict[str, str]] = field(default_factory=list)
+    # Content of the first meta tag with each property, keyed by property.
+    meta: Dict[str, str] = field(default_factory=dict)
+    # Text of the first title tag.
+    title: Optional[str] = None
+
+    def find_link(self, rel: str) -> Optional[Dict[str, str]]:
+        """
+        Find the first link tag with a matching rel value.
+
+        The rel value matches either the whole rel attribute or any one of its space separated values.
+
+        :param rel: rel attribute value, e.g. "canonical"
+        :return: Link attributes dict, or None
+        """
+        for link in self.links:
+            if link["tag"] != "link":
+                continue
+            link_rel = link.get("rel")
+            if link_rel and (link_rel == rel or rel in link_rel.split()):
+                return link
+        return None
+
+
+class HtmlPageBuilder:
+    """
+    Collects the values of an HtmlPage from a stream of parser events, without building a DOM.
+
+    Has the parser target interface of lxml, so may be passed directly as the target of an lxml HTMLParser.
+    """
+
+    def __init__(self):
+        self.page = HtmlPage()
+        # Whether the end of the head, or the start of the body, has been parsed.
+        self.head_closed: bool = False
+        # Text parts of the first title tag, while it is being parsed.
+        self._title: Optional[List[str]] = None
+
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        """
+        Handle a start tag.
+
+        :param tag: Lowercase tag name
+        :param attrs: Tag attributes, with empty strings for attributes without a value
+        """
+        href = attrs.get("href")
+        if href is not None:
+            link = {"tag": tag, "href": href}
+            link_type = attrs.get("type")
+            if link_type:
+                link["type"] = link_type
+            rel = attrs.get("rel")
+            if rel:
+                rel = " ".join(rel.split())
+                if rel:
+                    link["rel"] = rel
+            self.page.links.append(link)
+
+        if tag == "meta":
+            prop = attrs.get("property")
+            if prop is not None:
+                self.page.meta.setdefault(prop, attrs.get("content") or "")
+        elif tag == "title" and self.page.title is None and self._title is None:
+            self._title = []
+        elif tag == "body":
+            self.head_closed = True
+
+    def end(self, tag: str) -> None:
+        if tag == "title" and self._title is not None:
+            self.page.title = "".join(self._title)
+            self._title = None
+        elif tag == "head":
+            self.head_closed = True
+
+    def data(self, text: str) -> None:
+        if self._title is not None:
+            self._title.append(text)
+
+    def close(self) -> HtmlPage:
+        # An unclosed title contains the rest of the text of the page.
+        self.end("title")
+        return self.page
+
+
+class HtmlPageExtractor(HTMLParser):
+    """
+    Streaming stdlib HTML parser that collects the values of an HtmlPage in a single pass over the tags.
+
+    Uses the same parser as the BeautifulSoup "html.parser" tree builder, so finds the same values.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.builder = HtmlPageBuilder()
+
+    @property
+    def page(self) -> HtmlPage:
+        return self.builder.page
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # Later duplicate attributes replace earlier ones, and attributes without a value are empty.
+        self.builder.start(tag, {name: value or "" for name, value in attrs})
+
+    def handle_endtag(self, tag: str) -> None:
+        self.builder.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.builder.data(data)
+
+    def close(self) -> None:
+        super().close()
+        self.builder.close()
+
+
+def decode_html(data: bytes, encoding: str) -> str:
+    """
+    Decode HTML content, detecting the encoding as BeautifulSoup does if the given encoding doesn't work.
+
+    :param data: HTML content as bytes
+    :param encoding: Character encoding of the content
+    :return: HTML content as string
+    """
+    if encoding:
+        try:
+            return data.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return UnicodeDammit(data, [encoding] if encoding else []).unicode_markup or ""
+
+
+def extract_html_page(data: bytes, encoding: str) -> HtmlPage:
+    """
+    Extract an HtmlPage from HTML content in a single streaming pass.
+
+    :param data: HTML content as bytes
+    :param encoding: Character encoding of the content
+    :return: HtmlPage
+    """
+    extractor = HtmlPageExtractor()
+    extractor.feed(decode_html(data, encoding))
+    extractor.close()
+    return extractor.page
+
+
+def extract_html_page_lxml(data: bytes, encoding: str) -> HtmlPage:
+    """
+    Extract an HtmlPage from HTML content in a single streaming pass of the lxml HTML parser.
+
+    :param data: HTML content as bytes
+    :param encoding: Character encoding of the content
+    :return: HtmlPage
+    """
+    parser = etree.HTMLParser(target=HtmlPageBuilder())
+    parser.feed(decode_html(data, encoding))
+    return parser.close()
+
+
+def parse_html_soup(
+    data: bytes, encoding: str, htmlparser: str = "html.parser"
+) -> HtmlPage:
+    """
+    Parse HTML content into an HtmlPage by building a BeautifulSoup tree.
+
+    :param data: HTML content as bytes
+    :param encoding: Character encoding of the content
+    :param htmlparser: BeautifulSoup tree builder name, e.g. "html5lib"
+    :return: HtmlPage
+    """
+    soup = bs4.BeautifulSoup(data, htmlparser, from_encoding=encoding)
+    page = HtmlPage()
+
+    for tag in soup.find_all(href=True):
+        link = {"tag": tag.name, "href": tag.get("href")}
+        link_type = tag.get("type")
+        if link_type:
+            link["type"] = link_type
+        rel = tag.get("rel")
+        if rel:
+            link["rel"] = " ".join(rel) if isinstance(rel, list) else rel
+        page.links.append(link)
+
+    for tag in soup.find_all(name="meta", property=True):
+        page.meta.setdefault(tag.get("property"), tag.get("content") or "")
+
+    title = soup.find(name="title")
+    if title:
+        page.title = title.text
+
+    return page
+
+
+# HTML parser backends, keyed by name. Each is a function taking HTML content as bytes and
+# its character encoding, and returning an HtmlPage.
+html_parsers: Dict[str, Callable[[bytes, str], HtmlPage]] = {}
+
+
+def register_html_parser(name: str, parser: Callable[[bytes, str], HtmlPage]) -> None:
+    """
+    Register an HTML parser backend, to be selected by name with the Spider htmlparser option.
+
+    Backends run in the Crawler Executor, so must be picklable module level functions if the
+    Executor is a process pool.
+
+    :param name: Backend name
+    :param parser: Function taking HTML content as bytes and its character encoding, and returning an HtmlPage
+    """
+    html_parsers[name] = parser
+
+
+def get_html_parser(name: str) -> Callable[[bytes, str], HtmlPage]:
+    """
+    Get an HTML parser backend by name.
+    Names that aren't registered are used as BeautifulSoup tree builder names, e.g. "html5lib".
+
+    :param name: Backend name
+    :return: Function taking HTML content as bytes and its character encoding, and returning an HtmlPage
+    """
+    parser = html_parsers.get(name)
+    if parser:
+        return parser
+    return partial(parse_html_soup, htmlparser=name)
+
+
+# Streaming stdlib parser, with the same results as the BeautifulSoup "html.parser" tree builder.
+register_html_parser("html.parser", extract_html_page)
+# BeautifulSoup tree with the stdlib parser.
+register_html_parser("bs4", parse_html_soup)
+if etree:
+    # Streaming lxml parser, usually the fastest if lxml is installed.
+    register_html_parser("lxml", extract_html_page_lxml)
+
+
+def parse_html_page(data: bytes, encoding: str, htmlparser: str) -> HtmlPage:
+    """
+    Parse HTML content into an HtmlPage.
+
+    Runs in the Crawler Executor, so takes raw bytes and returns only the compact HtmlPage.
+
+    :param data: HTML content as bytes
+    :param encoding: Character encoding of the content
+    :param htmlparser: HTML parser backend name, or BeautifulSoup tree builder name. See get_html_parser().
+    :return: HtmlPage
+    """
+    return get_html_parser(htmlparser)(data, encoding)
@@ -5,6 +5,8 @@ from typing import Union, List
 from dateutil import tz, parser
 from yarl import URL
 
+from feedsearch_crawler.feed_spider.feed_info import FeedInfo
+
 
 class ParseTypes:
     JSON = "json"
@@ -101,3 +103,15 @@ def create_content_type(parse_type: str, encoding: str, content_type: str) -> st
         ctype = "application/xml"
 
     return f"{ctype}; charset={encoding}".lower()
+
+
+def sort_urls(feeds: List[FeedInfo]) -> List[FeedInfo]:
+    """
+    Sort list of feeds based on Url score
+
+    :param feeds: List of FeedInfo objects
+    :return: List of FeedInfo objects sorted by score
+    """
+    feeds = [f for f in feeds if isinstance(f, FeedInfo)]
+    sorted_urls = sorted(list(set(feeds)), key=lambda x: x.score, reverse=True)
+    return sorted_urls
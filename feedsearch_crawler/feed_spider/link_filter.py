@@ -1,17 +1,17 @@
+import heapq
 import logging
-import pathlib
 import re
-from typing import Optional, Tuple, List
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Optional, Tuple, List, Dict, Iterable, Set
 
-import bs4
-from w3lib.url import url_query_cleaner
 from yarl import URL
 
 from feedsearch_crawler.crawler import Response, Request
 from feedsearch_crawler.crawler.lib import parse_href_to_url
+from feedsearch_crawler.crawler.queueable import Queueable
 from feedsearch_crawler.feed_spider.regexes import (
-    feedlike_regex,
-    podcast_regex,
+    feedlike_podcast_regex,
     author_regex,
     date_regex,
 )
@@ -65,92 +65,204 @@ low_priority_urls: List[str] = [
 feed_link_types: List[str] = ["application/json", "rss", "atom", "rdf"]
 
 
+# Invalid filetypes, for constant time lookup.
+_invalid_filetypes = frozenset(invalid_filetypes)
+
+# Regexes that find any of the strings of each list in one pass, searched in a lowercase string.
+_invalid_url_contents_regex = re.compile("|".join(map(re.escape, invalid_url_contents)))
+_low_priority_urls_regex = re.compile("|".join(map(re.escape, low_priority_urls)))
+
 logger = logging.getLogger(__name__)
 
 
+def strip_query(url: str) -> str:
+    """
+    Remove the query string and fragment from a URL string. Equivalent to w3lib url_query_cleaner(url).
+
+    :param url: URL string
+    :return: URL string without query string or fragment
+    """
+    return url.partition("#")[0].partition("?")[0]
+
+
+def get_suffix(url: str) -> str:
+    """
+    Get the filetype extension of the last segment of a URL path, without the dot.
+    Equivalent to pathlib.Path(url).suffix.strip(".").
+
+    :param url: URL string without query string
+    :return: Extension string, or an empty string
+    """
+    name = next((part for part in reversed(url.split("/")) if part and part != "."), "")
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1:
+        return name[index + 1 :]
+    return ""
+
+
+def match_feedlike_podcast(string: str) -> Tuple[bool, bool]:
+    """
+    Check whether a string has feed-like words and podcast words, in one regex pass.
+
+    :param string: String to search
+    :return: Tuple of (has feed-like word, has podcast word)
+    """
+    is_feedlike = is_podcast = False
+    for match in feedlike_podcast_regex.finditer(string):
+        if match.lastgroup == "feed":
+            is_feedlike = True
+        else:
+            is_podcast = True
+    return is_feedlike, is_podcast
+
+
+def classify_link(
+    href: str, link_type: Optional[str] = None, full_crawl: bool = False
+) -> Optional[Tuple[URL, int]]:
+    """
+    Check that a link should be followed if it may contain feed information, and find its queue priority.
+
+    The decision only depends on the link, so may be cached for the whole crawl.
+
+    :param href: Link href
+    :param link_type: Link type attribute
+    :param full_crawl: Follow all valid links, not only those that look like they lead to feeds
+    :return: Tuple of (URL, priority), or None if the link shouldn't be followed
+    """
+    url: URL = parse_href_to_url(href)
+    if not url:
+        return None
+
+    # If the link may have a valid feed type then follow it regardless of the url text.
+    if (
+        link_type
+        and any(map(link_type.lower().count, feed_link_types))
+        and "json+oembed" not in link_type
+    ):
+        # A link with a possible feed type has the highest priority after callbacks.
+        return url, 2
+
+    is_feedlike_href, is_podcast_href = match_feedlike_podcast(strip_query(str(url)))
+    is_feedlike_querystring = is_podcast_querystring = False
+    if url.raw_query_string:
+        for key in url.query:
+            is_feedlike, is_podcast = match_feedlike_podcast(key)
+            is_feedlike_querystring = is_feedlike_querystring or is_feedlike
+            is_podcast_querystring = is_podcast_querystring or is_podcast
+
+    is_feedlike_url = is_feedlike_querystring or is_feedlike_href
+    is_podcast_url = is_podcast_href or is_podcast_querystring
+
+    if not full_crawl and not is_feedlike_url and not is_podcast_url:
+        return None
+
+    has_author_info: bool = LinkFilter.is_href_matching(href, author_regex)
+    is_low_priority: bool = LinkFilter.is_low_priority(href)
+
+    priority: int = Queueable.priority
+    # A low priority url should be fetched last.
+    if is_low_priority:
+        priority = Queueable.priority + 2
+    # Podcast pages are lower priority than authors or feeds.
+    if is_podcast_url:
+        priority = 5
+    # Potential author info has a medium priority.
+    if has_author_info:
+        priority = 4
+    # A feedlike url has high priority.
+    if is_feedlike_url:
+        priority = 3
+
+    # Validate the actual URL string.
+    follow = (
+        not LinkFilter.has_invalid_contents(href)
+        and LinkFilter.is_valid_filetype(href)
+        and not LinkFilter.has_invalid_querystring(url)
+    )
+    # If full_crawl then follow all valid URLs regardless of the feedlike quality of the URL.
+    # Otherwise only follow URLs if they look like they might contain feed information.
+    if follow and (full_crawl or is_feedlike_url or is_podcast_href):
+
+        # Remove the querystring unless it may point to a feed.
+        if not is_feedlike_querystring:
+            url = url.with_query(None)
+
+        return url, priority
+    return None
+
+
 class LinkFilter:
-    def __init__(self, response: Response, request: Request, full_crawl: bool = False):
+    # Number of link decisions cached by each classifier from create_classifier().
+    cache_size = 10000
+
+    def __init__(
+        self,
+        response: Response,
+        request: Request,
+        full_crawl: bool = False,
+        classifier: Callable[
+            [str, Optional[str], bool], Optional[Tuple[URL, int]]
+        ] = None,
+    ):
+        """
+        :param response: Response containing the links
+        :param request: Request of the Response
+        :param full_crawl: Follow all valid links, not only those that look like they lead to feeds
+        :param classifier: Optional memoized classify_link function from create_classifier(),
+            to share link decisions between the pages of a crawl.
+        """
         self.response = response
         self.request = request
         self.full_crawl = full_crawl
+        self.classify_link = classifier or classify_link
+
+    @classmethod
+    def create_classifier(
+        cls,
+    ) -> Callable[[str, Optional[str], bool], Optional[Tuple[URL, int]]]:
+        """
+        Create a classify_link function with a least recently used cache of link decisions,
+        as navigation and footer links repeat on every page of a site.
 
-    def should_follow_link(self, link: bs4.Tag) -> Optional[Tuple[URL, int]]:
+        :return: Memoized classify_link function
+        """
+        return lru_cache(maxsize=cls.cache_size)(classify_link)
+
+    def should_follow_link(self, link: Dict[str, str]) -> Optional[Tuple[URL, int]]:
         """
         Check that the link should be followed if it may contain feed information.
 
-        :param link: Link tag
-        :return: boolean
+        :param link: Link tag attributes
+        :return: Tuple of (URL, priority), or None
+        """
+        return self.classify_link(link.get("href"), link.get("type"), self.full_crawl)
+
+    def classify_many(
+        self, links: Iterable[Dict[str, str]], max_links: int = 0
+    ) -> List[Tuple[URL, int]]:
         """
-        href: str = link.get("href")
-        link_type: str = link.get("type")
+        Find the links of a page that should be followed, and their priorities.
 
-        url: URL = parse_href_to_url(href)
-        if not url:
-            return None
+        Links to the same URL are only returned once.
 
-        # If the link may have a valid feed type then follow it regardless of the url text.
-        if (
-            link_type
-            and any(map(link_type.lower().count, feed_link_types))
-            and "json+oembed" not in link_type
-        ):
-            # A link with a possible feed type has the highest priority after callbacks.
-            return url, 2
-
-        is_feedlike_href: bool = self.is_href_matching(str(url), feedlike_regex)
-        is_feedlike_querystring: bool = self.is_querystring_matching(
-            url, feedlike_regex
-        )
-
-        is_podcast_href: bool = self.is_href_matching(str(url), podcast_regex)
-        is_podcast_querystring: bool = self.is_querystring_matching(url, podcast_regex)
-
-        is_feedlike_url = is_feedlike_querystring or is_feedlike_href
-        is_podcast_url = is_podcast_href or is_podcast_querystring
-
-        if not self.full_crawl and not is_feedlike_url and not is_podcast_url:
-            return
-
-        # This check is deprecated, as it has been moved to the spider to prevent the crawling of any links
-        # from responses that are not the same as the original domain
-        #
-        # is_one_jump: bool = self.is_one_jump_from_original_domain(url, self.response)
-        # if not is_one_jump:
-        #     return
-
-        has_author_info: bool = self.is_href_matching(href, author_regex)
-        is_low_priority: bool = self.is_low_priority(href)
-
-        priority: int = Request.priority
-        # A low priority url should be fetched last.
-        if is_low_priority:
-            priority = Request.priority + 2
-        # Podcast pages are lower priority than authors or feeds.
-        if is_podcast_url:
-            priority = 5
-        # Potential author info has a medium priority.
-        if has_author_info:
-            priority = 4
-        # A feedlike url has high priority.
-        if is_feedlike_url:
-            priority = 3
-
-        # Validate the actual URL string.
-        follow = (
-            # is_one_jump
-            not self.has_invalid_contents(href)
-            and self.is_valid_filetype(href)
-            and not self.has_invalid_querystring(url)
-        )
-        # If full_crawl then follow all valid URLs regardless of the feedlike quality of the URL.
-        # Otherwise only follow URLs if they look like they might contain feed information.
-        if follow and (self.full_crawl or is_feedlike_url or is_podcast_href):
-
-            # Remove the querystring unless it may point to a feed.
-            if not is_feedlike_querystring:
-                url = url.with_query(None)
-
-            return url, priority
+        :param links: Link tag attributes of each link
+        :param max_links: Only return this many links with the highest priority, ordered by priority. 0 for no limit.
+        :return: List of Tuples of (URL, priority)
+        """
+        classify = self.classify_link
+        full_crawl = self.full_crawl
+        results: List[Tuple[URL, int]] = []
+        urls: Set[URL] = set()
+        for link in links:
+            values = classify(link.get("href"), link.get("type"), full_crawl)
+            if values and values[0] not in urls:
+                urls.add(values[0])
+                results.append(values)
+
+        if max_links and len(results) > max_links:
+            # Equivalent to a stable sort by priority, so links of equal priority stay in page order.
+            results = heapq.nsmallest(max_links, results, key=itemgetter(1))
+        return results
 
     @staticmethod
     def is_one_jump_from_original_domain(url: URL, response: Response) -> bool:
@@ -211,8 +323,8 @@ class LinkFilter:
         # if file_regex.search(url.strip()):
         #     return False
         # return True
-        suffix = pathlib.Path(url_query_cleaner(url)).suffix.strip(".").lower()
-        if suffix in invalid_filetypes:
+        suffix = get_suffix(strip_query(url)).lower()
+        if suffix in _invalid_filetypes:
             return False
         return True
 
@@ -235,7 +347,7 @@ class LinkFilter:
         :param regex: Regex used to search URL
         :return: boolean
         """
-        if regex.search(url_query_cleaner(url_string)):
+        if regex.search(strip_query(url_string)):
             return True
         return False
 
@@ -261,7 +373,7 @@ class LinkFilter:
         :param string: String to check
         :return: boolean
         """
-        return any(value in string.lower() for value in invalid_url_contents)
+        return bool(_invalid_url_contents_regex.search(string.lower()))
 
     @staticmethod
     def is_low_priority(url_string: str) -> bool:
@@ -271,7 +383,7 @@ class LinkFilter:
         :param url_string: URL string
         :return: boolean
         """
-        if any(value in url_string.lower() for value in low_priority_urls):
+        if _low_priority_urls_regex.search(url_string.lower()):
             return True
 
         # Search for dates in url, this generally indicates an article page.
@@ -0,0 +1,185 @@
+import codecs
+import logging
+from typing import Optional
+
+from feedsearch_crawler.crawler import Request, Response
+from feedsearch_crawler.feed_spider.html_page import HtmlPage, HtmlPageExtractor
+from feedsearch_crawler.feed_spider.link_filter import LinkFilter
+from feedsearch_crawler.feed_spider.regexes import rss_regex
+
+logger = logging.getLogger(__name__)
+
+
+class LinkStream:
+    """
+    Request chunk callback that parses an HTML page incrementally as its content is read.
+
+    Links that the Spider follows from the page are followed as soon as they are parsed, instead of once the
+    whole page has been read, so that feed links in the head are fetched while the rest of the page is still
+    downloading. With head_only, reading stops at the end of the head of pages that aren't site origins,
+    as feed links are usually only found in the head.
+
+    With the Spider's max_links_per_page, the first links found are followed rather than those with the
+    highest priority, as the rest of the page isn't known yet. The Spider reuses the parsed page once the
+    content has been read, and only follows the links that weren't checked while streaming, up to the
+    remainder of max_links_per_page.
+
+    Chunks are always parsed inline on the event loop rather than in the Crawler Executor. The parser state
+    can't be shared with a process pool, and each chunk is small enough that handing it to a thread would cost
+    more than parsing it. The page is then not parsed again in the Executor.
+
+    Only pages that look like HTML are parsed. Feeds and JSON are always read in full.
+    Each Request needs its own LinkStream, as it holds the parser state.
+    """
+
+    # Number of characters read before deciding whether the content is HTML.
+    sniff_length = 1000
+
+    def __init__(self, spider, follow_links: bool = True, head_only: bool = False):
+        """
+        :param spider: FeedsearchSpider that follows the links
+        :param follow_links: Follow links as they are parsed
+        :param head_only: Stop reading the content at the end of the head, unless the page is a site origin
+        """
+        self.spider = spider
+        self.follow_links = follow_links
+        self.head_only = head_only
+        # Response of the headers for the current attempt at the Request.
+        self._response: Optional[Response] = None
+        self._extractor: Optional[HtmlPageExtractor] = None
+        # Number of parsed links that have been checked.
+        self.links_checked = 0
+        # Number of links followed from the page.
+        self.links_followed = 0
+
+    def _reset(self, request: Request, response: Response) -> None:
+        """
+        Reset the parser state for a new attempt at the Request.
+        """
+        self._response = response
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder(errors="replace")
+        # Content decoded before it is known to be HTML.
+        self._start = ""
+        self._extractor = None
+        self.links_checked = 0
+        self.links_followed = 0
+        self._done = False
+        # The Spider only follows links from pages that are below the max depth and at the original domain.
+        self._link_filter: Optional[LinkFilter] = None
+        if (
+            self.follow_links
+            and not response.is_max_depth_reached(self.spider.max_depth)
+            and response.is_original_domain()
+        ):
+            self._link_filter = LinkFilter(
+                request=request,
+                response=response,
+                full_crawl=self.spider.full_crawl,
+                classifier=self.spider.link_classifier,
+            )
+        # Site origins are always read in full, as the links in their body are the start of the crawl.
+        self._is_origin = (
+            response.url == response.origin or request.url == request.url.origin()
+        )
+
+    async def __call__(
+        self, request: Request, response: Response, chunk: bytes
+    ) -> bool:
+        """
+        Parse a chunk of content.
+
+        :param request: Request being read
+        :param response: Response of the headers
+        :param chunk: Chunk of content
+        :return: False to stop reading the content
+        """
+        if response is not self._response:
+            self._reset(request, response)
+        if self._done:
+            return True
+
+        text = self._decoder.decode(chunk)
+        if not self._extractor:
+            self._start += text
+            if len(self._start) < self.sniff_length:
+                return True
+            text, self._start = self._start, ""
+            if not self.is_html(text):
+                self._done = True
+                return True
+            self._extractor = HtmlPageExtractor()
+
+        self._extractor.feed(text)
+        if self._link_filter:
+            await self._follow_new_links(response)
+
+        if (
+            self._extractor.builder.head_closed
+            and self.head_only
+            and not self._is_origin
+        ):
+            logger.debug("Stopped reading after head: %s", response.url)
+            self._done = True
+            return False
+        return True
+
+    async def _follow_new_links(self, response: Response) -> None:
+        links = self._extractor.page.links
+        max_links = self.spider.max_links_per_page
+        follow = []
+        for link in links[self.links_checked :]:
+            if max_links and self.links_followed + len(follow) >= max_links:
+                break
+            values = self._link_filter.should_follow_link(link)
+            if values:
+                follow.append(values)
+        self.links_checked = len(links)
+
+        if follow:
+            # Don't wait for space on the Request Queue, as only fetch workers make space.
+            requests = await self.spider.follow_many(
+                follow, response, self.spider.parse, allow_domain=True, wait=False
+            )
+            self.links_followed += len(requests)
+
+    def close(self) -> Optional[HtmlPage]:
+        """
+        Finish parsing the content read for the current attempt at the Request.
+
+        :return: HtmlPage of the content, or None if the content wasn't read or doesn't look like HTML.
+        """
+        if not self._response:
+            return None
+        if not self._extractor and not self._done:
+            # Content shorter than the sniff length hasn't been checked yet.
+            text = self._start + self._decoder.decode(b"", final=True)
+            self._start = ""
+            if not text or not self.is_html(text):
+                self._done = True
+                return None
+            self._extractor = HtmlPageExtractor()
+            self._extractor.feed(text)
+        if not self._extractor:
+            return None
+        if not self._done:
+            self._extractor.feed(self._decoder.decode(b"", final=True))
+            self._done = True
+        self._extractor.close()
+        return self._extractor.page
+
+    @staticmethod
+    def is_html(text: str) -> bool:
+        """
+        Check whether the start of the content looks like an HTML page rather than a feed or JSON.
+
+        :param text: Start of the content
+        :return: boolean
+        """
+        # The same check as the Spider, which only searches the first 1000 characters.
+        if rss_regex.search(text, endpos=1000):
+            return False
+        return not text.lstrip().startswith(("{", "["))
@@ -3,13 +3,22 @@ import re
 # Regex to check if possible RSS data.
 rss_regex = re.compile("(<rss|<rdf|<feed)", re.IGNORECASE)
 
+# Alternatives of the feed-like and podcast words, shared by the regexes below so that they can't disagree.
+FEEDLIKE_WORDS = "rss|feeds?|atom|json|xml|rdf|blogs?"
+PODCAST_WORDS = "podcasts?"
+
 # Regex to check that a feed-like string is a whole word to help rule out false positives.
-feedlike_regex = re.compile(
-    "\\b(rss|feeds?|atom|json|xml|rdf|blogs?)\\b", re.IGNORECASE
-)
+feedlike_regex = re.compile(f"\\b({FEEDLIKE_WORDS})\\b", re.IGNORECASE)
 
 # Regex to check that a podcast string is a whole word.
-podcast_regex = re.compile("\\b(podcasts?)\\b", re.IGNORECASE)
+podcast_regex = re.compile(f"\\b({PODCAST_WORDS})\\b", re.IGNORECASE)
+
+# Combined feedlike_regex and podcast_regex, to find both kinds of whole word in one pass with finditer().
+# The words of each kind never overlap, so every match is found.
+feedlike_podcast_regex = re.compile(
+    f"\\b(?:(?P<feed>{FEEDLIKE_WORDS})|(?P<podcast>{PODCAST_WORDS}))\\b",
+    re.IGNORECASE,
+)
 
 # Regex to check if the URL might contain author information.
 author_regex = re.compile(
@@ -6,6 +6,7 @@ from yarl import URL
 from feedsearch_crawler.crawler import ItemParser, Request, Response
 from feedsearch_crawler.crawler.lib import remove_www
 from feedsearch_crawler.feed_spider.favicon import Favicon
+from feedsearch_crawler.feed_spider.html_page import HtmlPage
 from feedsearch_crawler.feed_spider.site_meta import SiteMeta
 
 logger = logging.getLogger(__name__)
@@ -17,14 +18,14 @@ class SiteMetaParser(ItemParser):
         url = response.url
         site_meta: SiteMeta = SiteMeta(url)
 
-        xml = await response.xml
-        if not xml:
+        page: HtmlPage = await response.xml
+        if not page:
             return
 
-        site_meta.url = self.find_site_url(xml, url)
+        site_meta.url = self.find_site_url(page, url)
         site_meta.host = remove_www(site_meta.url.host)
-        site_meta.site_name = self.find_site_name(xml)
-        site_meta.possible_icons = self.find_site_icon_urls(xml, url, site_meta.host)
+        site_meta.site_name = self.find_site_name(page)
+        site_meta.possible_icons = self.find_site_icon_urls(page, url, site_meta.host)
 
         for icon in site_meta.possible_icons:
             if icon.url:
@@ -43,7 +44,7 @@ class SiteMetaParser(ItemParser):
         yield site_meta
 
     @staticmethod
-    def find_site_icon_urls(soup, url, host) -> List[Favicon]:
+    def find_site_icon_urls(page: HtmlPage, url: URL, host: str) -> List[Favicon]:
         search_icons = [
             Favicon(
                 url=url.join(URL("favicon.ico")),
@@ -57,7 +58,7 @@ class SiteMetaParser(ItemParser):
 
         possible_icons = []
         for icon in search_icons:
-            link = soup.find(name="link", rel=icon.rel)
+            link = page.find_link(icon.rel)
             if link:
                 href = link.get("href", None)
                 if href:
@@ -68,16 +69,16 @@ class SiteMetaParser(ItemParser):
         return sorted(possible_icons, key=lambda x: x.priority)
 
     @staticmethod
-    def find_site_url(soup, url: URL) -> URL:
+    def find_site_url(page: HtmlPage, url: URL) -> URL:
         """
         Attempts to find the canonical Url of the Site
 
-        :param soup: BeautifulSoup of site
+        :param page: Parsed HtmlPage of site
         :param url: Current Url of site
         :return: str
         """
         try:
-            canonical = soup.find(name="link", rel="canonical")
+            canonical = page.find_link("canonical")
             site = canonical.get("href")
             if site:
                 if site.strip() == "/":
@@ -87,23 +88,22 @@ class SiteMetaParser(ItemParser):
             pass
 
         try:
-            meta = soup.find(name="meta", property="og:url")
-            site = meta.get("content")
+            site = page.meta.get("og:url")
             if site:
                 if site.strip() == "/":
                     return url
                 return URL(site).origin()
-        except (AttributeError, ValueError):
+        except ValueError:
             pass
 
         return url.origin()
 
     @staticmethod
-    def find_site_name(soup) -> str:
+    def find_site_name(page: HtmlPage) -> str:
         """
         Attempts to find Site Name
 
-        :param soup: BeautifulSoup of site
+        :param page: Parsed HtmlPage of site
         :return: str
         """
         site_name_meta = [
@@ -114,18 +114,11 @@ class SiteMetaParser(ItemParser):
         ]
 
         for p in site_name_meta:
-            try:
-                name = soup.find(name="meta", property=p).get("content")
-                if name:
-                    return name
-            except AttributeError:
-                pass
+            name = page.meta.get(p)
+            if name:
+                return name
 
-        try:
-            title = soup.find(name="title").text
-            if title:
-                return title
-        except AttributeError:
-            pass
+        if page.title:
+            return page.title
 
         return ""
@@ -1,19 +1,22 @@
+import asyncio
 import base64
 import logging
 from types import AsyncGeneratorType
-from typing import Union, Any, List, Set
+from typing import Union, List, Set, Tuple, Type
 
 import bs4
 from yarl import URL
 
 from feedsearch_crawler.crawler import Crawler, Item, Request, Response
-from feedsearch_crawler.crawler.lib import parse_href_to_url
+from feedsearch_crawler.crawler.lib import StopReasons, parse_href_to_url
 from feedsearch_crawler.feed_spider.dupefilter import NoQueryDupeFilter
 from feedsearch_crawler.feed_spider.favicon import Favicon
 from feedsearch_crawler.feed_spider.feed_info import FeedInfo
 from feedsearch_crawler.feed_spider.feed_info_parser import FeedInfoParser
+from feedsearch_crawler.feed_spider.html_page import HtmlPage, parse_html_page
 from feedsearch_crawler.feed_spider.lib import ParseTypes
 from feedsearch_crawler.feed_spider.link_filter import LinkFilter
+from feedsearch_crawler.feed_spider.link_stream import LinkStream
 from feedsearch_crawler.feed_spider.regexes import rss_regex
 from feedsearch_crawler.feed_spider.site_meta import SiteMeta
 from feedsearch_crawler.feed_spider.site_meta_parser import SiteMetaParser
@@ -23,11 +26,22 @@ logger = logging.getLogger(__name__)
 
 class FeedsearchSpider(Crawler):
     duplicate_filter_class = NoQueryDupeFilter
+    # HTML parser backend name, see html_page.get_html_parser(), e.g. "html.parser" or "lxml".
     htmlparser = "html.parser"
     favicon_data_uri = True
     try_urls: Union[List[str], bool] = False
     full_crawl: bool = False
     crawl_hosts: bool = True
+    # Callback to be run with each new FeedInfo, SiteMeta, or Favicon as it is processed.
+    item_callback = None
+    # Stop the crawl once a feed with at least this score is found. None for no limit.
+    stop_score: Union[int, None] = None
+    # Parse HTML pages as their content is read, and follow their links as soon as they are parsed.
+    stream_links: bool = False
+    # Stop reading HTML pages at the end of the head, unless the page is a site origin.
+    head_only: bool = False
+    # Only follow this many links with the highest priority from each page. 0 for no limit.
+    max_links_per_page: int = 0
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -37,6 +51,8 @@ class FeedsearchSpider(Crawler):
         self.favicons = dict()
         self.feeds_seen = dict()
         self.post_crawl_callback = self.populate_feed_site_meta
+        # Link decisions are cached for the whole crawl, as navigation links repeat on every page.
+        self.link_classifier = LinkFilter.create_classifier()
         if "try_urls" in kwargs:
             self.try_urls = kwargs["try_urls"]
         if "favicon_data_uri" in kwargs:
@@ -45,6 +61,16 @@ class FeedsearchSpider(Crawler):
             self.full_crawl = kwargs["full_crawl"]
         if "crawl_hosts" in kwargs:
             self.crawl_hosts = kwargs["crawl_hosts"]
+        if "item_callback" in kwargs:
+            self.item_callback = kwargs["item_callback"]
+        if "stop_score" in kwargs:
+            self.stop_score = kwargs["stop_score"]
+        if "stream_links" in kwargs:
+            self.stream_links = kwargs["stream_links"]
+        if "head_only" in kwargs:
+            self.head_only = kwargs["head_only"]
+        if "max_links_per_page" in kwargs:
+            self.max_links_per_page = kwargs["max_links_per_page"]
 
     async def parse(self, request: Request, response: Response) -> AsyncGeneratorType:
         """
@@ -71,6 +97,15 @@ class FeedsearchSpider(Crawler):
             logger.debug("No text in %s", response)
             return
 
+        # Reuse the page parsed as the content was read, instead of parsing it again.
+        stream = request.chunk_callback
+        if isinstance(stream, LinkStream):
+            streamed_page = stream.close()
+            if streamed_page:
+                response.xml = streamed_page
+        else:
+            stream = None
+
         yield self.parse_site_meta(request, response)
 
         # Restrict the RSS check to the first 1000 characters, otherwise it's almost definitely not an actual feed.
@@ -86,28 +121,54 @@ class FeedsearchSpider(Crawler):
             return
 
         # Make sure the Response XML has been parsed if it exists.
-        soup = await response.xml
-        if not soup:
+        page: HtmlPage = await response.xml
+        if not page:
             return
 
         # Don't crawl links from pages that are not from the original domain
         if not response.is_original_domain():
             return
 
+        links = page.links
+        max_links = self.max_links_per_page
+        if stream:
+            # Links checked as the page was read have already been followed, and count towards the max.
+            links = links[stream.links_checked :]
+            if max_links:
+                max_links -= stream.links_followed
+                if max_links <= 0:
+                    return
+        if not links:
+            return
+
         link_filter = LinkFilter(
-            request=request, response=response, full_crawl=self.full_crawl
+            request=request,
+            response=response,
+            full_crawl=self.full_crawl,
+            classifier=self.link_classifier,
         )
 
-        # Find all links in the Response.
-        links = soup.find_all(self.tag_has_href)
-        for link in links:
-            # Check each href for validity and queue priority.
-            values = link_filter.should_follow_link(link)
-            if values:
-                url, priority = values
-                yield await self.follow(
-                    url, self.parse, response, priority=priority, allow_domain=True
-                )
+        # Check all links in the Response for validity and queue priority, and follow them in one batch.
+        await self.follow_many(
+            link_filter.classify_many(links, max_links=max_links),
+            response,
+            self.parse,
+            allow_domain=True,
+        )
+
+    def create_request(self, url: URL, callback=None, *args, **kwargs) -> Request:
+        """
+        Create a Request, parsing the pages passed to parse() as they are read if stream_links or head_only is set.
+        See Crawler.create_request for the arguments.
+        """
+        if callback == self.parse and (self.stream_links or self.head_only):
+            kwargs.setdefault(
+                "chunk_callback",
+                LinkStream(
+                    self, follow_links=self.stream_links, head_only=self.head_only
+                ),
+            )
+        return super().create_request(url, callback, *args, **kwargs)
 
     async def parse_site_meta(
         self, request: Request, response: Response
@@ -128,33 +189,58 @@ class FeedsearchSpider(Crawler):
         if response.url == url_origin or request.url == request_url_origin:
             yield self.site_meta_processor.parse_item(request, response)
 
-    async def parse_xml(self, response_text: str) -> Any:
+    async def parse_xml(self, data: bytes, encoding: str) -> HtmlPage:
         """
-        Parse Response text as XML.
+        Parse Response content as HTML, in the Crawler Executor.
         Used to allow implementations to provide their own XML parser.
 
-        :param response_text: Response text as string.
-        :return: None
+        :param data: Response content as bytes.
+        :param encoding: Character encoding of the Response content.
+        :return: HtmlPage containing the page links and site metadata values.
         """
-        return bs4.BeautifulSoup(response_text, self.htmlparser)
+        return await self.run_in_executor(
+            parse_html_page, data, encoding, self.htmlparser
+        )
 
     async def process_item(self, item: Item) -> None:
         """
         Process parsed items.
 
+        New FeedInfo items are populated with any site metadata already found, and existing FeedInfo items
+        are updated as new site metadata is found, so that items passed to the item callback are usable immediately.
+
         :param item: Item object
         :return: None
         """
         if isinstance(item, FeedInfo):
+            if item in self.items:
+                return
             self.items.add(item)
+            self.populate_feed(item)
         elif isinstance(item, SiteMeta):
+            if item in self.site_metas:
+                return
             self.site_metas.add(item)
+            for feed in self.items:
+                if item.host in feed.url.host:
+                    self.populate_feed(feed)
         elif isinstance(item, Favicon):
             self.add_favicon(item)
+        else:
+            return
+
+        await self._run_callback(self.item_callback, item)
+
+        if (
+            isinstance(item, FeedInfo)
+            and self.stop_score is not None
+            and item.score >= self.stop_score
+        ):
+            self.stop(StopReasons.STOP_SCORE)
 
     def add_favicon(self, favicon: Favicon) -> None:
         """
-        Add a favicon to the spider's favicon dictionary.
+        Add a favicon to the spider's favicon dictionary, and update the favicons of existing FeedInfo items.
 
         :param favicon: Favicon object
         """
@@ -163,43 +249,94 @@ class FeedsearchSpider(Crawler):
             return
         self.favicons[favicon.url] = favicon
 
-    # noinspection PyPep8
+        for feed in self.items:
+            self.populate_feed(feed)
+
     async def populate_feed_site_meta(self) -> None:
         """
         Populate FeedInfo site information with data from the relevant SiteMeta item
         """
         for feed in self.items:
-            # Check each SiteMeta for a url host match
-            site_meta = next(
-                (x for x in self.site_metas if x.host in feed.url.host), None
+            self.populate_feed(feed)
+
+    # noinspection PyPep8
+    def populate_feed(self, feed: FeedInfo) -> None:
+        """
+        Populate a FeedInfo with site information from the relevant SiteMeta item and Favicons found so far.
+
+        :param feed: FeedInfo object
+        """
+        # Check each SiteMeta for a url host match
+        site_meta = next((x for x in self.site_metas if x.host in feed.url.host), None)
+        if site_meta:
+            feed.site_url = site_meta.url
+            feed.site_name = site_meta.site_name
+
+        # Populate favicon directly if available
+        if feed.favicon:
+            favicon = self.favicons.get(feed.favicon)
+            if favicon:
+                feed.favicon_data_uri = favicon.data_uri
+                feed.favicon = favicon.resp_url if favicon.resp_url else favicon.url
+
+        # If a favicon hasn't been found yet or there is no data_uri then try and find a suitable favicon
+        if not feed.favicon or (self.favicon_data_uri and not feed.favicon_data_uri):
+            feed_host = feed.url.host
+            favicons = list(
+                x
+                for x in self.favicons.values()
+                if x.matches_host(feed_host, self.favicon_data_uri)
             )
-            if site_meta:
-                feed.site_url = site_meta.url
-                feed.site_name = site_meta.site_name
-
-            # Populate favicon directly if available
-            if feed.favicon:
-                favicon = self.favicons.get(feed.favicon)
-                if favicon:
-                    feed.favicon_data_uri = favicon.data_uri
-                    feed.favicon = favicon.resp_url if favicon.resp_url else favicon.url
-
-            # If a favicon hasn't been found yet or there is no data_uri then try and find a suitable favicon
-            if not feed.favicon or (
-                self.favicon_data_uri and not feed.favicon_data_uri
-            ):
-                feed_host = feed.url.host
-                favicons = list(
-                    x
-                    for x in self.favicons.values()
-                    if x.matches_host(feed_host, self.favicon_data_uri)
-                )
 
-                if favicons:
-                    favicon = min(favicons, key=lambda x: x.priority)
+            if favicons:
+                favicon = min(favicons, key=lambda x: x.priority)
+
+                feed.favicon_data_uri = favicon.data_uri
+                feed.favicon = favicon.resp_url if favicon.resp_url else favicon.url
+
+    async def crawl_iter(
+        self,
+        urls: Union[URL, str, List[Union[URL, str]]] = None,
+        item_types: Tuple[Type[Item], ...] = (FeedInfo,),
+    ) -> AsyncGeneratorType:
+        """
+        Start the web crawler, and yield each new item as soon as it is processed.
+
+        FeedInfo items are yielded in the order they are found, not sorted by score. Their site information
+        is populated with what has been found so far, and the same objects are updated as the crawl continues.
+        Closing the generator early cancels the crawl.
+
+        :param urls: An optional URL or List of URLS to start the crawl, in addition to start_urls.
+        :param item_types: Tuple of Item classes to yield, from FeedInfo, SiteMeta, and Favicon.
+        :return: AsyncGenerator yielding Items
+        """
+        queue = asyncio.Queue()
+        # Any item callback passed to the Spider is still run for each item, and restored once the crawl ends.
+        item_callback = self.item_callback
 
-                    feed.favicon_data_uri = favicon.data_uri
-                    feed.favicon = favicon.resp_url if favicon.resp_url else favicon.url
+        async def put_item(item: Item) -> None:
+            await self._run_callback(item_callback, item)
+            if isinstance(item, item_types):
+                queue.put_nowait(item)
+
+        self.item_callback = put_item
+        crawl = asyncio.ensure_future(self.crawl(urls))
+        # Mark the end of the crawl with None, whether it completed or not.
+        crawl.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield item
+            # Raise any exception from the crawl.
+            await crawl
+        finally:
+            if not crawl.done():
+                crawl.cancel()
+                await asyncio.gather(crawl, return_exceptions=True)
+            self.item_callback = item_callback
 
     # noinspection PyUnusedLocal
     async def parse_favicon_data_uri(
@@ -310,6 +447,9 @@ class FeedsearchSpider(Crawler):
         """
         Find all tags that contain links.
 
+        No longer used by the Spider, which reads links from the parsed HtmlPage,
+        but kept for subclasses that search a BeautifulSoup tree themselves.
+
         :param tag: XML tag
         :return: boolean
         """
@@ -42,7 +42,7 @@ packages = [
 required = [
     "aiohttp",
     "beautifulsoup4",
-    "feedparser",
+    "feedparser>=6,<7",
     "cchardet",
     "aiodns",
     "w3lib",
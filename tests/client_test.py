@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from yarl import URL
+
+from feedsearch_crawler import FeedsearchClient, search_many, search_many_async
+from feedsearch_crawler.feed_spider import FeedsearchSpider
+from tests.conftest import serve
+
+# Nothing listens on port 1, so searches fail fast without network access.
+unreachable_url = "http://127.0.0.1:1/"
+
+
+def test_sync_client_reuses_session():
+    with FeedsearchClient(total_timeout=5) as client:
+        assert client.search(unreachable_url) == []
+        session = client._session
+        results = client.search_many([unreachable_url, "http://127.0.0.2:1/"])
+        assert client._session is session
+        assert results[unreachable_url].feeds == []
+
+    assert client.closed
+    assert session.closed
+    with pytest.raises(RuntimeError):
+        client.search(unreachable_url)
+
+
+def test_target_latency_with_total_timeout():
+    with pytest.raises(ValueError):
+        FeedsearchClient(target_latency=5, total_timeout=10)
+
+    client = FeedsearchClient(target_latency=5)
+    crawler = asyncio.run(create_crawler(client))
+    assert crawler.total_timeout.total == 5
+    assert crawler.deadline_scheduling
+    asyncio.run(client.aclose())
+
+
+async def create_crawler(client: FeedsearchClient):
+    return client._create_crawler(False)
+
+
+def test_async_client_bound_to_one_loop():
+    client = FeedsearchClient(total_timeout=5)
+
+    async def search():
+        return await client.search_async(unreachable_url)
+
+    assert asyncio.run(search()) == []
+    with pytest.raises(RuntimeError):
+        asyncio.run(search())
+
+    asyncio.run(client.aclose())
+    assert client.closed
+
+
+FEED = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title>
+<link>http://test.com/</link><description>Test feed</description>
+<item><title>Item</title><link>http://test.com/item</link></item></channel></rss>"""
+
+
+async def index(request: web.Request) -> web.Response:
+    return web.Response(
+        text='<html><head><link rel="alternate" type="application/rss+xml" '
+        'href="/feed.xml"></head></html>',
+        content_type="text/html",
+    )
+
+
+async def feed(request: web.Request) -> web.Response:
+    return web.Response(body=FEED, content_type="application/rss+xml")
+
+
+def test_search_many_async_isolates_failing_sites(monkeypatch):
+    crawl = FeedsearchSpider.crawl
+
+    async def failing_crawl(self, urls=None):
+        if str(urls).startswith("http://failing.test"):
+            raise RuntimeError("Crawl failed")
+        await crawl(self, urls)
+
+    monkeypatch.setattr(FeedsearchSpider, "crawl", failing_crawl)
+
+    async def search():
+        async with serve({"/": index, "/feed.xml": feed}) as base_url:
+            site_url = URL(f"{base_url}/")
+            return site_url, await search_many_async(
+                [site_url, unreachable_url, "http://failing.test/"],
+                total_timeout=5,
+                favicon_data_uri=False,
+            )
+
+    site_url, results = asyncio.run(search())
+    assert set(results) == {str(site_url), unreachable_url, "http://failing.test/"}
+    assert all(isinstance(key, str) for key in results)
+
+    result = results[str(site_url)]
+    assert result.url == site_url
+    assert [feed.url.path for feed in result.feeds] == ["/feed.xml"]
+    assert result.stats
+    assert results[unreachable_url].feeds == []
+    assert results["http://failing.test/"].feeds == []
+
+
+def test_search_many_runs_in_new_loop():
+    results = search_many([URL(unreachable_url)], total_timeout=5)
+    assert list(results) == [unreachable_url]
+    assert results[unreachable_url].feeds == []
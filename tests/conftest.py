@@ -0,0 +1,28 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict
+
+from aiohttp import web
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@asynccontextmanager
+async def serve(routes: Dict[str, Handler]) -> AsyncIterator[str]:
+    """
+    Serve GET handlers on a local port for the duration of the context.
+
+    :param routes: Dictionary of aiohttp handlers, keyed by path
+    :return: Base URL of the server, without a trailing slash, e.g. "http://127.0.0.1:8080"
+    """
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
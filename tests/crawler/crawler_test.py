@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from feedsearch_crawler.crawler import Crawler, Item, Request, Response
+from feedsearch_crawler.crawler.lib import Stats
+from tests.conftest import serve
+
+PAGES = 6
+
+
+class PageItem(Item):
+    path = None
+
+
+class StageCrawler(Crawler):
+    def __init__(self, *args, parse_time: float = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parse_time = parse_time
+        self.parse_times = []
+
+    async def process_item(self, item: Item) -> None:
+        self.items.add(item.path)
+
+    async def parse_xml(self, data: bytes, encoding: str):
+        return None
+
+    async def parse(self, request: Request, response: Response):
+        if response.url.path == "/":
+            for i in range(PAGES):
+                yield await self.follow(f"/page{i}", self.parse, response)
+            return
+
+        # Nested generators and coroutines are processed in place by the parse worker.
+        async def item():
+            await asyncio.sleep(self.parse_time)
+            self.parse_times.append(time.monotonic())
+            return PageItem(path=response.url.path)
+
+        yield item()
+
+
+async def crawl(crawler: Crawler) -> list:
+    fetch_times = []
+
+    async def page(request: web.Request) -> web.Response:
+        fetch_times.append(time.monotonic())
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    async with serve({"/": page, "/{name}": page}) as base_url:
+        await crawler.crawl(f"{base_url}/")
+    return fetch_times
+
+
+def test_parse_stage_defaults():
+    crawler = StageCrawler(concurrency=4)
+    assert crawler.parse_concurrency == 4
+    assert crawler.parse_queue_size == 8
+
+    crawler = StageCrawler(concurrency=4, parse_concurrency=2, parse_queue_size=3)
+    assert crawler.parse_concurrency == 2
+    assert crawler.parse_queue_size == 3
+
+
+def test_fetch_stage_runs_ahead_of_parse_stage():
+    crawler = StageCrawler(
+        concurrency=PAGES,
+        parse_concurrency=1,
+        parse_queue_size=PAGES,
+        delay=0,
+        parse_time=0.05,
+    )
+    fetch_times = asyncio.run(crawl(crawler))
+
+    assert crawler.items == {f"/page{i}" for i in range(PAGES)}
+    assert len(crawler.parse_times) == PAGES
+    # Every page is fetched while the single parse worker is still working through the slow callbacks.
+    assert max(fetch_times) < max(crawler.parse_times) - 0.1
+    assert 0 < crawler.stats[Stats.PARSE_QUEUE_SIZE_MAX] <= PAGES
+    assert crawler.stats[Stats.PARSE_DURATION_MAX] >= 50
+
+
+def test_bounded_parse_queue_holds_back_fetch_stage():
+    crawler = StageCrawler(
+        concurrency=PAGES,
+        parse_concurrency=1,
+        parse_queue_size=1,
+        delay=0,
+        parse_time=0.02,
+    )
+    asyncio.run(crawl(crawler))
+
+    # Fetch workers wait for space on the full parse queue, and nothing is lost.
+    assert crawler.items == {f"/page{i}" for i in range(PAGES)}
+    assert crawler.stats[Stats.PARSE_QUEUE_SIZE_MAX] <= 1
@@ -0,0 +1,43 @@
+from fnmatch import fnmatch
+
+import pytest
+
+from feedsearch_crawler.crawler.domain_matcher import DomainMatcher
+
+patterns = ["example.com", "*.test.org", "*foo.net", "a?c.io", "[ab].dev", "sub.*.co"]
+
+
+@pytest.mark.parametrize(
+    "host",
+    [
+        "example.com",
+        "www.example.com",
+        "test.org",
+        "a.b.test.org",
+        ".test.org",
+        "foo.net",
+        "barfoo.net",
+        "abc.io",
+        "abbc.io",
+        "a.dev",
+        "c.dev",
+        "sub.x.y.co",
+        "sub.co",
+        "org",
+        "",
+    ],
+)
+def test_domain_matcher_fnmatch_equivalent(host):
+    matcher = DomainMatcher(patterns)
+    assert matcher.match(host) == any(fnmatch(host, p) for p in patterns)
+
+
+def test_domain_matcher_many_domains():
+    matcher = DomainMatcher([f"site{n}.com" for n in range(10000)] + ["*.blog.net"])
+    assert len(matcher) == 10001
+    assert matcher.match("site9999.com")
+    assert not matcher.match("www.site9999.com")
+    assert matcher.match("me.blog.net")
+    assert not matcher.match("blog.net")
+    assert not DomainMatcher([]).match("example.com")
+    assert DomainMatcher(["*"]).match("example.com")
@@ -0,0 +1,59 @@
+import asyncio
+
+from yarl import URL
+
+from feedsearch_crawler.crawler import DuplicateFilter
+from feedsearch_crawler.crawler.duplicatefilter import ScalableBloomFilter
+
+
+def test_url_seen():
+    dupefilter = DuplicateFilter()
+
+    async def seen(url, method="GET"):
+        return await dupefilter.url_seen(URL(url), method)
+
+    assert not asyncio.run(seen("http://test.com/"))
+    assert asyncio.run(seen("http://test.com/"))
+    assert not asyncio.run(seen("http://test.com/", "POST"))
+    assert len(dupefilter) == 2
+
+    fp = dupefilter.url_fingerprint_hash("http://test.com/")
+    assert isinstance(fp, int)
+    assert 0 <= fp < 2**64
+
+
+def test_scalable_bloom_filter():
+    bloom = ScalableBloomFilter(error_rate=0.01, initial_capacity=1000)
+    hash_url = DuplicateFilter.url_fingerprint_hash
+
+    for n in range(10000):
+        bloom.add(hash_url(f"http://test.com/{n}"))
+    assert len(bloom) == 10000
+    assert len(bloom.filters) > 1
+    assert all(hash_url(f"http://test.com/{n}") in bloom for n in range(10000))
+
+    false_positives = sum(
+        hash_url(f"http://example.com/{n}") in bloom for n in range(10000)
+    )
+    assert false_positives < 200
+
+
+def test_bloom_duplicate_filter():
+    dupefilter = DuplicateFilter(error_rate=0.001)
+    assert isinstance(dupefilter.fingerprints, ScalableBloomFilter)
+    assert not asyncio.run(dupefilter.url_seen(URL("http://test.com/")))
+    assert asyncio.run(dupefilter.url_seen(URL("http://test.com/")))
+    assert len(dupefilter) == 1
+
+
+def test_filter_seen():
+    dupefilter = DuplicateFilter()
+    assert not asyncio.run(dupefilter.url_seen(URL("http://test.com/a"), "GET"))
+
+    urls = [URL(f"http://test.com/{path}") for path in ["a", "b", "c", "b"]]
+    unseen = asyncio.run(dupefilter.filter_seen(urls, "GET"))
+    assert unseen == [
+        (url, dupefilter.url_fingerprint(url, "GET")) for url in urls[1:3]
+    ]
+    assert len(dupefilter) == 3
+    assert asyncio.run(dupefilter.filter_seen(urls, "GET")) == []
@@ -0,0 +1,185 @@
+import asyncio
+
+import aiohttp
+from yarl import URL
+
+from feedsearch_crawler.crawler.frontier import (
+    RequestFrontier,
+    HostFairFrontier,
+    FrontierPolicies,
+)
+from feedsearch_crawler.crawler.queueable import Queueable
+from feedsearch_crawler.crawler.request import Request
+
+
+class Item(Queueable):
+    def __init__(self, priority):
+        self.priority = priority
+
+    def __repr__(self):
+        return f"Item({self.priority})"
+
+
+def add(frontier, item) -> bool:
+    if not frontier.admit(item):
+        return False
+    item.add_to_queue(frontier)
+    return True
+
+
+def test_evicts_lowest_priority():
+    async def run():
+        frontier = RequestFrontier(max_items=2)
+        low, mid, high = Item(100), Item(50), Item(1)
+        assert add(frontier, low)
+        assert add(frontier, mid)
+        # Equal or lower priority items are dropped when full.
+        assert not add(frontier, Item(100))
+        assert add(frontier, high)
+        assert frontier.evictions == 2
+        assert frontier.qsize() == 2
+        assert frontier.get_nowait() is high
+        assert frontier.get_nowait() is mid
+        assert frontier.empty()
+
+    asyncio.run(run())
+
+
+def test_evicted_items_are_finished():
+    async def run():
+        frontier = RequestFrontier(max_items=1)
+        add(frontier, Item(100))
+        add(frontier, Item(1))
+        frontier.get_nowait()
+        frontier.task_done()
+        assert frontier.is_finished()
+
+    asyncio.run(run())
+
+
+def test_evicts_delayed_items():
+    async def run():
+        frontier = RequestFrontier(max_items=1)
+        delayed = Item(100)
+        assert frontier.admit(delayed)
+        frontier.put_later(delayed, 10)
+        assert add(frontier, Item(1))
+        assert frontier.delayed_size() == 0
+        assert frontier.size() == 1
+
+    asyncio.run(run())
+
+
+def test_memory_limit():
+    async def run():
+        frontier = RequestFrontier(max_memory=2500)
+        assert add(frontier, Item(1))
+        assert add(frontier, Item(1))
+        assert not add(frontier, Item(1))
+        frontier.get_nowait()
+        assert frontier.memory <= 2500
+        assert add(frontier, Item(1))
+
+    asyncio.run(run())
+
+
+def test_block_waits_for_space():
+    async def run():
+        frontier = RequestFrontier(max_items=1, policy=FrontierPolicies.BLOCK)
+        add(frontier, Item(1))
+        waiter = asyncio.ensure_future(frontier.wait_for_space())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        frontier.get_nowait()
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
+
+
+def test_block_stops_waiting_if_it_could_deadlock():
+    async def run():
+        can_block = True
+        frontier = RequestFrontier(
+            max_items=1, policy=FrontierPolicies.BLOCK, can_block=lambda: can_block
+        )
+        add(frontier, Item(1))
+        waiter = asyncio.ensure_future(frontier.wait_for_space())
+        await asyncio.sleep(0)
+        can_block = False
+        frontier.wake_space_waiters()
+        await asyncio.wait_for(waiter, 1)
+        assert frontier.is_full()
+
+    asyncio.run(run())
+
+
+def request(session, url, priority=100):
+    req = Request(
+        url=URL(url), request_session=session, timeout=aiohttp.ClientTimeout(total=1)
+    )
+    req.priority = priority
+    return req
+
+
+def test_host_fair_interleaves_hosts():
+    async def run():
+        session = aiohttp.ClientSession()
+        frontier = HostFairFrontier()
+        for i in range(3):
+            add(frontier, request(session, f"https://a.com/{i}"))
+        add(frontier, request(session, "https://b.com/0"))
+        add(frontier, request(session, "https://c.com/0"))
+
+        hosts = [frontier.get_nowait().url.host for _ in range(5)]
+        assert hosts[:3] == ["a.com", "b.com", "c.com"]
+        assert hosts[3:] == ["a.com", "a.com"]
+        assert frontier.empty()
+        await session.close()
+
+    asyncio.run(run())
+
+
+def test_host_fair_prefers_priority():
+    async def run():
+        session = aiohttp.ClientSession()
+        frontier = HostFairFrontier()
+        add(frontier, request(session, "https://a.com/0", 50))
+        add(frontier, request(session, "https://a.com/1", 50))
+        add(frontier, request(session, "https://b.com/0", 100))
+
+        assert [frontier.get_nowait().url.host for _ in range(3)] == [
+            "a.com",
+            "a.com",
+            "b.com",
+        ]
+        await session.close()
+
+    asyncio.run(run())
+
+
+def test_host_fair_eviction():
+    async def run():
+        session = aiohttp.ClientSession()
+        frontier = HostFairFrontier(max_items=2)
+        add(frontier, request(session, "https://a.com/0", 100))
+        add(frontier, request(session, "https://a.com/1", 50))
+        assert add(frontier, request(session, "https://b.com/0", 1))
+        assert frontier.qsize() == 2
+        assert [frontier.get_nowait().url.path for _ in range(2)] == ["/0", "/1"]
+        assert frontier.empty()
+        await session.close()
+
+    asyncio.run(run())
+
+
+def test_put_many():
+    async def run(frontier):
+        items = [Item(priority) for priority in [5, 1, 3]]
+        for item in items:
+            frontier.admit(item)
+        frontier.put_many(items)
+        frontier.put_many([Item(2)])
+        return [frontier.get_nowait().priority for _ in range(4)]
+
+    assert asyncio.run(run(RequestFrontier())) == [1, 2, 3, 5]
+    assert asyncio.run(run(HostFairFrontier())) == [1, 2, 3, 5]
@@ -0,0 +1,43 @@
+import pytest
+from yarl import URL
+
+from feedsearch_crawler.crawler import History, Response
+
+urls = [URL("http://test.com/"), URL("http://test.com/a"), URL("http://example.com/b")]
+
+
+def test_history_indexing():
+    history = History.from_urls(urls)
+    assert len(history) == 3
+    assert list(history) == urls
+    assert history == urls
+    assert [history[i] for i in range(-3, 3)] == urls + urls
+    assert history[1:] == urls[1:]
+    with pytest.raises(IndexError):
+        history[3]
+
+    empty = History()
+    assert not empty
+    assert list(empty) == []
+    with pytest.raises(IndexError):
+        empty[0]
+
+
+def test_history_append_is_shared():
+    parent = History.from_urls(urls[:2])
+    first = parent.append(urls[2])
+    second = parent.append(URL("http://test.com/c"))
+
+    assert len(parent) == 2
+    assert first.parent is parent and second.parent is parent
+    assert first[0] == urls[0]
+    assert first[-2] == urls[1]
+
+
+def test_response_history():
+    response = Response(url=urls[2], method="GET", history=urls)
+    assert isinstance(response.history, History)
+    assert response.originator_url == urls[1]
+    assert not response.is_original_domain()
+    assert response.is_max_depth_reached(3)
+    assert not response.is_max_depth_reached(4)
@@ -0,0 +1,57 @@
+import pytest
+
+from feedsearch_crawler.crawler.metrics import MetricsRegistry, CrawlerMetrics
+
+
+def test_generate_openmetrics_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests", "Requests.", ["status"])
+    in_flight = registry.gauge("test_in_flight", "In flight.")
+    duration = registry.histogram("test_duration_seconds", "Duration.", [0.1, 1])
+
+    requests.inc(status=200)
+    requests.inc(2, status=200)
+    requests.inc(status='40"4')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    duration.observe(0.05)
+    duration.observe(0.5)
+    duration.observe(5)
+
+    assert registry.generate() == (
+        "# TYPE test_requests counter\n"
+        "# HELP test_requests Requests.\n"
+        'test_requests_total{status="200"} 3\n'
+        'test_requests_total{status="40\\"4"} 1\n'
+        "# TYPE test_in_flight gauge\n"
+        "# HELP test_in_flight In flight.\n"
+        "test_in_flight 1\n"
+        "# TYPE test_duration_seconds histogram\n"
+        "# HELP test_duration_seconds Duration.\n"
+        'test_duration_seconds_bucket{le="0.1"} 1\n'
+        'test_duration_seconds_bucket{le="1.0"} 2\n'
+        'test_duration_seconds_bucket{le="+Inf"} 3\n'
+        "test_duration_seconds_count 3\n"
+        "test_duration_seconds_sum 5.55\n"
+        "# EOF\n"
+    )
+
+
+def test_metric_labels_required():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests", "Requests.", ["status"])
+    with pytest.raises(ValueError):
+        requests.inc()
+    with pytest.raises(ValueError):
+        requests.inc(-1, status=200)
+
+
+def test_crawler_metrics_share_registry():
+    registry = MetricsRegistry()
+    first = CrawlerMetrics(registry)
+    second = CrawlerMetrics(registry)
+    first.requests.inc(status=200)
+    second.requests.inc(status=200)
+    assert first.requests is second.requests
+    assert first.requests.get(status=200) == 2
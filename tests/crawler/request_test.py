@@ -0,0 +1,77 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from yarl import URL
+
+from feedsearch_crawler.crawler.request import Request
+from tests.conftest import serve
+
+
+async def trickle(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for _ in range(100):
+        await response.write(b"x" * 10)
+        await asyncio.sleep(0.05)
+    return response
+
+
+async def fetch_trickle(watch):
+    """Fetch a slowly trickling response, calling watch(request) while the fetch is in flight."""
+    async with serve({"/": trickle}) as base_url, aiohttp.ClientSession() as session:
+        request = Request(
+            URL(f"{base_url}/"),
+            session,
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        fetch = asyncio.ensure_future(request.fetch_callback())
+        try:
+            while not fetch.done():
+                await asyncio.sleep(0.05)
+                watch(request, fetch)
+            _, response = await fetch
+        finally:
+            fetch.cancel()
+    return request, response
+
+
+def test_trickling_response_is_stalled():
+    def watch(request, fetch):
+        if request.is_stalled(0.2, min_read_rate=1000):
+            request.cancel_stalled()
+
+    request, response = asyncio.run(fetch_trickle(watch))
+
+    assert request.stalled
+    assert response.status_code == 408
+    assert 0 < request.bytes_read < 1000
+    # Stalled Requests aren't retried.
+    assert not request.should_retry
+    assert not request.is_stalled(0.2)
+
+
+def test_cancelled_fetch_propagates():
+    def watch(request, fetch):
+        assert not request.is_stalled(0.2)
+        if request.bytes_read:
+            fetch.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(fetch_trickle(watch))
+
+
+def test_requests_are_slotted():
+    async def create():
+        async with aiohttp.ClientSession() as session:
+            return [
+                Request(URL("http://test.com/"), session, timeout=1) for _ in range(2)
+            ]
+
+    first, second = asyncio.run(create())
+    assert not hasattr(first, "__dict__")
+    assert second.id > first.id
+    assert first.priority == 100
+    assert first.timeout.total == 1
+    assert first.get_queue_wait_time() is None
@@ -0,0 +1,75 @@
+from feedsearch_crawler.crawler.scheduler import HostScheduler, DeadlineTuner
+
+
+def test_reserve_spaces_requests_to_same_host():
+    scheduler = HostScheduler()
+    assert scheduler.reserve("test.com", 0.5, now=10) == 0
+    assert scheduler.reserve("test.com", 0.5, now=10) == 0.5
+    assert scheduler.reserve("test.com", 0.5, now=10) == 1.0
+    assert scheduler.reserve("test.com", 0.5, now=12) == 0
+
+
+def test_reserve_does_not_delay_other_hosts():
+    scheduler = HostScheduler()
+    assert scheduler.reserve("test.com", 5, now=10) == 0
+    assert scheduler.reserve("example.com", 5, now=10) == 0
+    assert scheduler.reserve("test.com", 5, now=11) == 4
+
+
+def test_reserve_backoff():
+    scheduler = HostScheduler()
+    assert scheduler.reserve("test.com", 1, backoff=2, now=10) == 2
+    assert scheduler.reserve("test.com", 0, now=10) == 3
+
+
+def test_held_requests_released_in_order():
+    scheduler = HostScheduler()
+    assert scheduler.acquire("test.com", "a", 1, now=10)
+    assert not scheduler.acquire("test.com", "b", 1, now=10)
+    scheduler.hold("test.com", "b")
+    scheduler.hold("test.com", "c")
+    assert scheduler.next_release("test.com", now=10) == 1
+    # Only one release is scheduled at a time.
+    assert scheduler.next_release("test.com", now=10) is None
+
+    # The released Request has the next claim on the slot, even over a Request taken later.
+    assert scheduler.release("test.com") == "b"
+    assert not scheduler.acquire("test.com", "d", 1, now=11)
+    scheduler.hold("test.com", "d")
+    assert scheduler.acquire("test.com", "b", 1, now=11)
+    assert scheduler.held("test.com") == 2
+
+    assert scheduler.next_release("test.com", now=11) == 1
+    assert scheduler.release("test.com") == "c"
+    # A released Request that won't be fetched gives up its claim.
+    scheduler.forfeit("test.com", "c")
+    assert scheduler.next_release("test.com", now=12) == 0
+    assert scheduler.release("test.com") == "d"
+    assert scheduler.acquire("test.com", "d", 1, now=12)
+    assert scheduler.held("test.com") == 0
+    assert scheduler.next_release("test.com", now=12) is None
+
+
+def test_latency_moving_average():
+    scheduler = HostScheduler()
+    assert scheduler.latency("test.com", default=1) == 1
+    scheduler.record_latency("test.com", 1)
+    assert scheduler.latency("test.com") == 1
+    scheduler.record_latency("test.com", 2)
+    assert 1 < scheduler.latency("test.com") < 2
+    assert scheduler.latency("example.com") == 0
+
+
+def test_deadline_tuner_settles_at_quantile():
+    tuner = DeadlineTuner(10, quantile=0.9)
+    # Durations are proportional to the budget, and 20% of searches take twice the budget,
+    # so 90% of searches finish within the target when the budget is half the target.
+    for i in range(5000):
+        tuner.record(tuner.budget * (2 if i % 5 == 0 else 0.6))
+    assert 4 < tuner.budget < 5.5
+    assert tuner.budget >= tuner.min_budget
+
+    tuner = DeadlineTuner(10)
+    for _ in range(10):
+        tuner.record(1)
+    assert tuner.budget == 10
@@ -0,0 +1,54 @@
+import random
+from statistics import harmonic_mean, median
+
+import pytest
+
+from feedsearch_crawler.crawler.stats import StreamingStats
+
+
+def test_empty_stats():
+    stats = StreamingStats()
+    assert stats.count == 0
+    assert stats.median == 0
+    assert stats.quantile(0.99) == 0
+    assert stats.harmonic_mean == 0
+
+
+def test_exact_values():
+    values = [5, 1, 300, 42, 7, 7]
+    stats = StreamingStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.total == sum(values)
+    assert stats.min == 1
+    assert stats.max == 300
+    assert stats.harmonic_mean == pytest.approx(harmonic_mean(values))
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(5, 2) for _ in range(10000)]
+    stats = StreamingStats(relative_accuracy=0.01)
+    for value in values:
+        stats.add(value)
+
+    values.sort()
+    assert stats.median == pytest.approx(median(values), rel=0.02)
+    assert stats.quantile(0.9) == pytest.approx(values[int(0.9 * 9999)], rel=0.02)
+    assert stats.quantile(0.99) == pytest.approx(values[int(0.99 * 9999)], rel=0.02)
+    assert stats.quantile(0) == stats.min
+    assert stats.quantile(1) == stats.max
+    # Memory is bounded by the range of values, not the number of values.
+    assert len(stats._buckets) < 2000
+
+
+def test_zero_values():
+    stats = StreamingStats()
+    for value in [0, 0, 0, 10]:
+        stats.add(value)
+
+    assert stats.median == 0
+    assert stats.harmonic_mean == 0
+    assert stats.max == 10
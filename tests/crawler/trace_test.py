@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+from feedsearch_crawler.crawler.trace import (
+    RequestTimings,
+    RequestTimingStats,
+    on_timing_request_start,
+    on_timing_dns_resolvehost_start,
+    on_timing_dns_resolvehost_end,
+    on_timing_connection_create_start,
+    on_timing_connection_create_end,
+    on_timing_request_end,
+)
+
+
+def test_sampling():
+    assert RequestTimingStats(sample_rate=1).sample()
+    assert not RequestTimingStats(sample_rate=0).sample()
+
+
+def test_record_summary():
+    stats = RequestTimingStats()
+    stats.record(RequestTimings(ttfb=100, total=150))
+    stats.record(RequestTimings(dns=10, connect=20, ttfb=100, total=200))
+
+    summary = stats.summary()
+    assert set(summary) == {"dns", "connect", "ttfb", "total"}
+    assert summary["ttfb"]["count"] == 2
+    assert 99 <= summary["ttfb"]["median"] <= 101
+
+
+def test_trace_handlers_record_phases():
+    timings = RequestTimings()
+    ctx = SimpleNamespace(trace_request_ctx=timings)
+
+    async def request():
+        await on_timing_request_start(None, ctx, None)
+        await on_timing_connection_create_start(None, ctx, None)
+        await on_timing_dns_resolvehost_start(None, ctx, None)
+        await asyncio.sleep(0.05)
+        await on_timing_dns_resolvehost_end(None, ctx, None)
+        await asyncio.sleep(0.01)
+        await on_timing_connection_create_end(None, ctx, None)
+        await on_timing_request_end(None, ctx, None)
+
+    asyncio.run(request())
+    assert timings.dns >= 50
+    # DNS is excluded from the connect time.
+    assert 10 <= timings.connect < 40
+    assert timings.ttfb is not None
+    assert timings.redirect is None
+
+
+def test_trace_handlers_ignore_untimed_requests():
+    ctx = SimpleNamespace(trace_request_ctx=None)
+    asyncio.run(on_timing_request_start(None, ctx, None))
+    asyncio.run(on_timing_request_end(None, ctx, None))
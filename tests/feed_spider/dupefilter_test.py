@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from w3lib.url import canonicalize_url, url_query_cleaner
+from yarl import URL
+
+from feedsearch_crawler.feed_spider.dupefilter import NoQueryDupeFilter, canonicalize
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://Example.COM/a/../b/./c?x=1#frag",
+        "http://example.com",
+        "http://example.com:80/x",
+        "https://example.com:443/r%c3%a9sum%c3%a9",
+        "https://example.com/résumé",
+        "http://example.com/a b?q=a b&b=2&a=1",
+        "http://user:PW@Ex.com:8080/%7Euser/",
+        "http://example.com/a%2Fb;params?feed=rss&b=&a=1",
+        "http://example.com/?feed=!$'()*,;:@/?",
+        "http://example.com/?rss=%E9",
+        "http://bücher.example/?atom",
+        "http://[::0:1]/a?format=a+b",
+    ],
+)
+def test_canonicalize_w3lib_equivalent(url):
+    url = URL(url)
+    assert canonicalize(url) == canonicalize_url(str(url))
+    assert canonicalize(url, keep_query=False) == canonicalize_url(
+        url_query_cleaner(str(url))
+    )
+
+
+def test_no_query_dupe_filter():
+    dupefilter = NoQueryDupeFilter()
+
+    assert dupefilter.parse_url(URL("http://Test.com/a?utm=1#x")) == "http://test.com/a"
+    assert (
+        dupefilter.parse_url(URL("http://test.com/a?feed=rss&b=1"))
+        == "http://test.com/a?b=1&feed=rss"
+    )
+
+    url = URL("http://test.com/a?utm=2")
+    fingerprint = dupefilter.url_fingerprint(url, "GET")
+    assert not asyncio.run(dupefilter.url_seen(url, "GET", fingerprint))
+    assert asyncio.run(dupefilter.url_seen(URL("http://test.com/a"), "GET"))
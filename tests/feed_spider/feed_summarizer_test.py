@@ -0,0 +1,222 @@
+import random
+
+import feedparser
+import pytest
+
+from benchmarks.feed_summary_benchmark import (
+    CREATORS,
+    HEADERS,
+    summarize,
+    summarize_with_feedparser,
+)
+from feedsearch_crawler.feed_spider.feed_info_parser import FeedInfoParser
+from feedsearch_crawler.feed_spider.feed_summarizer import (
+    UnsupportedFeed,
+    summarize_feed,
+)
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"
+    xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+<channel>
+    <title>Test &amp; Feed</title>
+    <description>A test feed</description>
+    <atom:link href="https://example.com/feed" rel="self" type="application/rss+xml"/>
+    <atom:link href="https://hub.example.com/" rel="hub"/>
+    <lastBuildDate>Tue, 02 Jul 2019 10:00:00 +0000</lastBuildDate>
+    <image><title>Image</title><url>https://example.com/logo.png</url></image>
+    <item>
+        <title>Episode 1</title>
+        <description><![CDATA[<p>Show <b>notes</b></p>]]></description>
+        <enclosure url="https://example.com/1.mp3" type="audio/mpeg" length="1"/>
+        <pubDate>Mon, 01 Jul 2019 10:00:00 +0000</pubDate>
+    </item>
+    <item>
+        <title>Episode 2</title>
+        <pubDate>Tue, 02 Jul 2019 10:00:00 +0000</pubDate>
+    </item>
+</channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://example.com/blog/">
+    <title type="html">Test Blog</title>
+    <subtitle>Posts</subtitle>
+    <link href="/"/>
+    <link rel="self" href="atom.xml"/>
+    <updated>2019-07-02T10:00:00Z</updated>
+    <entry>
+        <title>Post</title>
+        <link rel="enclosure" href="image.jpg"/>
+        <published>2019-07-01T10:00:00Z</published>
+        <updated>2019-07-02T10:00:00Z</updated>
+        <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Post</p></div></content>
+    </entry>
+</feed>"""
+
+RDF = b"""<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+    xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <channel rdf:about="https://example.com/">
+        <title>RDF Feed</title>
+        <description>An RSS 1.0 feed</description>
+        <dc:date>2019-07-02T10:00:00+00:00</dc:date>
+    </channel>
+    <item rdf:about="https://example.com/1">
+        <title>Item</title>
+        <dc:date>2019-07-01T10:00:00+00:00</dc:date>
+    </item>
+</rdf:RDF>"""
+
+ATOM03 = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed version="0.3" xmlns="http://purl.org/atom/ns#">
+    <title mode="escaped" type="text/html">Test Blog</title>
+    <tagline mode="escaped" type="text/html">Posts</tagline>
+    <link rel="alternate" type="text/html" href="https://example.com/"/>
+    <modified>2019-07-02T10:00:00Z</modified>
+    <entry>
+        <title>Post</title>
+        <issued>2019-07-01T10:00:00Z</issued>
+        <modified>2019-07-02T10:00:00Z</modified>
+        <content mode="escaped" type="text/html">&lt;p&gt;Post&lt;/p&gt;</content>
+    </entry>
+</feed>"""
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><title>Image</title></svg>'
+MATH = b'<math xmlns="http://www.w3.org/1998/Math/MathML"><mi>x</mi></math>'
+
+# Feeds that the FeedSummarizer parses the same as feedparser.
+PARITY_FEEDS = {
+    "rss": RSS,
+    "atom": ATOM,
+    "rdf": RDF,
+    "atom03_escaped": ATOM03,
+    "html_subtitle_text": ATOM.replace(
+        b"<subtitle>Posts</subtitle>", b'<subtitle type="html">Posts</subtitle>'
+    ),
+    "entry_base": ATOM.replace(
+        b"<entry>", b'<entry xml:base="https://cdn.example.com/posts/">'
+    ),
+    "textinput_in_feed": RSS.replace(
+        b"<lastBuildDate>",
+        b"<textInput><title>Search</title></textInput><lastBuildDate>",
+    ),
+    "undeclared_encoding": RSS.replace(b'encoding="UTF-8"', b'encoding="x-unknown"'),
+}
+
+# Feeds that the FeedSummarizer leaves to feedparser.
+FALLBACK_FEEDS = {
+    "hub_without_href": RSS.replace(
+        b'<atom:link href="https://hub.example.com/" rel="hub"/>',
+        b'<atom:link rel="hub">https://hub.example.com/</atom:link>',
+    ),
+    "self_without_href": RSS.replace(
+        b'<atom:link href="https://example.com/feed" rel="self" type="application/rss+xml"/>',
+        b'<atom:link rel="self">https://example.com/feed</atom:link>',
+    ),
+    "feed_content": ATOM.replace(
+        b"<subtitle>Posts</subtitle>", b"<content>Posts</content>"
+    ),
+    "svg": ATOM.replace(b"<title>Post</title>", b"<title>Post</title>" + SVG),
+    "math": ATOM.replace(b"<title>Post</title>", b"<title>Post</title>" + MATH),
+    "svg_in_content": ATOM.replace(b"<p>Post</p>", b"<p>Post</p>" + SVG),
+    "textinput_outside_feed": RSS.replace(
+        b"<title>Episode 2</title>",
+        b"<title>Episode 2</title><textInput><title>Search</title></textInput>",
+    ),
+    "atom03_escaped_markup": ATOM03.replace(
+        b"Test Blog", b"&lt;b&gt;Test&lt;/b&gt; Blog"
+    ),
+    "html_subtitle": ATOM.replace(
+        b"<subtitle>Posts</subtitle>",
+        b'<subtitle type="html">&lt;p&gt;Posts&lt;/p&gt;</subtitle>',
+    ),
+}
+
+
+def summary_values(parsed: dict) -> dict:
+    feed = parsed["feed"]
+    return {
+        "version": parsed["version"],
+        "title": feed.get("title"),
+        "description": FeedInfoParser.feed_description(feed),
+        "links": FeedInfoParser.websub_links(feed),
+        "updated": feed.get("updated", ""),
+        "is_podcast": FeedInfoParser.is_podcast(parsed),
+        "entries": [
+            (
+                entry.get("updated"),
+                entry.get("published"),
+                len(entry.get("enclosures", [])),
+            )
+            for entry in parsed["entries"]
+        ],
+    }
+
+
+@pytest.mark.parametrize("data", PARITY_FEEDS.values(), ids=PARITY_FEEDS.keys())
+def test_summarize_feed_same_as_feedparser(data):
+    result = summarize_feed(data, {"content-type": "application/xml"})
+    expected = feedparser.parse(
+        data, response_headers={"content-type": "application/xml"}
+    )
+    assert summary_values(result) == summary_values(expected)
+    assert result["bozo"] == expected["bozo"]
+
+
+@pytest.mark.parametrize("name", CREATORS)
+def test_summarize_generated_feeds_same_as_feedparser(name):
+    data = CREATORS[name](random.Random(0), 0)
+    # Summarized without falling back to feedparser.
+    assert summarize_feed(data, dict(HEADERS))["entries"]
+    assert summarize(data) == summarize_with_feedparser(data)
+
+
+@pytest.mark.parametrize("data", FALLBACK_FEEDS.values(), ids=FALLBACK_FEEDS.keys())
+def test_summarize_feed_unsupported(data):
+    with pytest.raises(UnsupportedFeed):
+        summarize_feed(data, {})
+    # FeedInfoParser falls back to feedparser for the whole summary.
+    assert summarize(data) == summarize_with_feedparser(data)
+
+
+def test_summarize_feed_unknown_encoding(monkeypatch):
+    def convert_to_utf8(headers, data, result):
+        # feedparser gives up on the encoding when no candidate decodes the document.
+        result["encoding"] = ""
+        return data
+
+    monkeypatch.setattr(
+        "feedsearch_crawler.feed_spider.feed_summarizer.convert_to_utf8",
+        convert_to_utf8,
+    )
+    with pytest.raises(UnsupportedFeed):
+        summarize_feed(RSS, {})
+
+
+def test_summarize_feed_values():
+    result = summary_values(summarize_feed(ATOM, {}))
+    assert result["version"] == "atom10"
+    assert result["title"] == "Test Blog"
+    assert result["links"] == ([], "https://example.com/blog/atom.xml")
+    assert result["entries"] == [("2019-07-02T10:00:00Z", "2019-07-01T10:00:00Z", 1)]
+
+
+def test_summarize_feed_malformed():
+    with pytest.raises(UnsupportedFeed):
+        summarize_feed(RSS.replace(b"</channel>", b""), {})
+
+
+def test_summarize_feed_html_title():
+    with pytest.raises(UnsupportedFeed):
+        summarize_feed(RSS.replace(b"Test &amp; Feed", b"&lt;b&gt;Test&lt;/b&gt;"), {})
+
+
+def test_summarize_xml_falls_back_to_feedparser():
+    data = RSS.replace(b"Test &amp; Feed", b"&lt;b&gt;Test&lt;/b&gt;")
+    summary = FeedInfoParser.summarize_xml(data, "utf-8", {}, "html.parser")
+    assert summary.title == "Test"
+    assert summary.hubs == ["https://hub.example.com/"]
+    assert summary.self_url == "https://example.com/feed"
+    assert summary.item_count == 2
+    assert summary.is_podcast
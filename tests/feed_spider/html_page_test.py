@@ -0,0 +1,90 @@
+import pytest
+
+from feedsearch_crawler.feed_spider.html_page import (
+    HtmlPage,
+    extract_html_page,
+    get_html_parser,
+    html_parsers,
+    parse_html_page,
+    parse_html_soup,
+    register_html_parser,
+)
+
+html = b"""<html><head><title>Title</title>
+<link rel="canonical" href="https://test.com/">
+<link rel="shortcut icon" href="/favicon.png">
+<link rel="alternate" type="application/rss+xml" href="/feed.xml">
+<meta property="og:site_name" content="Test Site">
+<meta property="og:site_name" content="Other Site">
+</head><body><a href="/about">About</a><a name="no-href">No href</a></body></html>"""
+
+
+def test_parse_html_page_links():
+    page = parse_html_page(html, "utf-8", "html.parser")
+    assert [link["href"] for link in page.links] == [
+        "https://test.com/",
+        "/favicon.png",
+        "/feed.xml",
+        "/about",
+    ]
+    assert page.links[2]["type"] == "application/rss+xml"
+    assert page.links[3] == {"tag": "a", "href": "/about"}
+
+
+def test_parse_html_page_meta():
+    page = parse_html_page(html, "utf-8", "html.parser")
+    assert page.title == "Title"
+    assert page.meta == {"og:site_name": "Test Site"}
+
+
+def test_find_link():
+    page = parse_html_page(html, "utf-8", "html.parser")
+    assert page.find_link("canonical")["href"] == "https://test.com/"
+    assert page.find_link("shortcut icon")["href"] == "/favicon.png"
+    assert page.find_link("icon")["href"] == "/favicon.png"
+    assert page.find_link("favicon") is None
+
+
+def test_extract_html_page_edge_cases():
+    page = extract_html_page(
+        b"""<TITLE>A &amp; <b>B</b></TITLE><title>Second</title>
+<LINK REL=" Shortcut   Icon " HREF="/i.png" type="">
+<meta property="og:url"><meta property="og:url" content="/other">
+<a href>Empty</a><a href="/1" href="/2">Duplicate</a>
+<script>document.write('<a href="/script">')</script>""",
+        "utf-8",
+    )
+    assert page.title == "A & B"
+    assert page.links == [
+        {"tag": "link", "href": "/i.png", "rel": "Shortcut Icon"},
+        {"tag": "a", "href": ""},
+        {"tag": "a", "href": "/2"},
+    ]
+    assert page.meta == {"og:url": ""}
+
+
+def test_extract_html_page_encoding():
+    data = "<title>Café</title>".encode("latin-1")
+    assert extract_html_page(data, "latin-1").title == "Café"
+    # Falls back to detecting the encoding if the given encoding fails.
+    assert extract_html_page(data, "utf-8").title == "Café"
+    assert extract_html_page(b"<title>Unclosed", None).title == "Unclosed"
+
+
+def test_html_parser_backends():
+    expected = parse_html_soup(html, "utf-8")
+    assert parse_html_page(html, "utf-8", "html.parser") == expected
+    assert parse_html_page(html, "utf-8", "bs4") == expected
+    # Unregistered names are BeautifulSoup tree builders.
+    assert get_html_parser("html5lib").keywords == {"htmlparser": "html5lib"}
+
+    register_html_parser("test", lambda data, encoding: HtmlPage(title="Test"))
+    try:
+        assert parse_html_page(html, "utf-8", "test").title == "Test"
+    finally:
+        del html_parsers["test"]
+
+
+def test_lxml_html_parser():
+    pytest.importorskip("lxml")
+    assert parse_html_page(html, "utf-8", "lxml") == parse_html_soup(html, "utf-8")
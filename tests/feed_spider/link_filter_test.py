@@ -110,3 +110,37 @@ def test_is_podcast_querystring():
     assert (
         lf.is_querystring_matching(URL("test.com?podcasts=test"), podcast_regex) is True
     )
+
+
+def test_classify_many():
+    links = [
+        {"href": "/about"},
+        {"href": "/blog/2019/10/post"},
+        {"href": "/podcast"},
+        {"href": "/feed.xml?utm_source=nav"},
+        {"href": "/feed.xml"},
+        {"href": "/authors/rss"},
+        {"href": "/video/feed", "type": "application/rss+xml"},
+        {"href": "/wp-content/feed"},
+    ]
+    link_filter = lf(None, None)
+    expected = [
+        (URL("/blog/2019/10/post"), 3),
+        (URL("/podcast"), 5),
+        (URL("/feed.xml"), 3),
+        (URL("/authors/rss"), 3),
+        (URL("/video/feed"), 2),
+    ]
+    assert link_filter.classify_many(links) == expected
+    assert link_filter.should_follow_link(links[3]) == (URL("/feed.xml"), 3)
+    assert link_filter.classify_many(links, max_links=3) == [
+        (URL("/video/feed"), 2),
+        (URL("/blog/2019/10/post"), 3),
+        (URL("/feed.xml"), 3),
+    ]
+
+    classifier = lf.create_classifier()
+    cached = lf(None, None, classifier=classifier)
+    assert cached.classify_many(links) == expected
+    assert cached.classify_many(links) == expected
+    assert classifier.cache_info().hits == len(links)
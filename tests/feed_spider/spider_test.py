@@ -0,0 +1,282 @@
+import asyncio
+import time
+from collections import namedtuple
+from typing import List
+
+import aiohttp
+import bs4
+import pytest
+from aiohttp import web
+from yarl import URL
+
+from feedsearch_crawler.crawler import Response
+from feedsearch_crawler.crawler.frontier import RequestFrontier
+from feedsearch_crawler.crawler.lib import Stats, StopReasons
+from feedsearch_crawler.feed_spider import FeedsearchSpider, FeedInfo, SiteMeta
+from tests.conftest import serve
+
+
+def test_process_item_populates_feeds_incrementally():
+    items = []
+    spider = FeedsearchSpider(item_callback=items.append)
+
+    feed = FeedInfo(url=URL("http://test.com/feed.xml"))
+    site_meta = SiteMeta(URL("http://test.com"), host="test.com", site_name="Test")
+
+    asyncio.run(spider.process_item(feed))
+    asyncio.run(spider.process_item(FeedInfo(url=URL("http://test.com/feed.xml"))))
+    assert items == [feed]
+    assert not feed.site_name
+
+    asyncio.run(spider.process_item(site_meta))
+    assert items == [feed, site_meta]
+    assert feed.site_name == "Test"
+
+
+def test_tag_has_href():
+    soup = bs4.BeautifulSoup(
+        '<a href="/feed">Feed</a><a name="top">Top</a>', "html.parser"
+    )
+    assert [tag.text for tag in soup.find_all(FeedsearchSpider.tag_has_href)] == [
+        "Feed"
+    ]
+
+
+def test_stop_conditions():
+    spider = FeedsearchSpider(stop_score=10, max_idle_responses=2)
+
+    feed = FeedInfo(url=URL("http://test.com/feed.xml"), score=5)
+    asyncio.run(spider.process_item(feed))
+    assert not spider.stats[Stats.STOP_REASON]
+
+    spider._check_idle_responses(found_item=False)
+    spider._check_idle_responses(found_item=True)
+    spider._check_idle_responses(found_item=False)
+    assert not spider.stats[Stats.STOP_REASON]
+
+    feed = FeedInfo(url=URL("http://test.com/rss.xml"), score=10)
+    asyncio.run(spider.process_item(feed))
+    assert spider.stats[Stats.STOP_REASON] == StopReasons.STOP_SCORE
+
+    # The first stop reason is kept.
+    spider._check_idle_responses(found_item=False)
+    assert spider.stats[Stats.STOP_REASON] == StopReasons.STOP_SCORE
+
+
+def test_deadline_scheduling_skips_slow_hosts():
+    Request = namedtuple("Request", ["url"])
+    spider = FeedsearchSpider(deadline_scheduling=True)
+    spider._deadline = time.monotonic() + 1
+    spider._host_scheduler.record_latency("slow.com", 5)
+    spider._host_scheduler.record_latency("fast.com", 0.1)
+
+    assert not spider._can_finish_in_time(Request(URL("http://slow.com/")))
+    assert spider._can_finish_in_time(Request(URL("http://fast.com/")))
+
+
+FEED = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title>
+<link>http://test.com/</link><description>Test feed</description>
+<item><title>Item</title><link>http://test.com/item</link></item></channel></rss>"""
+
+
+async def large_page(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={"Content-Type": "text/html"})
+    await response.prepare(request)
+    await response.write(
+        b"<html><head><title>Blog</title>"
+        + b'<link rel="alternate" type="application/rss+xml" href="/feed.xml">'
+        + b"<style>"
+        + b"p {}" * 300
+        + b"</style></head><body>"
+    )
+    try:
+        for _ in range(200):
+            await response.write(b"<p>" + b"x" * 1000 + b"</p>")
+            await asyncio.sleep(0.001)
+        await response.write(b"</body></html>")
+    except ConnectionResetError:
+        # The client stopped reading after the head.
+        pass
+    return response
+
+
+async def feed(request: web.Request) -> web.Response:
+    return web.Response(body=FEED, content_type="application/rss+xml")
+
+
+async def crawl_large_page(**kwargs) -> FeedsearchSpider:
+    spider = FeedsearchSpider(crawl_hosts=False, favicon_data_uri=False, **kwargs)
+    async with serve({"/blog/": large_page, "/feed.xml": feed}) as base_url:
+        await spider.crawl(f"{base_url}/blog/")
+    return spider
+
+
+def test_stream_links_head_only():
+    spider = asyncio.run(crawl_large_page(stream_links=True, head_only=True))
+    assert [feed.url.path for feed in spider.items] == ["/feed.xml"]
+    assert spider.stats[Stats.RESPONSES_TRUNCATED] == 1
+    assert spider.stats[Stats.CONTENT_LENGTH_TOTAL] < 100000
+
+    spider = asyncio.run(crawl_large_page(stream_links=True))
+    assert [feed.url.path for feed in spider.items] == ["/feed.xml"]
+    assert spider.stats[Stats.RESPONSES_TRUNCATED] == 0
+    assert spider.stats[Stats.CONTENT_LENGTH_TOTAL] > 200000
+
+
+def test_follow_many():
+    async def follow_many(spider):
+        spider._session = aiohttp.ClientSession()
+        spider._request_queue = RequestFrontier()
+        url = URL("http://test.com/blog/")
+        response = Response(url, "GET", history=[url], status_code=200)
+        try:
+            return await spider.follow_many(
+                [
+                    ("/feed.xml", 3),
+                    ("ftp://test.com/feed", 3),
+                    ("/rss", 5),
+                    ("/feed.xml", 2),
+                ],
+                response,
+                spider.parse,
+            )
+        finally:
+            await spider._session.close()
+
+    spider = FeedsearchSpider(head_only=True, allowed_schemes=["http", "https"])
+    requests = asyncio.run(follow_many(spider))
+    assert [(r.url, r.priority) for r in requests] == [
+        (URL("http://test.com/feed.xml"), 3),
+        (URL("http://test.com/rss"), 5),
+    ]
+    assert requests[0].history == [URL("http://test.com/blog/")]
+    assert spider._request_queue.size() == 2
+    assert spider.stats[Stats.REQUESTS_QUEUED] == 2
+    # Each Request has its own LinkStream.
+    assert requests[0]._chunk_callback is not requests[1]._chunk_callback
+    assert asyncio.run(follow_many(spider)) == []
+
+
+def test_host_slot_reserved_in_priority_order():
+    async def fetch_order(spider):
+        spider._session = aiohttp.ClientSession()
+        spider._request_queue = RequestFrontier()
+        url = URL("http://test.com/blog/")
+        response = Response(url, "GET", history=[url], status_code=200)
+        try:
+            await spider.follow_many([("/page", 5)], response, spider.parse)
+            # A feed link found later is fetched before the earlier, lower priority link to the same host.
+            await spider.follow_many([("/feed.xml", 3)], response, spider.parse)
+            assert spider._request_queue.delayed_size() == 0
+
+            first = spider._request_queue.get_nowait()
+            second = spider._request_queue.get_nowait()
+            assert spider._reserve_host(first)
+            assert not spider._reserve_host(second)
+            assert spider._host_scheduler.held("test.com") == 1
+            return [first.url.path, second.url.path]
+        finally:
+            for handle in spider._host_releases.values():
+                handle.cancel()
+            spider._request_queue.clear()
+            await spider._session.close()
+
+    spider = FeedsearchSpider(delay=10.0)
+    assert asyncio.run(fetch_order(spider)) == ["/feed.xml", "/page"]
+    assert spider.stats[Stats.REQUESTS_DELAYED] == 1
+
+
+def test_held_requests_released_one_at_a_time():
+    async def release_order(spider):
+        spider._session = aiohttp.ClientSession()
+        # The frontier is full once all the Requests are queued.
+        spider._request_queue = RequestFrontier(max_items=4)
+        url = URL("http://test.com/blog/")
+        response = Response(url, "GET", history=[url], status_code=200)
+        fetched = []
+        try:
+            links = [(f"/page{i}", 5) for i in range(4)]
+            await spider.follow_many(links, response, spider.parse)
+            while len(fetched) < 4:
+                request = await asyncio.wait_for(spider._request_queue.get(), 1)
+                if spider._reserve_host(request):
+                    fetched.append(request.url.path)
+                    spider._request_queue.task_done()
+            assert spider._request_queue.is_finished()
+            return fetched
+        finally:
+            spider._request_queue.clear()
+            await spider._session.close()
+
+    spider = FeedsearchSpider(delay=0.01)
+    assert sorted(asyncio.run(release_order(spider))) == [f"/page{i}" for i in range(4)]
+    # Each Request was held at most once, and none were dropped by the full frontier.
+    assert spider.stats[Stats.REQUESTS_DELAYED] == 3
+    assert spider.stats[Stats.REQUESTS_EVICTED] == 0
+
+
+def test_executor_not_created_if_session_fails(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("session failed")
+
+    monkeypatch.setattr(aiohttp, "ClientSession", fail)
+    spider = FeedsearchSpider(executor="thread")
+    with pytest.raises(RuntimeError):
+        asyncio.run(spider.crawl("http://test.com"))
+    assert spider._executor is None
+
+
+def test_crawl_iter_keeps_item_callback():
+    async def crawl_iter(spider):
+        async with serve({"/feed.xml": feed}) as base_url:
+            url = f"{base_url}/feed.xml"
+            return [item async for item in spider.crawl_iter(url)]
+
+    items = []
+    spider = FeedsearchSpider(
+        crawl_hosts=False, favicon_data_uri=False, item_callback=items.append
+    )
+    found = asyncio.run(crawl_iter(spider))
+    assert [feed.url.path for feed in found] == ["/feed.xml"]
+    assert found[0] in items
+    assert spider.item_callback == items.append
+
+
+async def crawl_linked_page(padding: int, **kwargs) -> List[str]:
+    fetched = []
+
+    async def blog(request: web.Request) -> web.Response:
+        links = "".join(f'<a href="/feed{i}.xml">Feed</a>' for i in range(4))
+        # Feed link tags come later in the page, but have a higher priority.
+        links += "".join(
+            f'<link rel="alternate" type="application/rss+xml" href="/rss{i}.xml">'
+            for i in range(2)
+        )
+        body = f"<html><body>{'x' * padding}{links}</body></html>"
+        return web.Response(text=body, content_type="text/html")
+
+    async def linked_feed(request: web.Request) -> web.Response:
+        fetched.append(request.path)
+        return web.Response(body=FEED, content_type="application/rss+xml")
+
+    spider = FeedsearchSpider(
+        crawl_hosts=False, favicon_data_uri=False, delay=0, **kwargs
+    )
+    async with serve({"/blog/": blog, "/{name}": linked_feed}) as base_url:
+        await spider.crawl(f"{base_url}/blog/")
+    return fetched
+
+
+def test_max_links_per_page_across_stream_and_parse():
+    # The first links found are followed as they are streamed, so parse() follows none of its own.
+    fetched = asyncio.run(
+        crawl_linked_page(5000, stream_links=True, max_links_per_page=2)
+    )
+    assert sorted(fetched) == ["/feed0.xml", "/feed1.xml"]
+
+    # The page is too short to be streamed, so parse() follows the highest priority links.
+    fetched = asyncio.run(crawl_linked_page(0, stream_links=True, max_links_per_page=2))
+    assert sorted(fetched) == ["/rss0.xml", "/rss1.xml"]
+
+    fetched = asyncio.run(crawl_linked_page(5000, stream_links=True))
+    assert len(fetched) == 6